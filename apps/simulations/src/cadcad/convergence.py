@@ -0,0 +1,179 @@
+"""
+Steady-state detection and early termination of simulation runs.
+
+A detector is called with the TimestepView of each completed timestep and
+returns True once the run has settled. Three are provided:
+
+- Quiescent: no live initiatives and no locks remain for a while
+- LockedSupplyPlateau: locked supply has stopped moving over a window
+- any callable taking a TimestepView, as a user-supplied predicate
+
+SteadyState combines detectors and remembers which one stopped the run
+and when. run_until_steady runs a Simulation until it stops, returning
+records in the same shape as run_simulation, which end at the stop epoch.
+"""
+
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .retention import HistoryRetention
+from .simulation import Simulation, TimestepView
+
+Detector = Callable[[TimestepView], bool]
+
+
+class Quiescent:
+    """
+    Detect a run in which every initiative is decided and every lock released.
+
+    Fires once that has held for patience consecutive timesteps, so a run
+    that has not created its first initiative yet, or that is between
+    two, is not stopped.
+    """
+
+    name = "quiescent"
+
+    def __init__(self, patience: int = 24):
+        self.patience = patience
+        self._quiet = 0
+
+    def __call__(self, view: TimestepView) -> bool:
+        state = view.state
+        decided = len(state["accepted_initiatives"]) + len(state["expired_initiatives"])
+        if len(state["locks"]) or not state["initiatives"] or decided < len(state["initiatives"]):
+            self._quiet = 0
+            return False
+        self._quiet += 1
+        return self._quiet >= self.patience
+
+    def reset(self) -> None:
+        self._quiet = 0
+
+
+class LockedSupplyPlateau:
+    """
+    Detect locked supply settling within a tolerance over a rolling window.
+
+    Fires once the variance of locked supply over the last window
+    timesteps is at most (tolerance * mean) ** 2, i.e. its relative
+    standard deviation is at most tolerance. Windows in which locked supply
+    averages less than tolerance of the total supply are left to
+    Quiescent, since nothing may be locked between bursts of activity.
+    """
+
+    name = "locked_supply_plateau"
+
+    def __init__(self, window: int = 24, tolerance: float = 1e-3):
+        if window < 2:
+            raise ValueError(f"Plateau window must cover at least two timesteps: {window}")
+        self.window = window
+        self.tolerance = tolerance
+        self._values: deque = deque(maxlen=window)
+
+    def __call__(self, view: TimestepView) -> bool:
+        self._values.append(view["locked_supply"])
+        if len(self._values) < self.window:
+            return False
+        values = np.asarray(self._values, dtype=float)
+        mean = values.mean()
+        if mean < self.tolerance * view["total_supply"]:
+            return False
+        return values.var() <= (self.tolerance * mean) ** 2
+
+    def reset(self) -> None:
+        self._values.clear()
+
+
+class SteadyState:
+    """
+    Stop when any of several detectors fires.
+
+    After a stop, reason holds the name of the detector that fired (the
+    callable's name attribute or __name__) and stop_epoch the epoch at
+    which it did. Detectors with a reset method are reset with the
+    SteadyState, so one instance can be reused across runs.
+    """
+
+    def __init__(self, *detectors: Detector):
+        if not detectors:
+            raise ValueError("SteadyState needs at least one detector")
+        self.detectors = detectors
+        self.reason: Optional[str] = None
+        self.stop_epoch: Optional[int] = None
+
+    def __call__(self, view: TimestepView) -> bool:
+        for detector in self.detectors:
+            if detector(view):
+                self.reason = getattr(detector, "name", getattr(detector, "__name__", None))
+                self.stop_epoch = view["current_epoch"]
+                return True
+        return False
+
+    def reset(self) -> None:
+        self.reason = None
+        self.stop_epoch = None
+        for detector in self.detectors:
+            if hasattr(detector, "reset"):
+                detector.reset()
+
+
+def steady_state_detector(
+    quiescent: Optional[int] = 24,
+    plateau_window: Optional[int] = 24,
+    plateau_tolerance: float = 1e-3,
+    predicate: Optional[Detector] = None,
+) -> SteadyState:
+    """
+    Build a SteadyState from the detector options used by experiment sweeps.
+
+    quiescent is the Quiescent patience and plateau_window the
+    LockedSupplyPlateau window; None disables either.
+    """
+    detectors: List[Detector] = []
+    if quiescent:
+        detectors.append(Quiescent(quiescent))
+    if plateau_window:
+        detectors.append(LockedSupplyPlateau(plateau_window, plateau_tolerance))
+    if predicate is not None:
+        detectors.append(predicate)
+    return SteadyState(*detectors)
+
+
+def run_until_steady(
+    initial_state: Dict[str, Any],
+    num_epochs: Optional[int] = None,
+    sim_params: Optional[Dict[str, Any]] = None,
+    detector: Optional[Detector] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+    """
+    Run a simulation until detector fires or the horizon is reached.
+
+    Returns the records, kept as selected by the history_retention
+    parameter, and the epoch at which the run stopped early, or None if
+    it ran to the horizon. The last record is the state at the stop, so
+    final-state metrics remain valid. detector defaults to
+    steady_state_detector().
+    """
+    if detector is None:
+        detector = steady_state_detector()
+    if hasattr(detector, "reset"):
+        detector.reset()
+
+    simulation = Simulation(initial_state, sim_params, num_epochs)
+    retention = HistoryRetention.from_params(simulation.params)
+
+    results: List[Dict[str, Any]] = []
+    pending = list(simulation.view.records)
+    stop_epoch = None
+    while not simulation.done:
+        view = simulation.step()
+        results.extend(retention.retain(pending))
+        pending = list(view.records)
+        if detector(view):
+            stop_epoch = view["current_epoch"]
+            break
+    results.extend(retention.retain(pending, final=True))
+
+    return results, stop_epoch
@@ -15,10 +15,15 @@ def results_to_dataframe(results: List[Dict]) -> pd.DataFrame:
             processed_row = {
                 "current_epoch": row.get("current_epoch", 0),
                 "current_time": row.get("current_time", datetime.now()),
-                "initiatives_count": len(row.get("initiatives", {})),
-                "accepted_count": len(row.get("accepted_initiatives", set())),
-                "expired_count": len(row.get("expired_initiatives", set())),
-                "supporters_count": len(row.get("locks", {})),
+                # Summary records (see cadcad.retention) carry the counts only
+                "initiatives_count": row.get("initiatives_count", len(row.get("initiatives", {}))),
+                "accepted_count": row.get(
+                    "accepted_count", len(row.get("accepted_initiatives", set()))
+                ),
+                "expired_count": row.get(
+                    "expired_count", len(row.get("expired_initiatives", set()))
+                ),
+                "supporters_count": row.get("supporters_count", len(row.get("locks", {}))),
                 "acceptance_threshold": row.get("acceptance_threshold", 0),
                 "circulating_supply": row.get("circulating_supply", 0),
                 "locked_supply": row.get("locked_supply", 0),
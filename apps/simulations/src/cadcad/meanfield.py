@@ -0,0 +1,421 @@
+"""
+Mean-field model of aggregate Signals dynamics.
+
+A deterministic difference-equation model of expected aggregates, derived
+from the rules in cadcad.sufs, for fast first-pass parameter scans. Every
+parameter point is evaluated at once along a leading array axis; the cost
+grows with points * epochs * max_lock_duration_epochs.
+
+The model follows cohorts of initiatives by creation epoch:
+- Each epoch, every user holding the creation stake creates an initiative
+  with prob_create_initiative, giving a cohort of expected size n.
+- Each funded user supports with prob_support_initiative, picking a live
+  initiative uniformly. A live initiative therefore receives Poisson
+  supports at rate lambda = prob_support * funded_users * (1 - exp(-N)) / N,
+  where N is the expected number of live initiatives.
+- A support made k epochs ago contributes amount * duration *
+  m**max(k - 1, 0) to its initiative's weight while k <= duration, as in
+  Support.decay and the lifecycle unlock. An initiative's weight is then
+  compound Poisson, with mean and variance given by sums of the support
+  rate against the first and second moments of that contribution.
+- Acceptance: surviving initiatives cross the threshold as the probability
+  that their weight has reached acceptance_threshold, from a gamma
+  approximation of the weight, rises past its running maximum.
+- Expiry: survivors expire when their inactivity window closes, that is
+  no support was received within the last inactivity_period epochs, the
+  last one (or the creation) was exactly that long ago, and no older lock
+  is still held. Under Poisson arrivals this is exp(-expected blocking
+  supports) times the chance of a support at the start of the window.
+- Overwrites: a support by a user who already holds a lock on the chosen
+  initiative replaces that lock without releasing its amount, as in
+  apply_user_actions, so the old amount stays in locked supply for good.
+  The chance of an overwrite is the initiative's held locks over the
+  number of funded users.
+
+Support amounts are drawn as in policies.p_user_actions from the initial
+balances, scaled by the fraction of the initial balances still free to
+spend. The initial state is assumed to hold no initiatives or locks.
+validate_mean_field compares the model against Monte Carlo means from the
+native engine.
+"""
+
+import random
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Model parameters read by the mean-field model; any of them can be swept
+PARAMETERS = (
+    "acceptance_threshold",
+    "decay_multiplier",
+    "initiative_creation_stake",
+    "prob_create_initiative",
+    "prob_support_initiative",
+    "max_support_tokens_fraction",
+    "min_lock_duration_epochs",
+    "max_lock_duration_epochs",
+    "inactivity_period",
+)
+
+# Expected aggregates returned by run_mean_field, one series per parameter point
+OUTPUTS = (
+    "live_initiatives",
+    "accepted_initiatives",
+    "expired_initiatives",
+    "locked_supply",
+    "circulating_supply",
+    "mean_live_weight",
+    "acceptance_hazard",
+    "expiry_hazard",
+)
+
+# Aggregates compared against Monte Carlo means by validate_mean_field
+VALIDATED_OUTPUTS = (
+    "live_initiatives",
+    "accepted_initiatives",
+    "expired_initiatives",
+    "locked_supply",
+)
+
+
+def _normal_sf(z: np.ndarray) -> np.ndarray:
+    """Standard normal survival function (Abramowitz and Stegun 7.1.26)."""
+    x = np.abs(z) / np.sqrt(2.0)
+    t = 1.0 / (1.0 + 0.3275911 * x)
+    poly = t * (
+        0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429)))
+    )
+    half_erfc = 0.5 * poly * np.exp(-x * x)
+    return np.where(z >= 0, half_erfc, 1.0 - half_erfc)
+
+
+def _gamma_tail(mean: np.ndarray, variance: np.ndarray, threshold: np.ndarray) -> np.ndarray:
+    """
+    P(W >= threshold) for W gamma distributed with the given mean and variance.
+
+    Uses the Wilson-Hilferty cube-root normal approximation.
+    """
+    positive = mean > 0
+    mean = np.where(positive, mean, 1.0)
+    shape = mean**2 / np.maximum(variance, 1e-300)
+    spread = 1.0 / (9.0 * shape)
+    z = (np.cbrt(np.maximum(threshold, 0) / mean) - (1.0 - spread)) / np.sqrt(spread)
+    return np.where(positive, _normal_sf(z), (threshold <= 0).astype(float))
+
+
+def _amount_moments(
+    balances: np.ndarray, fraction: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Number of funded users and the first two moments of a support amount.
+
+    The amount is max(1, min(uniform(1, fraction * balance), balance)) for
+    a uniformly chosen user whose balance can cover it.
+    """
+    funded = balances[balances >= 1]
+    if not len(funded):
+        zeros = np.zeros_like(fraction, dtype=float)
+        return zeros, zeros, zeros
+    b = funded[None, :]
+    c = np.maximum(fraction[:, None] * b, 1.0)
+    # Uniform on [1, c] capped at b; cap only binds when fraction > 1
+    cap = np.minimum(b, c)
+    width = np.maximum(c - 1.0, 1e-12)
+    uncapped_mean = (cap**2 - 1.0) / 2.0
+    uncapped_square = (cap**3 - 1.0) / 3.0
+    tail = (c - cap) / width
+    mean = np.where(c > 1.0, uncapped_mean / width + tail * cap, 1.0)
+    square = np.where(c > 1.0, uncapped_square / width + tail * cap**2, 1.0)
+    return np.full(len(fraction), float(len(funded))), mean.mean(axis=1), square.mean(axis=1)
+
+
+def _duration_moments(
+    low: np.ndarray, high: np.ndarray, ages: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    E[d; d >= k], E[d**2; d >= k] and P(d >= k) for d uniform on [low, high].
+
+    Rows are parameter points and columns are the ages k.
+    """
+    low, high = low[:, None], high[:, None]
+    count = high - low + 1
+    start = np.maximum(ages[None, :], low)
+    present = np.maximum(high - start + 1, 0)
+    first = np.where(present > 0, (start + high) * present / 2.0, 0.0)
+
+    def squares(n):
+        return n * (n + 1) * (2 * n + 1) / 6.0
+
+    second = np.where(present > 0, squares(high) - squares(start - 1), 0.0)
+    return first / count, second / count, present / count
+
+
+def _parameter_points(
+    params: Dict[str, Any], sweep: Optional[Dict[str, Sequence[float]]]
+) -> Dict[str, np.ndarray]:
+    sweep = sweep or {}
+    sizes = {len(values) for values in sweep.values()}
+    if len(sizes) > 1:
+        raise ValueError(f"swept parameters must have equal lengths, got {sorted(sizes)}")
+    size = sizes.pop() if sizes else 1
+    unknown = set(sweep) - set(PARAMETERS)
+    if unknown:
+        raise ValueError(f"cannot sweep parameters: {sorted(unknown)}")
+    return {
+        name: np.asarray(sweep[name], dtype=float)
+        if name in sweep
+        else np.full(size, float(params[name]))
+        for name in PARAMETERS
+    }
+
+
+def run_mean_field(
+    initial_state: Dict[str, Any],
+    params: Dict[str, Any],
+    num_epochs: int,
+    sweep: Optional[Dict[str, Sequence[float]]] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Evaluate the mean-field model and return its expected aggregates.
+
+    params supplies every name in PARAMETERS. sweep maps any of them to a
+    sequence of values, one per parameter point, overriding params. Each
+    output in OUTPUTS is an array of shape (points, num_epochs + 1) indexed
+    by epoch, starting from initial_state at epoch 0.
+    """
+    p = _parameter_points(params, sweep)
+    points = len(p["acceptance_threshold"])
+    epochs = num_epochs + 1
+
+    balances = np.array(list(initial_state["balances"].values()), dtype=float)
+    funded, amount, amount_square = _amount_moments(balances, p["max_support_tokens_fraction"])
+    creators = (balances[None, :] >= p["initiative_creation_stake"][:, None]).sum(axis=1)
+    cohort_size = p["prob_create_initiative"] * creators
+    support_rate = p["prob_support_initiative"] * funded
+
+    # Kernels by age k = t - s of a support made at epoch s, read at epoch t.
+    # All of them vanish beyond the longest lock duration.
+    reach = int(p["max_lock_duration_epochs"].max()) + 1
+    ages = np.arange(reach)
+    low = p["min_lock_duration_epochs"].astype(np.int64)
+    high = p["max_lock_duration_epochs"].astype(np.int64)
+    duration, duration_square, held = _duration_moments(low, high, ages)
+    _, _, outlives = _duration_moments(low, high, ages + 1)
+    decays = np.maximum(ages - 1, 0)[None, :]
+    multiplier = p["decay_multiplier"][:, None]
+    inactivity = p["inactivity_period"].astype(np.int64)
+    kernels = np.stack(
+        [
+            # Mean and second moment of a support's weight contribution
+            amount[:, None] * duration * multiplier**decays,
+            amount_square[:, None] * duration_square * multiplier ** (2 * decays),
+            # Amount still locked at the end of epoch t
+            amount[:, None] * outlives,
+            # Locks older than the inactivity period that still block expiry
+            np.where(ages[None, :] >= inactivity[:, None], held, 0.0),
+        ]
+    )
+
+    # Reversed along age, so the kernels for supports s = oldest .. t are a slice
+    reversed_kernels = np.ascontiguousarray(kernels[:, :, ::-1])
+
+    threshold = p["acceptance_threshold"][:, None]
+    longest_inactivity = int(inactivity.max())
+    # Survivor fractions and the running maximum of P(W >= threshold) by
+    # cohort. Cohorts at least reach epochs old see every support that still
+    # counts, so they share one weight distribution: they are tracked by
+    # survivors only, and pooled once past their inactivity period.
+    surviving = np.zeros((points, epochs))
+    reached_so_far = np.zeros((points, epochs))
+    mature_reached = np.zeros(points)
+    pooled = np.zeros(points)
+    rates = np.zeros((points, epochs))
+    cumulative_rates = np.zeros((points, epochs))
+    # Support rates weighted by the amount scale, matching the kernels
+    kernel_rates = np.zeros((4, points, epochs))
+    free_balance = balances[balances >= 1].sum()
+    scale = np.ones(points)
+    stakes = np.zeros(points)
+    leaked = np.zeros(points)
+    outputs = {name: np.zeros((points, epochs)) for name in OUTPUTS}
+    outputs["circulating_supply"][:, 0] = initial_state["circulating_supply"]
+    outputs["locked_supply"][:, 0] = initial_state["locked_supply"]
+    index = np.arange(points)
+    n = cohort_size
+
+    for t in range(1, epochs):
+        live = outputs["live_initiatives"][:, t - 1]
+        spread = np.where(live > 1e-12, -np.expm1(-live) / np.maximum(live, 1e-12), 1.0)
+        rates[:, t] = support_rate * spread
+        cumulative_rates[:, t] = cumulative_rates[:, t - 1] + rates[:, t]
+        kernel_rates[:, :, t] = rates[:, t] * np.stack([scale, scale**2, scale, np.ones(points)])
+        held_locks = outputs["locked_supply"][:, t - 1] - leaked
+        leaked += rates[:, t] * held_locks / np.maximum(funded, 1.0)
+
+        # Young cohorts c = first .. t, and mature ones back to the longest
+        # inactivity period
+        first = max(1, t - reach + 1)
+        waiting_start = max(1, t - longest_inactivity)
+        surviving[:, t] = 1.0
+        young = surviving[:, first : t + 1]
+        waiting = surviving[:, waiting_start:first]
+        lags = t - np.arange(first, t + 1)
+
+        # Sums over the supports s = first + j .. t in column j: column 0
+        # serves mature cohorts and column c + 1 - first young cohort c
+        weighted = (
+            kernel_rates[:, :, first : t + 1] * reversed_kernels[:, :, reach - 1 - t + first :]
+        )
+        sums = np.cumsum(weighted[:, :, ::-1], axis=2)[:, :, ::-1]
+        sums = np.concatenate([sums, np.zeros((4, points, 1))], axis=2)
+        mean, variance, locked, held_blocking = sums
+
+        # Acceptance: survivors cross the threshold as P(W >= threshold)
+        # rises past its running maximum
+        previous_reached = np.column_stack([mature_reached, reached_so_far[:, first : t + 1]])
+        reached = _gamma_tail(mean, variance, threshold)
+        crossing = np.maximum(reached - previous_reached, 0.0) / np.maximum(
+            1.0 - previous_reached, 1e-12
+        )
+        crossing = np.minimum(crossing, 1.0)
+        reached = np.maximum(previous_reached, reached)
+        mature = pooled + waiting.sum(axis=1)
+        newly_accepted = (young * crossing[:, 1:]).sum(axis=1) + mature * crossing[:, 0]
+        young *= 1.0 - crossing[:, 1:]
+        waiting *= 1.0 - crossing[:, :1]
+        pooled *= 1.0 - crossing[:, 0]
+
+        # Expiry: the inactivity window closes at t when the cohort was
+        # created, or last supported, exactly inactivity_period epochs ago,
+        # and no older lock is still held
+        window = np.maximum(t - inactivity, 0)
+        recent = cumulative_rates[:, t] - cumulative_rates[index, window]
+        closing = -np.expm1(-rates[index, window])[:, None]
+        idle = np.exp(-(recent[:, None] + held_blocking))
+        period = inactivity[:, None]
+        young_closing = np.where(lags == period, 1.0, np.where(lags > period, closing, 0.0))
+        young_expired = young * idle[:, 1:] * young_closing
+        young -= young_expired
+        pooled_expired = pooled * idle[:, 0] * closing[:, 0]
+        pooled -= pooled_expired
+        # Mature cohorts reaching their inactivity period now join the pool
+        due = t - inactivity
+        is_due = (due >= waiting_start) & (due < first)
+        due_mass = np.where(is_due, surviving[index, np.clip(due, 0, t)], 0.0)
+        due_expired = due_mass * idle[:, 0]
+        surviving[index[is_due], due[is_due]] = 0.0
+        pooled += due_mass - due_expired
+        newly_expired = young_expired.sum(axis=1) + pooled_expired + due_expired
+
+        # Survivors are the initiatives still below the threshold. Their
+        # weight and locks are E[W; W < threshold] / P(W < threshold) of the
+        # unconditional ones, from the size-biased gamma with shape + 1.
+        biased = mean + variance / np.maximum(mean, 1e-300)
+        below = 1.0 - _gamma_tail(biased, biased * variance / np.maximum(mean, 1e-300), threshold)
+        below = np.where(mean > 0, np.minimum(below / np.maximum(1.0 - reached, 1e-12), 1.0), 1.0)
+        mature = pooled + waiting.sum(axis=1)
+        young_live = young.sum(axis=1)
+        total_live = n * (young_live + mature)
+        outputs["live_initiatives"][:, t] = total_live
+        outputs["accepted_initiatives"][:, t] = (
+            outputs["accepted_initiatives"][:, t - 1] + n * newly_accepted
+        )
+        outputs["expired_initiatives"][:, t] = (
+            outputs["expired_initiatives"][:, t - 1] + n * newly_expired
+        )
+        # Accepted initiatives release their locks and expired ones hold none
+        held = below * locked
+        outputs["locked_supply"][:, t] = (
+            n * ((young * held[:, 1:]).sum(axis=1) + mature * held[:, 0]) + leaked
+        )
+        weight = below * mean
+        outputs["mean_live_weight"][:, t] = np.where(
+            total_live > 1e-12,
+            n
+            * ((young * weight[:, 1:]).sum(axis=1) + mature * weight[:, 0])
+            / np.maximum(total_live, 1e-12),
+            0.0,
+        )
+        stakes += n * p["initiative_creation_stake"]
+        spent = outputs["locked_supply"][:, t] + stakes
+        scale = np.clip(1.0 - spent / max(free_balance, 1e-12), 0.0, 1.0)
+
+        reached_so_far[:, first : t + 1] = reached[:, 1:]
+        mature_reached = reached[:, 0]
+        # The oldest young cohort is mature next epoch. Where its inactivity
+        # period has already passed it goes straight to the pool.
+        if t + 1 - reach >= first:
+            joining = surviving[:, first].copy()
+            total = mature + joining
+            mature_reached = np.where(
+                total > 0,
+                (mature * mature_reached + joining * reached_so_far[:, first])
+                / np.maximum(total, 1e-300),
+                mature_reached,
+            )
+            expired_already = inactivity < reach
+            pooled += np.where(expired_already, joining, 0.0)
+            surviving[:, first] = np.where(expired_already, 0.0, joining)
+
+    outputs["locked_supply"] += initial_state["locked_supply"]
+    outputs["circulating_supply"] = (
+        initial_state["circulating_supply"]
+        + initial_state["locked_supply"]
+        - outputs["locked_supply"]
+    )
+    previous_live = np.maximum(outputs["live_initiatives"][:, :-1], 1e-12)
+    for name, count in (
+        ("acceptance_hazard", "accepted_initiatives"),
+        ("expiry_hazard", "expired_initiatives"),
+    ):
+        outputs[name][:, 1:] = np.diff(outputs[count], axis=1) / previous_live
+    return outputs
+
+
+def validate_mean_field(
+    initial_state: Dict[str, Any],
+    params: Dict[str, Any],
+    num_epochs: int,
+    runs: int = 20,
+    seed: int = 0,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Compare the mean-field model against Monte Carlo means of the native engine.
+
+    For each aggregate in VALIDATED_OUTPUTS, returns the mean-field series,
+    the Monte Carlo mean and standard error series over runs, the relative
+    error at the final epoch and the largest deviation in standard errors
+    over all epochs.
+    """
+    from .native import NativeEngine
+    from .native.tables import ACCEPTED, EXPIRED, LIVE
+
+    model = run_mean_field(initial_state, params, num_epochs)
+    rng = random.Random(seed)
+    samples = {name: np.zeros((runs, num_epochs + 1)) for name in VALIDATED_OUTPUTS}
+    for run in range(runs):
+        engine = NativeEngine(initial_state, params, random.Random(rng.getrandbits(64)))
+        for epoch in range(num_epochs + 1):
+            if epoch:
+                engine.step()
+            status = engine.initiatives.view("status")
+            samples["live_initiatives"][run, epoch] = (status == LIVE).sum()
+            samples["accepted_initiatives"][run, epoch] = (status == ACCEPTED).sum()
+            samples["expired_initiatives"][run, epoch] = (status == EXPIRED).sum()
+            samples["locked_supply"][run, epoch] = engine.locked_supply
+
+    report = {}
+    for name in VALIDATED_OUTPUTS:
+        expected = model[name][0]
+        mean = samples[name].mean(axis=0)
+        stderr = samples[name].std(axis=0, ddof=1) / np.sqrt(runs) if runs > 1 else 0 * mean
+        deviation = np.abs(expected - mean) / np.maximum(stderr, 1e-12)
+        final = mean[-1]
+        report[name] = {
+            "mean_field": expected,
+            "monte_carlo": mean,
+            "stderr": stderr,
+            "relative_error": (expected[-1] - final) / final if final else float("nan"),
+            "max_deviation": float(deviation[stderr > 0].max()) if (stderr > 0).any() else 0.0,
+        }
+    return report
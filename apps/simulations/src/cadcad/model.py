@@ -8,6 +8,7 @@ from .policies import (
     p_user_actions,
     p_advance_time,
 )
+from .retention import HistoryRetention, p_retain_history
 
 from .sufs import (
     s_update_current_epoch,
@@ -39,21 +40,42 @@ simulation_parameters = {
         # Governance thresholds
         "acceptance_threshold": 75000.0,  # ~75k units
         "decay_multiplier": 0.999,  # 0.1% decay per hour
+        "exhaustive_acceptance": False,  # Check all initiatives for acceptance, not only supported
         "initiative_creation_stake": 120.0,  # {n} tokens required to create an initiative
         "prob_create_initiative": 0.00025,  # {p} chance to create an initiative
         "prob_support_initiative": 0.005,  # {p} chance to give support to an initiative
+        "vectorized_user_actions": False,  # Draw user actions with NumPy, faster for many users
         # Economic constraints
         "max_support_tokens_fraction": 0.3,  # {f} of the user's balance can be used to support an initiative
         "min_lock_duration_epochs": 24,  # {n} minimum lock duration (24 hours)
         "max_lock_duration_epochs": 336,  # {n} maximum lock duration (2 weeks as hours)
         # Lifecycle parameters
         "inactivity_period": 720,  # {n} inactivity period (30 days) before expiration
+        # Approximate leaping (native.leaping only)
+        "max_leap_epochs": 24,  # {n} longest leap
+        "leap_tolerance": 0.1,  # {f} of the distance to the threshold a leap may close
+        # Contract arithmetic (native engine only, see native.fixed_point)
+        "fixed_point": False,  # Integer lock weights with the contracts' truncation
+        "token_decimals": 18,  # {n} decimals of a token's base unit
+        "decay_curve": "exponential",  # exponential or linear, as in DecayCurves
+        "decay_curve_parameter": None,  # {p} scaled by 1e18; None derives it from decay_multiplier
+        # Lock ledger (native engine only, see native.tables.LockLedger)
+        "lock_ledger": False,  # Mint a new lock per support instead of replacing it
+        # Large populations (native engine only, see native.population)
+        "sparse_population": False,  # Visit only acting users; record balance and lock deltas
+        # Results history (see cadcad.retention)
+        "history_retention": "full",  # full, last_substep, every_k, summary or final
+        "history_retention_interval": 1,  # {k} timesteps between records kept by every_k
         # Reward system parameters
         "reward_enabled": True,  # Whether to enable the reward system
         "max_reward_rate": 0.1,  # Maximum reward rate (10% of support amount)
         "min_reward_rate": 0.01,  # Minimum reward rate (1% of support amount)
         "reward_steepness": 5.0,  # Controls how quickly the reward rate decreases
         "reward_midpoint": 0.2,  # Weight percentage at which reward rate is halfway between min and max
+        # Incentives pool (native engine only, see native.incentives)
+        "incentives_budget": 0.0,  # {f} board reward budget; 0 pays no incentives
+        "incentive_reward_per_initiative": 1000.0,  # {f} reward shared by an initiative's credits
+        "incentive_parameters": [2.0, 1.0],  # Relative bucket multipliers, first to last
     },
 }
 
@@ -65,6 +87,7 @@ psubs = [
     {
         "policies": {
             "time_advancement_policy": p_advance_time,
+            "history_retention_policy": p_retain_history,
         },
         "variables": {
             "current_epoch": s_update_current_epoch,
@@ -121,17 +144,41 @@ psubs = [
 ]
 
 
-def run_simulation(initial_state: Dict, num_epochs: int = None) -> List[Dict]:
-    """Run the cadCAD simulation and return the results."""
+def run_simulation(
+    initial_state: Dict,
+    num_epochs: int = None,
+    sim_params: Dict = None,
+    engine: str = "cadcad",
+) -> List[Dict]:
+    """
+    Run the simulation and return the results.
+
+    engine selects the implementation: "cadcad" runs the PSUBs above through
+    cadCAD, "native" runs the same model on the NumPy engine in
+    cadcad.native and returns results in the same shape.
+
+    The history_retention model parameter selects which records are
+    returned (see cadcad.retention); records that are not kept are dropped
+    while the simulation runs.
+    """
+    if sim_params is None:
+        sim_params = simulation_parameters
+
+    if engine == "native":
+        from .native import run_native_simulation
+
+        return run_native_simulation(initial_state, num_epochs, sim_params)
+    if engine != "cadcad":
+        raise ValueError(f"Unknown simulation engine: {engine}")
+
     try:
         print("Initializing simulation...")
 
-        # Use custom num_epochs if provided, otherwise use default
+        # Use custom num_epochs if provided, otherwise use default.
+        # cadCAD rewrites "N" in the dict it is given, so always pass a copy.
+        custom_simulation_parameters = sim_params.copy()
         if num_epochs is not None:
-            custom_simulation_parameters = simulation_parameters.copy()
             custom_simulation_parameters["T"] = range(num_epochs)
-        else:
-            custom_simulation_parameters = simulation_parameters
 
         # Create the cadCAD configuration
         # Note: config object is now created inside run_simulation to use dynamic initial_state
@@ -152,6 +199,9 @@ def run_simulation(initial_state: Dict, num_epochs: int = None) -> List[Dict]:
 
         print("Executing simulation...")
         raw_result, tensor_field, sessions = executor.execute()
+        raw_result = HistoryRetention.from_params(custom_simulation_parameters["M"]).finish(
+            raw_result
+        )
 
         print(f"Simulation completed with {len(raw_result)} timesteps")
         return raw_result
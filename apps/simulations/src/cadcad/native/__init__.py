@@ -0,0 +1,49 @@
+"""
+Native NumPy simulation engine.
+
+This package runs the Signals model without cadCAD, keeping locks,
+initiatives and balances in struct-of-arrays tables:
+- tables: Column stores for locks and initiatives, an append-only lock
+  ledger, and aggregate weights
+- fixed_point: Integer lock weights matching the contracts' DecayCurves
+- incentives: IncentivesPool bucketed credits, rewards and reward ledger
+- scheduler: Deadline queue for lock expiry and initiative inactivity
+- actions: User action sampling (seed-compatible with p_user_actions)
+- population: Balance and lock deltas recorded for large populations
+- engine: The PSUB pipeline over arrays and run_native_simulation
+- batched: Monte Carlo runs batched along a leading array axis
+- boards: Several boards sharing one holder population, across processes
+- leaping: Approximate tau-leaping over several epochs, with a bias report
+- parity: Harness comparing the native engine against cadCAD
+"""
+
+from .engine import NativeEngine, run_native_simulation
+from .batched import BatchedEngine, run_batched_simulation
+from .boards import MultiBoardSimulation, run_multi_board_simulation
+from .leaping import LeapingEngine, leap_bias_report, run_leaping_simulation
+from .incentives import IncentivesPool, RewardLedger
+from .fixed_point import DecayCurve, FixedPointLockLedger, FixedPointLockTable
+from .scheduler import DeadlineQueue
+from .tables import AggregateWeights, LockLedger, LockTable, InitiativeTable
+
+__all__ = [
+    "NativeEngine",
+    "run_native_simulation",
+    "BatchedEngine",
+    "run_batched_simulation",
+    "MultiBoardSimulation",
+    "run_multi_board_simulation",
+    "LeapingEngine",
+    "run_leaping_simulation",
+    "leap_bias_report",
+    "LockTable",
+    "LockLedger",
+    "InitiativeTable",
+    "AggregateWeights",
+    "DecayCurve",
+    "FixedPointLockTable",
+    "FixedPointLockLedger",
+    "IncentivesPool",
+    "RewardLedger",
+    "DeadlineQueue",
+]
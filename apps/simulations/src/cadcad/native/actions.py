@@ -0,0 +1,223 @@
+"""
+User action sampling for the native engine.
+
+The sampler consumes Python's ``random`` module in exactly the same order
+as ``policies.p_user_actions``, so a native run seeded with
+``random.seed(s)`` makes the same decisions as the cadCAD run seeded with
+the same value.
+
+sample_quiet_epochs and sample_active_epoch_actions draw the same process
+for event skipping: the number of epochs in which no user attempts an
+action, then the actions of the next epoch in which some user does. They
+match sample_user_actions in distribution, not draw for draw.
+
+sample_sparse_user_actions draws an epoch's actions of a large population
+without visiting the users who do not act (see population).
+"""
+
+import math
+import random
+import sys
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+CREATE = 0
+SUPPORT = 1
+
+
+class Action(NamedTuple):
+    """A single user action expressed in table indices."""
+
+    kind: int
+    user: int
+    initiative: int = -1
+    amount: float = 0.0
+    duration: int = 0
+
+
+def sample_user_actions(
+    params: Dict[str, Any],
+    balances: np.ndarray,
+    live_initiatives: np.ndarray,
+    rng: random.Random = random,
+) -> List[Action]:
+    """Draw this timestep's user actions (see ``policies.p_user_actions``)."""
+    prob_create = params["prob_create_initiative"]
+    prob_support = params["prob_support_initiative"]
+    creation_stake = params["initiative_creation_stake"]
+
+    order = list(range(len(balances)))
+    rng.shuffle(order)
+
+    live = live_initiatives.tolist()
+    actions: List[Action] = []
+    for user in order:
+        if rng.random() < prob_create:
+            if balances[user] >= creation_stake:
+                actions.append(Action(CREATE, user))
+
+        if rng.random() < prob_support:
+            action = _draw_support(params, user, float(balances[user]), live, rng)
+            if action is not None:
+                actions.append(action)
+
+    return actions
+
+
+def _draw_support(
+    params: Dict[str, Any], user: int, user_balance: float, live: List[int], rng: random.Random
+) -> Optional[Action]:
+    """Draw the support a user makes after deciding to support, or None."""
+    if user_balance <= 0 or not live:
+        return None
+    initiative = rng.choice(live)
+    tokens_to_lock = rng.uniform(1, user_balance * params["max_support_tokens_fraction"])
+    tokens_to_lock = max(1.0, min(tokens_to_lock, user_balance))
+    lock_duration = rng.randint(
+        params["min_lock_duration_epochs"], params["max_lock_duration_epochs"]
+    )
+    return Action(SUPPORT, user, initiative, tokens_to_lock, lock_duration)
+
+
+def _geometric(log_fail: float, rng: random.Random, bound: float = 1.0) -> int:
+    """
+    Draw the number of failures before the first success.
+
+    log_fail is the log of the per-trial failure probability. With bound
+    below one, the draw is conditioned on a success within the trials whose
+    probability of having succeeded is bound.
+    """
+    if log_fail == 0:
+        return sys.maxsize
+    return int(math.log1p(-rng.random() * bound) / log_fail)
+
+
+def sample_quiet_epochs(params: Dict[str, Any], num_users: int, rng: random.Random = random) -> int:
+    """
+    Draw the number of epochs before the next epoch in which a user acts.
+
+    Every epoch, each user independently attempts to create an initiative
+    with prob_create_initiative and to support one with
+    prob_support_initiative, so the epochs without any attempt form a
+    geometric run. Returns sys.maxsize if no user can ever attempt an action.
+    """
+    prob_create = params["prob_create_initiative"]
+    prob_support = params["prob_support_initiative"]
+    if prob_create >= 1 or prob_support >= 1:
+        return 0
+    log_idle = num_users * (math.log1p(-prob_create) + math.log1p(-prob_support))
+    return _geometric(log_idle, rng)
+
+
+def sample_active_epoch_actions(
+    params: Dict[str, Any],
+    balances: np.ndarray,
+    live_initiatives: np.ndarray,
+    rng: random.Random = random,
+) -> List[Action]:
+    """
+    Draw an epoch's user actions given that at least one user attempts one.
+
+    Attempting users are found by geometric skips over the users, so the
+    cost is proportional to the number of attempts rather than users. They
+    act in random order, and each user's actions are drawn as in
+    sample_user_actions.
+    """
+    prob_create = params["prob_create_initiative"]
+    prob_support = params["prob_support_initiative"]
+    creation_stake = params["initiative_creation_stake"]
+    num_users = len(balances)
+    prob_attempt = 1 - (1 - prob_create) * (1 - prob_support)
+    if not num_users or prob_attempt <= 0:
+        return []
+
+    if prob_attempt >= 1:
+        attempting = list(range(num_users))
+    else:
+        log_fail = math.log1p(-prob_attempt)
+        # The first attempting user is conditioned on there being one
+        first = _geometric(log_fail, rng, -math.expm1(num_users * log_fail))
+        attempting = [min(first, num_users - 1)]
+        while True:
+            user = attempting[-1] + 1 + _geometric(log_fail, rng)
+            if user >= num_users:
+                break
+            attempting.append(user)
+    rng.shuffle(attempting)
+
+    # Probabilities of creating only and of supporting only, given an attempt
+    create_only = prob_create * (1 - prob_support) / prob_attempt
+    support_only = prob_support * (1 - prob_create) / prob_attempt
+
+    live = live_initiatives.tolist()
+    actions: List[Action] = []
+    for user in attempting:
+        draw = rng.random()
+        creates = draw < create_only or draw >= create_only + support_only
+        supports = draw >= create_only
+        if creates and balances[user] >= creation_stake:
+            actions.append(Action(CREATE, user))
+        if supports:
+            action = _draw_support(params, user, float(balances[user]), live, rng)
+            if action is not None:
+                actions.append(action)
+
+    return actions
+
+
+def sample_sparse_user_actions(
+    params: Dict[str, Any],
+    balances: np.ndarray,
+    live_initiatives: np.ndarray,
+    rng: np.random.Generator,
+) -> List[Action]:
+    """
+    Draw this timestep's user actions, touching only the users who act.
+
+    The number of attempting users is drawn from a binomial and the users
+    themselves by sampling that many indices without replacement, in
+    random order; each user's actions are then drawn as in
+    sample_user_actions, vectorized over the attempting users. Matches
+    sample_user_actions in distribution, not draw for draw.
+    """
+    prob_create = params["prob_create_initiative"]
+    prob_support = params["prob_support_initiative"]
+    creation_stake = params["initiative_creation_stake"]
+    num_users = len(balances)
+    prob_attempt = 1 - (1 - prob_create) * (1 - prob_support)
+    if not num_users or prob_attempt <= 0:
+        return []
+
+    users = rng.choice(num_users, rng.binomial(num_users, prob_attempt), replace=False)
+    user_balances = balances[users]
+    create_only = prob_create * (1 - prob_support) / prob_attempt
+    support_only = prob_support * (1 - prob_create) / prob_attempt
+    draw = rng.random(len(users))
+    creates = (draw < create_only) | (draw >= create_only + support_only)
+    creates &= user_balances >= creation_stake
+    supports = (draw >= create_only) & (user_balances > 0)
+    # Support draws for every attempting user; only those that support are used
+    if len(live_initiatives):
+        initiatives = live_initiatives[rng.integers(len(live_initiatives), size=len(users))]
+    else:
+        supports[:] = False
+        initiatives = np.zeros(len(users), dtype=np.int64)
+    # As random.uniform, which also draws between bounds in either order
+    high = user_balances * params["max_support_tokens_fraction"]
+    amounts = 1 + (high - 1) * rng.random(len(users))
+    amounts = np.maximum(1.0, np.minimum(amounts, user_balances))
+    durations = rng.integers(
+        params["min_lock_duration_epochs"], params["max_lock_duration_epochs"] + 1, len(users)
+    )
+
+    actions: List[Action] = []
+    for i in np.flatnonzero(creates | supports).tolist():
+        user = int(users[i])
+        if creates[i]:
+            actions.append(Action(CREATE, user))
+        if supports[i]:
+            actions.append(
+                Action(SUPPORT, user, int(initiatives[i]), float(amounts[i]), int(durations[i]))
+            )
+    return actions
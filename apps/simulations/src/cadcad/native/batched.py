@@ -0,0 +1,466 @@
+"""
+Batched Monte Carlo engine.
+
+Advances many independent runs of one configuration together. The run
+index is the leading axis of every array (``[runs, users]`` balances,
+``[runs, locks]`` and ``[runs, initiatives]`` tables), so each PSUB is one
+vectorized pass over all runs instead of one interpreter loop per run.
+
+Every run draws from its own ``numpy.random.Generator`` spawned from a
+single ``SeedSequence``, so runs stay statistically independent and each
+run is reproducible from the seed. Runs follow the same PSUB semantics as
+``NativeEngine``, but actions are sampled with NumPy rather than Python's
+``random`` module, so results match the cadCAD engine in distribution
+rather than draw for draw.
+
+The batch does not implement the fixed point, lock ledger, sparse
+population or incentives modes of NativeEngine; BatchedEngine refuses
+parameters that select them (see unsupported_modes).
+"""
+
+import uuid
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from .engine import STATE_VARIABLES, NativeEngine
+from .tables import ACCEPTED, EXPIRED, LIVE, LOCK_RECORD_COLUMNS
+
+# NativeEngine parameters selecting modes the batch does not implement
+UNSUPPORTED_MODES = ("fixed_point", "lock_ledger", "sparse_population", "incentives_budget")
+
+
+def unsupported_modes(params: Dict[str, Any]) -> List[str]:
+    """Return the parameters in params that select modes the batch does not implement."""
+    return [name for name in UNSUPPORTED_MODES if params.get(name)]
+
+
+class BatchedEngine:
+    """Struct-of-arrays engine holding ``runs`` independent replicas of one model."""
+
+    LOCK_COLUMNS = LOCK_RECORD_COLUMNS
+
+    def __init__(
+        self,
+        initial_state: Union[Dict[str, Any], Sequence[Dict[str, Any]]],
+        params: Dict[str, Any],
+        runs: Optional[int] = None,
+        seed: Optional[int] = None,
+    ):
+        """
+        Build the batch from one initial state (shared by all runs) or one
+        initial state per run. All initial states must have the same users.
+        """
+        unsupported = unsupported_modes(params)
+        if unsupported:
+            raise ValueError(f"Batched runs do not support: {', '.join(unsupported)}")
+        if isinstance(initial_state, dict):
+            initial_states = [initial_state] * (runs or 1)
+        else:
+            initial_states = list(initial_state)
+        self.runs = R = len(initial_states)
+        self.params = params
+        self.rngs = [np.random.default_rng(s) for s in np.random.SeedSequence(seed).spawn(R)]
+
+        engines = [NativeEngine(state, params) for state in initial_states]
+        first = engines[0]
+        self.user_ids = first.user_ids
+        self.start_epoch = first.current_epoch
+        self.start_time = first.current_time
+        self.constants = first.constants
+        self.current_epoch = first.current_epoch
+        self.current_time = first.current_time
+
+        self.balances = np.stack([engine.balances for engine in engines])
+        self.circulating_supply = np.array(
+            [engine.circulating_supply for engine in engines], dtype=np.float64
+        )
+        self.locked_supply = np.array(
+            [engine.locked_supply for engine in engines], dtype=np.float64
+        )
+
+        # Initiatives: [runs, capacity] columns plus a per-run count
+        capacity = max(64, max(len(engine.initiatives) for engine in engines))
+        self.n_initiatives = np.array([len(e.initiatives) for e in engines], dtype=np.int64)
+        self.weight = np.zeros((R, capacity), dtype=np.float64)
+        self.last_support_epoch = np.zeros((R, capacity), dtype=np.int64)
+        self.status = np.zeros((R, capacity), dtype=np.int8)
+        self.creator = np.zeros((R, capacity), dtype=np.int64)
+        self.created_epoch = np.zeros((R, capacity), dtype=np.int64)
+        self.initiative_ids: List[List[str]] = []
+        # Display fields of initiatives loaded from the initial state; the
+        # fields of initiatives created by the batch are derived on demand
+        self.loaded: List[Dict[int, tuple]] = []
+        for r, engine in enumerate(engines):
+            table, n = engine.initiatives, len(engine.initiatives)
+            self.weight[r, :n] = table.view("weight")
+            self.last_support_epoch[r, :n] = table.view("last_support_epoch")
+            self.status[r, :n] = table.view("status")
+            self.initiative_ids.append(list(table.ids))
+            self.loaded.append(
+                {
+                    i: (
+                        table.titles[i],
+                        table.descriptions[i],
+                        table.created_at[i],
+                        table.last_support_time[i],
+                    )
+                    for i in range(n)
+                }
+            )
+
+        # Locks: [runs, capacity] columns with an active mask; rows
+        # [0, lock_count) of each run are allocated, inactive rows are holes
+        capacity = max(64, max(len(engine.locks) for engine in engines))
+        self.lock_count = np.array([len(e.locks) for e in engines], dtype=np.int64)
+        self.active = np.zeros((R, capacity), dtype=bool)
+        for name, dtype in self.LOCK_COLUMNS.items():
+            column = np.zeros((R, capacity), dtype=dtype)
+            for r, engine in enumerate(engines):
+                if name == "current_weight":
+                    column[r, : len(engine.locks)] = engine.lock_weights()
+                else:
+                    column[r, : len(engine.locks)] = engine.locks.view(name)
+            setattr(self, name, column)
+        for r, engine in enumerate(engines):
+            self.active[r, : len(engine.locks)] = True
+
+    # ------------------------------------------------------------------
+    # Table maintenance
+    # ------------------------------------------------------------------
+
+    def _reserve_initiatives(self, needed: int) -> None:
+        capacity = self.weight.shape[1]
+        if needed <= capacity:
+            return
+        new_capacity = max(capacity * 2, needed)
+        for name in ("weight", "last_support_epoch", "status", "creator", "created_epoch"):
+            column = getattr(self, name)
+            grown = np.zeros((self.runs, new_capacity), dtype=column.dtype)
+            grown[:, :capacity] = column
+            setattr(self, name, grown)
+
+    def _compact_locks(self) -> None:
+        """Move active locks to the front of each run, keeping their order."""
+        order = np.argsort(~self.active, axis=1, kind="stable")
+        for name in self.LOCK_COLUMNS:
+            setattr(self, name, np.take_along_axis(getattr(self, name), order, axis=1))
+        self.active = np.take_along_axis(self.active, order, axis=1)
+        self.lock_count = self.active.sum(axis=1)
+
+    def _reserve_locks(self, needed: np.ndarray) -> None:
+        capacity = self.active.shape[1]
+        if (self.lock_count + needed <= capacity).all():
+            return
+        self._compact_locks()
+        required = int((self.lock_count + needed).max())
+        if required <= capacity:
+            return
+        new_capacity = max(capacity * 2, required)
+        for name in list(self.LOCK_COLUMNS) + ["active"]:
+            column = getattr(self, name)
+            grown = np.zeros((self.runs, new_capacity), dtype=column.dtype)
+            grown[:, :capacity] = column
+            setattr(self, name, grown)
+
+    def _live_mask(self) -> np.ndarray:
+        allocated = np.arange(self.status.shape[1]) < self.n_initiatives[:, None]
+        return allocated & (self.status == LIVE)
+
+    # ------------------------------------------------------------------
+    # PSUBs
+    # ------------------------------------------------------------------
+
+    def advance_time(self) -> None:
+        """PSUB 1a: advance epoch and wall-clock time for every run."""
+        self.current_epoch += 1
+        self.current_time = self.current_time + timedelta(days=1)
+
+    def apply_user_actions(self) -> None:
+        """
+        PSUB 1b: sample and apply user actions for every run at once.
+
+        Each user creates and supports at most once per timestep, creating
+        first, and validation only involves the acting user's own balance,
+        so the transactional pass reduces to per-user array expressions.
+        """
+        params = self.params
+        R, U = self.balances.shape
+        creation_stake = params["initiative_creation_stake"]
+
+        draws = np.stack([rng.random((4, U)) for rng in self.rngs], axis=1)
+        durations = np.stack(
+            [
+                rng.integers(
+                    params["min_lock_duration_epochs"],
+                    params["max_lock_duration_epochs"],
+                    size=U,
+                    endpoint=True,
+                )
+                for rng in self.rngs
+            ]
+        )
+
+        start_balances = self.balances
+        live = self._live_mask()
+        n_live = live.sum(axis=1)
+
+        creates = (draws[0] < params["prob_create_initiative"]) & (start_balances >= creation_stake)
+        supports = (
+            (draws[1] < params["prob_support_initiative"])
+            & (start_balances > 0)
+            & (n_live > 0)[:, None]
+        )
+
+        # Support targets: the k-th live initiative of the run, k uniform
+        support_runs, support_users = np.nonzero(supports)
+        live_runs, live_rows = np.nonzero(live)
+        offsets = np.concatenate(([0], np.cumsum(n_live)[:-1]))
+        picks = (draws[2][support_runs, support_users] * n_live[support_runs]).astype(np.int64)
+        support_inits = live_rows[offsets[support_runs] + picks]
+
+        user_balances = start_balances[support_runs, support_users]
+        amounts = (
+            1
+            + (user_balances * params["max_support_tokens_fraction"] - 1)
+            * draws[3][support_runs, support_users]
+        )
+        amounts = np.maximum(1.0, np.minimum(amounts, user_balances))
+        support_durations = durations[support_runs, support_users]
+
+        # Each user's stake is taken first, then the lock if the rest covers it
+        balances = start_balances.copy()
+        balances[creates] -= creation_stake
+        valid = balances[support_runs, support_users] >= amounts
+        support_runs, support_users = support_runs[valid], support_users[valid]
+        support_inits, amounts = support_inits[valid], amounts[valid]
+        support_durations = support_durations[valid]
+        np.subtract.at(balances, (support_runs, support_users), amounts)
+        self.balances = balances
+
+        total_locked = np.bincount(support_runs, weights=amounts, minlength=R)
+        self.circulating_supply -= total_locked
+        self.locked_supply += total_locked
+        self.last_support_epoch[support_runs, support_inits] = self.current_epoch
+
+        self._add_locks(support_runs, support_users, support_inits, amounts, support_durations)
+        self._add_initiatives(*np.nonzero(creates))
+
+    def _add_locks(
+        self,
+        runs: np.ndarray,
+        users: np.ndarray,
+        initiatives: np.ndarray,
+        amounts: np.ndarray,
+        durations: np.ndarray,
+    ) -> None:
+        if not len(runs):
+            return
+        epoch = self.current_epoch
+
+        # A new lock replaces an existing (user, initiative) lock in its run
+        stride = self.weight.shape[1]
+        width = len(self.user_ids) * stride
+        new_keys = runs * width + users * stride + initiatives
+        existing_keys = np.arange(self.runs)[:, None] * width + self.user * stride + self.initiative
+        self.active &= ~np.isin(existing_keys, new_keys)
+
+        added = np.bincount(runs, minlength=self.runs)
+        self._reserve_locks(added)
+        order = np.argsort(runs, kind="stable")
+        runs, users, initiatives = runs[order], users[order], initiatives[order]
+        amounts, durations = amounts[order], durations[order]
+        first_of_run = np.concatenate(([0], np.cumsum(added)[:-1]))
+        slots = self.lock_count[runs] + np.arange(len(runs)) - first_of_run[runs]
+
+        weights = amounts * durations
+        index = (runs, slots)
+        self.user[index] = users
+        self.initiative[index] = initiatives
+        self.amount[index] = amounts
+        self.duration[index] = durations
+        self.start[index] = epoch
+        self.expiry[index] = epoch + durations
+        self.initial_weight[index] = weights
+        self.current_weight[index] = weights
+        self.active[index] = True
+        self.lock_count += added
+
+    def _add_initiatives(self, runs: np.ndarray, users: np.ndarray) -> None:
+        if not len(runs):
+            return
+        added = np.bincount(runs, minlength=self.runs)
+        self._reserve_initiatives(int((self.n_initiatives + added).max()))
+        first_of_run = np.concatenate(([0], np.cumsum(added)[:-1]))
+        rows = self.n_initiatives[runs] + np.arange(len(runs)) - first_of_run[runs]
+        index = (runs, rows)
+        self.weight[index] = 0.0
+        self.last_support_epoch[index] = self.current_epoch
+        self.created_epoch[index] = self.current_epoch
+        self.creator[index] = users
+        self.status[index] = LIVE
+        self.n_initiatives += added
+        for r, count in enumerate(added.tolist()):
+            self.initiative_ids[r].extend(str(uuid.uuid4()) for _ in range(count))
+
+    def decay_and_aggregate(self) -> None:
+        """PSUB 2: aggregate weights from pre-decay locks, then decay them."""
+        R, capacity = self.weight.shape
+        flat = np.arange(R)[:, None] * capacity + self.initiative
+        self.weight = np.bincount(
+            flat[self.active],
+            weights=self.current_weight[self.active],
+            minlength=R * capacity,
+        ).reshape(R, capacity)
+
+        epoch = self.current_epoch
+        decaying = self.active & (self.start < epoch) & (epoch < self.expiry)
+        self.current_weight[decaying] = np.maximum(
+            0, self.current_weight[decaying] * self.params["decay_multiplier"]
+        )
+
+    def process_accepted(self) -> None:
+        """PSUB 3a: accept live initiatives at or above the threshold."""
+        accepted = self._live_mask() & (self.weight >= self.params["acceptance_threshold"])
+        self.status[accepted] = ACCEPTED
+
+    def process_expired(self) -> None:
+        """PSUB 3b: expire live initiatives without locks past the inactivity period."""
+        R, capacity = self.status.shape
+        flat = np.arange(R)[:, None] * capacity + self.initiative
+        has_support = (
+            np.bincount(flat[self.active], minlength=R * capacity).reshape(R, capacity) > 0
+        )
+        inactive = self.current_epoch - self.last_support_epoch >= self.params["inactivity_period"]
+        self.status[self._live_mask() & ~has_support & inactive] = EXPIRED
+
+    def process_lifecycle(self) -> None:
+        """PSUB 3c: unlock locks of accepted initiatives and expired locks."""
+        accepted = np.take_along_axis(self.status == ACCEPTED, self.initiative, axis=1)
+        unlock = self.active & (accepted | (self.current_epoch >= self.expiry))
+        if not unlock.any():
+            return
+        runs, slots = np.nonzero(unlock)
+        amounts = self.amount[runs, slots]
+        np.add.at(self.balances, (runs, self.user[runs, slots]), amounts)
+        total_unlocked = np.bincount(runs, weights=amounts, minlength=self.runs)
+        self.circulating_supply += total_unlocked
+        self.locked_supply = np.maximum(0, self.locked_supply - total_unlocked)
+        self.active &= ~unlock
+
+    def step(self) -> None:
+        """Advance every run by one timestep."""
+        self.advance_time()
+        self.apply_user_actions()
+        self.decay_and_aggregate()
+        self.process_accepted()
+        self.process_expired()
+        self.process_lifecycle()
+
+    # ------------------------------------------------------------------
+    # Materialization
+    # ------------------------------------------------------------------
+
+    def snapshot(self, run: int) -> Dict[str, Any]:
+        """Return one run's state in the cadCAD dict form used by NativeEngine."""
+        n = int(self.n_initiatives[run])
+        ids = self.initiative_ids[run]
+        weights = self.weight[run, :n].tolist()
+        last_epochs = self.last_support_epoch[run, :n].tolist()
+        created = self.created_epoch[run, :n].tolist()
+        creators = self.creator[run, :n].tolist()
+        status = self.status[run, :n]
+
+        initiatives = {}
+        for i in range(n):
+            last_support_time = self.start_time + timedelta(days=last_epochs[i] - self.start_epoch)
+            if i in self.loaded[run]:
+                title, description, created_at, loaded_support_time = self.loaded[run][i]
+                if last_epochs[i] <= self.start_epoch:
+                    last_support_time = loaded_support_time
+            else:
+                creator = self.user_ids[creators[i]]
+                title = f"Initiative by {creator} at epoch {created[i]}"
+                description = f"A new idea proposed by {creator}."
+                created_at = self.start_time + timedelta(days=created[i] - self.start_epoch)
+            initiatives[ids[i]] = {
+                "id": ids[i],
+                "title": title,
+                "description": description,
+                "created_at": created_at,
+                "weight": weights[i],
+                "last_support_time": last_support_time,
+                "last_support_epoch": last_epochs[i],
+            }
+
+        rows = np.flatnonzero(self.active[run])
+        columns = [getattr(self, name)[run, rows].tolist() for name in self.LOCK_COLUMNS]
+        locks = {}
+        for user, init, amount, duration, start, expiry, initial, current in zip(*columns):
+            user_id, init_id = self.user_ids[user], ids[init]
+            locks[(user_id, init_id)] = {
+                "user_id": user_id,
+                "initiative_id": init_id,
+                "amount": amount,
+                "lock_duration_epochs": duration,
+                "start_epoch": start,
+                "initial_weight": initial,
+                "current_weight": current,
+                "expiry_epoch": expiry,
+            }
+
+        values = {
+            "current_epoch": self.current_epoch,
+            "current_time": self.current_time.isoformat(),
+            "initiatives": initiatives,
+            "accepted_initiatives": {ids[i] for i in np.flatnonzero(status == ACCEPTED)},
+            "expired_initiatives": {ids[i] for i in np.flatnonzero(status == EXPIRED)},
+            "locks": locks,
+            "circulating_supply": float(self.circulating_supply[run]),
+            "locked_supply": float(self.locked_supply[run]),
+            "balances": dict(zip(self.user_ids, self.balances[run].tolist())),
+            "reward_earnings": {},
+            "reward_history": [],
+            **self.constants,
+        }
+        return {name: values[name] for name in STATE_VARIABLES}
+
+
+def run_batched_simulation(
+    initial_state: Union[Dict, Sequence[Dict]],
+    num_epochs: Optional[int] = None,
+    sim_params: Optional[Dict[str, Any]] = None,
+    runs: Optional[int] = None,
+    seed: Optional[int] = None,
+    record_timesteps: bool = True,
+) -> List[List[Dict]]:
+    """
+    Run ``runs`` Monte Carlo replicas (default ``sim_params["N"]``) as one batch.
+
+    Returns one result list per run. Each list holds the initial record
+    and, when record_timesteps is set, the state at the end of every
+    timestep (substep 6); otherwise only the final state is kept.
+    """
+    if sim_params is None:
+        from ..model import simulation_parameters as sim_params
+
+    timesteps = range(num_epochs) if num_epochs is not None else sim_params["T"]
+    if runs is None and isinstance(initial_state, dict):
+        runs = sim_params.get("N", 1)
+    engine = BatchedEngine(initial_state, sim_params["M"], runs=runs, seed=seed)
+
+    def record(run: int, timestep: int, substep: int) -> Dict:
+        snapshot = engine.snapshot(run)
+        snapshot.update(
+            simulation=0, subset="default", run=run + 1, substep=substep, timestep=timestep
+        )
+        return snapshot
+
+    results = [[record(run, 0, 0)] for run in range(engine.runs)]
+    for timestep in range(1, len(timesteps) + 1):
+        engine.step()
+        if record_timesteps or timestep == len(timesteps):
+            for run in range(engine.runs):
+                results[run].append(record(run, timestep, 6))
+    return results
@@ -0,0 +1,299 @@
+"""
+Several boards sharing one holder population.
+
+SignalsFactory deploys many boards against the same governance token, so
+holders split one balance between them. MultiBoardSimulation runs one
+NativeEngine per board, each with its own parameter overrides (acceptance
+threshold, decay, action probabilities, ...), against a shared array of
+free balances:
+
+1. The coordinator draws every board's user actions from the shared
+   balances (see actions.sample_sparse_user_actions).
+2. It reconciles them in random order: an action whose cost, the creation
+   stake or the tokens to lock, the user can still pay reserves that cost
+   from the shared balance; the others are dropped.
+3. Each board applies its reserved actions and runs its own decay,
+   acceptance, expiry and unlock PSUBs, and hands back the tokens it
+   released, which return to the shared balances.
+
+A board engine's balances only hold the tokens reserved to it within a
+step, so only reservations and releases cross between the coordinator and
+the boards. Boards are sharded across worker processes, which keep their
+engines for the whole run; with no workers they run in the coordinator's
+process. Boards draw no random numbers, so results do not depend on the
+number of workers.
+
+Boards start without initiatives or locks; those of the initial state are
+ignored, and its balances become the shared free balances. With
+lock_ledger, every support mints a new lock and the shared supply is
+conserved; otherwise a repeated support replaces its lock as in the
+single-board model.
+"""
+
+import multiprocessing
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..retention import SUMMARY_COUNTS
+from .actions import CREATE, Action, sample_sparse_user_actions
+from .engine import NativeEngine
+from .tables import ACCEPTED, EXPIRED
+
+# Actions reserved to a board in one step, with the users and costs reserved
+Reservation = Tuple[List[int], List[float], List[Action]]
+
+
+class Board:
+    """One board's engine, whose balances hold only the tokens reserved to it."""
+
+    def __init__(self, index: int, initial_state: Dict[str, Any], params: Dict[str, Any]):
+        self.index = index
+        state = dict(initial_state)
+        state.update(
+            initiatives={},
+            accepted_initiatives=set(),
+            expired_initiatives=set(),
+            locks={},
+            balances=dict.fromkeys(initial_state["balances"], 0.0),
+            circulating_supply=0,
+            locked_supply=0,
+        )
+        self.engine = NativeEngine(state, params)
+
+    def step(self, reservation: Reservation) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Dict]:
+        """
+        Run one epoch on the reserved actions.
+
+        Returns the users and amounts released back to the shared balances,
+        the live initiatives and the board's summary.
+        """
+        users, costs, actions = reservation
+        engine = self.engine
+        engine.advance_time()
+        np.add.at(engine.balances, np.array(users, dtype=np.int64), costs)
+        engine.apply_user_actions(actions)
+        engine.decay_and_aggregate()
+        engine.process_accepted()
+        engine.process_expired()
+        engine.process_lifecycle()
+
+        # Unlocked tokens and the reservations of rejected actions
+        released = np.flatnonzero(engine.balances)
+        amounts = engine.balances[released]
+        engine.balances[released] = 0.0
+        return released, amounts, engine.initiatives.live_rows(), self.summary()
+
+    def summary(self) -> Dict[str, Any]:
+        """The board's locked supply and the sizes of its collections."""
+        engine = self.engine
+        status = engine.initiatives.view("status")
+        counts = {
+            "initiatives": len(engine.initiatives),
+            "accepted_initiatives": int((status == ACCEPTED).sum()),
+            "expired_initiatives": int((status == EXPIRED).sum()),
+            "locks": len(engine.locks),
+        }
+        summary = {"board": self.index, "locked_supply": engine.locked_supply}
+        summary.update((SUMMARY_COUNTS[name], count) for name, count in counts.items())
+        return summary
+
+
+def _handle(boards: Dict[int, Board], command: str, payload: Any) -> Any:
+    if command == "step":
+        return {index: boards[index].step(payload[index]) for index in boards}
+    if command == "snapshot":
+        return boards[payload].engine.snapshot()
+    raise ValueError(f"Unknown board command: {command}")
+
+
+def _serve(connection, initial_state: Dict[str, Any], shard: Dict[int, Dict[str, Any]]) -> None:
+    """Worker loop holding a shard of boards until the coordinator closes it."""
+    boards = {index: Board(index, initial_state, params) for index, params in shard.items()}
+    while True:
+        message = connection.recv()
+        if message is None:
+            break
+        try:
+            reply = _handle(boards, *message)
+        except Exception as error:
+            reply = error
+        connection.send(reply)
+    connection.close()
+
+
+class _LocalShard:
+    """Boards run in the coordinator's process."""
+
+    def __init__(self, initial_state: Dict[str, Any], shard: Dict[int, Dict[str, Any]]):
+        self.boards = {
+            index: Board(index, initial_state, params) for index, params in shard.items()
+        }
+
+    def send(self, command: str, payload: Any) -> None:
+        self.reply = _handle(self.boards, command, payload)
+
+    def receive(self) -> Any:
+        return self.reply
+
+    def close(self) -> None:
+        pass
+
+
+class _ProcessShard:
+    """Boards run in a worker process."""
+
+    def __init__(self, initial_state: Dict[str, Any], shard: Dict[int, Dict[str, Any]]):
+        self.connection, child = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(
+            target=_serve, args=(child, initial_state, shard), daemon=True
+        )
+        self.process.start()
+        child.close()
+
+    def send(self, command: str, payload: Any) -> None:
+        self.connection.send((command, payload))
+
+    def receive(self) -> Any:
+        reply = self.connection.recv()
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+    def close(self) -> None:
+        self.connection.send(None)
+        self.process.join()
+        self.connection.close()
+
+
+class MultiBoardSimulation:
+    """
+    Boards sharing one holder population, sharded across worker processes.
+
+    boards holds one dict of parameter overrides per board, applied on top
+    of params. With workers, boards are dealt round-robin to that many
+    worker processes; close the simulation, or use it as a context
+    manager, to stop them.
+    """
+
+    def __init__(
+        self,
+        initial_state: Dict[str, Any],
+        params: Dict[str, Any],
+        boards: Sequence[Dict[str, Any]],
+        workers: int = 0,
+        seed: Optional[int] = None,
+    ):
+        if not boards:
+            raise ValueError("At least one board is required")
+        self.board_params = [{**params, **overrides} for overrides in boards]
+        self.user_ids: List[str] = list(initial_state["balances"])
+        self.balances = np.array(list(initial_state["balances"].values()), dtype=np.float64)
+        self.current_epoch: int = initial_state["current_epoch"]
+        self.rng = np.random.default_rng(seed)
+        self.live: List[np.ndarray] = [np.zeros(0, dtype=np.int64) for _ in boards]
+
+        self.summaries: List[Dict[str, Any]] = [
+            {"board": index, "locked_supply": 0, **dict.fromkeys(SUMMARY_COUNTS.values(), 0)}
+            for index in range(len(boards))
+        ]
+
+        # Board indices held by each shard, dealt round-robin
+        count = min(max(workers, 1), len(boards))
+        self.shard_boards = [list(range(len(boards)))[start::count] for start in range(count)]
+        shard_type = _ProcessShard if workers else _LocalShard
+        self.shards = [
+            shard_type(initial_state, {index: self.board_params[index] for index in indices})
+            for indices in self.shard_boards
+        ]
+
+    def reserve(self) -> List[Reservation]:
+        """Draw every board's actions and reserve their costs from the shared balances."""
+        drawn = []
+        for index, params in enumerate(self.board_params):
+            stake = params["initiative_creation_stake"]
+            actions = sample_sparse_user_actions(params, self.balances, self.live[index], self.rng)
+            drawn.extend(
+                (index, action, stake if action.kind == CREATE else action.amount)
+                for action in actions
+            )
+
+        reservations: List[Reservation] = [([], [], []) for _ in self.board_params]
+        balances = self.balances
+        for i in self.rng.permutation(len(drawn)).tolist():
+            index, action, cost = drawn[i]
+            if balances[action.user] < cost:
+                continue
+            balances[action.user] -= cost
+            users, costs, actions = reservations[index]
+            users.append(action.user)
+            costs.append(cost)
+            actions.append(action)
+        return reservations
+
+    def step(self) -> Dict[str, Any]:
+        """Run one epoch on every board and return its record."""
+        reservations = self.reserve()
+        for shard, indices in zip(self.shards, self.shard_boards):
+            shard.send("step", {index: reservations[index] for index in indices})
+        for shard in self.shards:
+            for index, (users, amounts, live, summary) in shard.receive().items():
+                np.add.at(self.balances, users, amounts)
+                self.live[index] = live
+                self.summaries[index] = summary
+        self.current_epoch += 1
+        return self.record()
+
+    def record(self) -> Dict[str, Any]:
+        """The shared supply figures and every board's summary."""
+        return {
+            "current_epoch": self.current_epoch,
+            "circulating_supply": float(self.balances.sum()),
+            "locked_supply": sum(summary["locked_supply"] for summary in self.summaries),
+            "boards": list(self.summaries),
+        }
+
+    def snapshot(self, board: int) -> Dict[str, Any]:
+        """Return a board's state in cadCAD dict form, with the shared free balances."""
+        shard = self.shards[board % len(self.shard_boards)]
+        shard.send("snapshot", board)
+        snapshot = shard.receive()
+        snapshot["balances"] = dict(zip(self.user_ids, self.balances.tolist()))
+        return snapshot
+
+    def close(self) -> None:
+        """Stop the worker processes."""
+        for shard in self.shards:
+            shard.close()
+        self.shards = []
+
+    def __enter__(self) -> "MultiBoardSimulation":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def run_multi_board_simulation(
+    initial_state: Dict,
+    boards: Sequence[Dict[str, Any]],
+    num_epochs: Optional[int] = None,
+    sim_params: Optional[Dict[str, Any]] = None,
+    workers: int = 0,
+    seed: Optional[int] = None,
+) -> List[Dict]:
+    """
+    Run boards sharing initial_state's holders and return one record per timestep.
+
+    Each record holds the timestep, the shared circulating and locked
+    supply and every board's summary (see Board.summary). N is ignored.
+    """
+    if sim_params is None:
+        from ..model import simulation_parameters as sim_params
+
+    timesteps = range(num_epochs) if num_epochs is not None else sim_params["T"]
+    with MultiBoardSimulation(initial_state, sim_params["M"], boards, workers, seed) as simulation:
+        results = [{**simulation.record(), "timestep": 0}]
+        for timestep in range(1, len(timesteps) + 1):
+            results.append({**simulation.step(), "timestep": timestep})
+    return results
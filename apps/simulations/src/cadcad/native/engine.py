@@ -0,0 +1,776 @@
+"""
+Native NumPy simulation engine.
+
+Runs the same partial state update blocks as ``cadcad.model`` (time,
+user actions, decay and aggregate weights, acceptance, expiry, unlock)
+over struct-of-arrays tables instead of cadCAD dicts. Results are returned
+in the same shape as ``cadcad.model.run_simulation``: one record per
+substep, with the state variables plus cadCAD's ``simulation``, ``subset``,
+``run``, ``substep`` and ``timestep`` fields.
+
+With the fixed_point parameter, lock weights and acceptance use the
+contracts' integer arithmetic instead (see fixed_point). With the
+lock_ledger parameter, every support mints a new lock in an append-only
+LockLedger, as Signals.sol does, instead of replacing the supporter's
+lock on the initiative; lock records are then keyed by lock ID. With the
+sparse_population parameter, only users who act are visited and balances
+and locks are recorded as deltas (see population). With an incentives
+budget, supports earn IncentivesPool credits that are paid out when their
+initiative is accepted (see incentives).
+"""
+
+import functools
+import operator
+import random
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from ..retention import SUMMARY_COUNTS, HistoryRetention
+from ..sufs.base import get_state_obj
+from ..sufs.governance import requires_exhaustive_acceptance
+from .actions import (
+    CREATE,
+    SUPPORT,
+    Action,
+    sample_active_epoch_actions,
+    sample_quiet_epochs,
+    sample_sparse_user_actions,
+    sample_user_actions,
+)
+from .tables import (
+    ACCEPTED,
+    EXPIRED,
+    LIVE,
+    LOCK_RECORD_COLUMNS,
+    AggregateWeights,
+    InitiativeTable,
+    LockLedger,
+    LockTable,
+    PowerTable,
+)
+from .fixed_point import DecayCurve, FixedPointLockLedger, FixedPointLockTable, to_units
+from .incentives import IncentivesPool
+from .population import DELTA_VARIABLES, fold_deltas
+from .scheduler import DeadlineQueue
+
+# Number of PSUBs per timestep in cadcad.model.psubs
+SUBSTEPS_PER_TIMESTEP = 6
+
+# Lock columns identifying a lock's contribution to AggregateWeights
+AGGREGATE_COLUMNS = ("initiative", "anchor_weight", "anchor_epoch")
+
+# State variables in the order produced by State.__dict__
+STATE_VARIABLES = (
+    "current_epoch",
+    "current_time",
+    "initiatives",
+    "accepted_initiatives",
+    "expired_initiatives",
+    "locks",
+    "acceptance_threshold",
+    "inactivity_period",
+    "decay_multiplier",
+    "total_supply",
+    "circulating_supply",
+    "locked_supply",
+    "rewards_distributed",
+    "balances",
+    "reward_earnings",
+    "reward_history",
+)
+
+
+class NativeEngine:
+    """Array-backed implementation of the Signals PSUB pipeline for a single run."""
+
+    def __init__(
+        self,
+        initial_state: Dict[str, Any],
+        params: Dict[str, Any],
+        rng: random.Random = random,
+    ):
+        self.params = params
+        self.rng = rng
+
+        state = get_state_obj(initial_state)
+        self.current_epoch: int = state.current_epoch
+        self.current_time: datetime = state.current_time
+        self.circulating_supply = state.circulating_supply
+        self.locked_supply = state.locked_supply
+
+        self.user_ids: List[str] = list(state.balances.keys())
+        self.user_index: Dict[str, int] = {uid: i for i, uid in enumerate(self.user_ids)}
+        self.balances = np.array(list(state.balances.values()), dtype=np.float64)
+
+        self.initiatives = InitiativeTable()
+        for init_id, initiative in state.initiatives.items():
+            if init_id in state.accepted_initiatives:
+                status = ACCEPTED
+            elif init_id in state.expired_initiatives:
+                status = EXPIRED
+            else:
+                status = LIVE
+            self.initiatives.add(
+                init_id,
+                initiative.title,
+                initiative.description,
+                initiative.created_at,
+                initiative.last_support_epoch,
+                last_support_time=initiative.last_support_time,
+                weight=initiative.weight,
+                status=status,
+            )
+
+        self.fixed_point = params.get("fixed_point", False)
+        self.sparse_population = params.get("sparse_population", False)
+        # Sparse populations append supports to a ledger rather than search the locks
+        self.lock_ledger = params.get("lock_ledger", False) or self.sparse_population
+        if self.fixed_point:
+            decimals = params.get("token_decimals", 18)
+            table = FixedPointLockLedger if self.lock_ledger else FixedPointLockTable
+            self.locks = table(DecayCurve.from_params(params), decimals)
+            self.threshold_units = to_units(params["acceptance_threshold"], decimals)
+            # Initiative weights in base units, as of the last decay PSUB
+            self.weight_units = np.zeros(0, dtype=np.int64)
+        else:
+            self.locks = LockLedger() if self.lock_ledger else LockTable()
+        for support in state.locks.values():
+            self.locks.put(
+                self.user_index[support.user_id],
+                self.initiatives.index[support.initiative_id],
+                support.amount,
+                support.lock_duration_epochs,
+                support.start_epoch,
+                initial_weight=support.initial_weight,
+                current_weight=support.current_weight,
+                expiry=support.expiry_epoch,
+                anchor_epoch=state.current_epoch,
+            )
+        self.aggregate = AggregateWeights(params["decay_multiplier"], state.current_epoch)
+        self.powers = PowerTable(params["decay_multiplier"])
+        # Last epoch whose decay PSUB has run; lock weights are evaluated lazily
+        self.decayed_through: int = state.current_epoch
+        self.aggregate.add(*(self.locks.view(name) for name in AGGREGATE_COLUMNS))
+
+        # Lock expiries keyed by (user, initiative), or by lock ID in a
+        # ledger, and initiative inactivity deadlines; lifecycle and expiry
+        # processing only visit what is due
+        self.lock_deadlines = DeadlineQueue(
+            zip(
+                self.locks.view("expiry").tolist(),
+                [self._lock_key(row) for row in range(len(self.locks))],
+            )
+        )
+        inactivity_period = params["inactivity_period"]
+        live = self.initiatives.live_rows()
+        self.inactivity_deadlines = DeadlineQueue(
+            zip(
+                (self.initiatives.last_support_epoch[live] + inactivity_period).tolist(),
+                live.tolist(),
+            )
+        )
+        # Initiatives supported in the current epoch, checked for acceptance;
+        # the first check of a run covers every initiative
+        self.supported: List[int] = []
+        self.check_all_initiatives = True
+        # Next epoch in which a user attempts an action, when skipping quiet epochs
+        self.next_action_epoch: Optional[int] = None
+        # Accepted initiatives whose locks are released by the next lifecycle PSUB
+        self.accepted_unlocks: List[int] = np.flatnonzero(
+            self.initiatives.view("status") == ACCEPTED
+        ).tolist()
+
+        # Variables that are copied through unchanged by every PSUB
+        self.constants = {
+            "acceptance_threshold": state.acceptance_threshold,
+            "inactivity_period": state.inactivity_period,
+            "decay_multiplier": state.decay_multiplier,
+            "total_supply": state.total_supply,
+            "rewards_distributed": state.rewards_distributed,
+        }
+        self.reward_earnings = dict(initial_state.get("reward_earnings", {}))
+        self.reward_history = list(initial_state.get("reward_history", []))
+        # Incentive credits and payments, with an incentives budget
+        self.incentives = IncentivesPool.from_params(params)
+
+        self._cache: Dict[str, Any] = {}
+        # Changes not yet recorded, in sparse population mode: users whose
+        # balance changed, the first lock ID not recorded and redeemed lock IDs
+        self._touched: Optional[np.ndarray] = None
+        if self.sparse_population:
+            self._touched = np.ones(len(self.balances), dtype=bool)
+            self._recorded_lock_id = 1
+            self._redeemed_lock_ids: List[int] = []
+            self.np_rng = np.random.default_rng(rng.getrandbits(64))
+
+    # ------------------------------------------------------------------
+    # PSUBs
+    # ------------------------------------------------------------------
+
+    def advance_time(self, epochs: int = 1) -> None:
+        """PSUB 1a: advance epoch and wall-clock time."""
+        self.current_epoch += epochs
+        self.current_time = self.current_time + timedelta(days=epochs)
+        self._invalidate("current_epoch", "current_time")
+
+    def apply_user_actions(self, actions: List[Action]) -> None:
+        """
+        PSUB 1b: apply user actions in a single transactional pass.
+
+        Mirrors ``sufs.user_actions.apply_user_actions``: each action is
+        validated once against the running balance and applied atomically.
+        """
+        self.supported = []
+        if not actions:
+            return
+
+        epoch = self.current_epoch
+        creation_stake = self.params["initiative_creation_stake"]
+        inactivity_period = self.params["inactivity_period"]
+        balances = self.balances
+        touched = self._touched
+        initiatives = self.initiatives
+
+        locks = self.locks
+        incentives = self.incentives
+        # Anchors of replaced and new locks, applied to the aggregate at the end
+        replaced, added = [], []
+
+        for action in actions:
+            user = action.user
+            balance = balances[user]
+            if action.kind == CREATE:
+                if balance < creation_stake:
+                    continue
+                row = initiatives.add(
+                    str(uuid.uuid4()),
+                    f"Initiative by {self.user_ids[user]} at epoch {epoch}",
+                    f"A new idea proposed by {self.user_ids[user]}.",
+                    self.current_time,
+                    epoch,
+                )
+                self.inactivity_deadlines.push(epoch + inactivity_period, row)
+                balances[user] = balance - creation_stake
+                if touched is not None:
+                    touched[user] = True
+            elif action.kind == SUPPORT:
+                if not 0 <= action.initiative < len(initiatives) or balance < action.amount:
+                    continue
+                row = -1 if self.lock_ledger else locks.find(user, action.initiative)
+                if row >= 0:
+                    replaced.append(
+                        (action.initiative, locks.anchor_weight[row], locks.anchor_epoch[row])
+                    )
+                row = locks.put(
+                    user, action.initiative, action.amount, action.duration, epoch, row=row
+                )
+                added.append((action.initiative, locks.anchor_weight[row], epoch))
+                if incentives is not None:
+                    incentives.credit(
+                        action.initiative,
+                        user,
+                        float(locks.initial_weight[row]),
+                        epoch,
+                        action.amount,
+                        action.duration,
+                    )
+                balances[user] = balance - action.amount
+                if touched is not None:
+                    touched[user] = True
+                self.circulating_supply -= action.amount
+                self.locked_supply += action.amount
+                initiatives.last_support_epoch[action.initiative] = epoch
+                initiatives.last_support_time[action.initiative] = self.current_time
+                self.supported.append(action.initiative)
+                self.lock_deadlines.push(int(locks.expiry[row]), self._lock_key(row))
+                # Supporting an initiative pushes back its inactivity deadline
+                self.inactivity_deadlines.push(epoch + inactivity_period, action.initiative)
+                if initiatives.status[action.initiative] == ACCEPTED:
+                    self.accepted_unlocks.append(action.initiative)
+
+        if added:
+            self.aggregate.add(*(np.array(column) for column in zip(*added)))
+        if replaced:
+            self._refresh_aggregate(
+                self.aggregate.remove(*(np.array(column) for column in zip(*replaced)))
+            )
+
+        self._invalidate("initiatives", "locks", "balances", "circulating_supply", "locked_supply")
+
+    def decay_and_aggregate(self) -> None:
+        """
+        PSUB 2: aggregate initiative weights and decay lock weights.
+
+        Both SUFs read the state from the start of the block, so aggregate
+        weights are the weights before this epoch's decay. They are read
+        from the running sums in self.aggregate in O(initiatives). Lock
+        weights are closed-form in the epoch, so decaying them only moves
+        decayed_through; see lock_weights.
+
+        In fixed-point mode the weights are summed from the lock table in
+        base units instead, as the contracts sum them.
+        """
+        n_initiatives = len(self.initiatives)
+        if self.fixed_point:
+            self.weight_units = self.locks.aggregate(self.current_epoch, n_initiatives)
+            self.initiatives.weight[:n_initiatives] = self.locks.to_tokens(self.weight_units)
+        else:
+            self.initiatives.weight[:n_initiatives] = self.aggregate.read(
+                self.current_epoch, n_initiatives
+            )
+        self.decayed_through = self.current_epoch
+
+        self._invalidate("locks", "initiatives")
+
+    def process_accepted(self) -> None:
+        """
+        PSUB 3a: accept live initiatives whose weight reached the threshold.
+
+        Like ProcessAcceptedInitiativesSUF, only initiatives supported this
+        epoch are checked unless the first check of the run or the
+        parameters require checking all of them.
+        """
+        if self.check_all_initiatives or requires_exhaustive_acceptance(self.params):
+            self.check_all_initiatives = False
+            rows = np.arange(len(self.initiatives))
+        elif self.supported:
+            rows = np.unique(np.array(self.supported, dtype=np.int64))
+        else:
+            return
+        status = self.initiatives.status
+        if self.fixed_point:
+            reached = (self.weight_units[rows] >= self.threshold_units).astype(bool)
+        else:
+            reached = self.initiatives.weight[rows] >= self.params["acceptance_threshold"]
+        newly_accepted = rows[(status[rows] == LIVE) & reached]
+        if len(newly_accepted):
+            status[newly_accepted] = ACCEPTED
+            self.accepted_unlocks.extend(newly_accepted.tolist())
+            self._invalidate("accepted_initiatives")
+            if self.incentives is not None:
+                self._pay_incentives(newly_accepted)
+
+    def _pay_incentives(self, accepted: np.ndarray) -> None:
+        """Settle the incentive credits of newly accepted initiatives."""
+        # Earlier records keep the earnings they were taken with
+        earnings = dict(self.reward_earnings)
+        for initiative in accepted.tolist():
+            users, paid = self.incentives.settle(
+                initiative, self.current_epoch, float(self.initiatives.weight[initiative])
+            )
+            for user, amount in zip(users.tolist(), paid.tolist()):
+                user_id = self.user_ids[user]
+                earnings[user_id] = earnings.get(user_id, 0) + amount
+        self.reward_earnings = earnings
+        self._invalidate("reward_history")
+
+    def process_expired(self) -> None:
+        """
+        PSUB 3b: expire live initiatives without locks past the inactivity period.
+
+        Only initiatives whose inactivity deadline is due are checked. One
+        that still holds locks is rescheduled by process_lifecycle once its
+        last lock is released.
+        """
+        due = self.inactivity_deadlines.pop_due(self.current_epoch)
+        if not due:
+            return
+        rows = np.unique(np.array(due, dtype=np.int64))
+        status = self.initiatives.status
+        inactive = (
+            self.current_epoch - self.initiatives.last_support_epoch[rows]
+            >= self.params["inactivity_period"]
+        )
+        newly_expired = rows[(status[rows] == LIVE) & (self.aggregate.counts(rows) == 0) & inactive]
+        if len(newly_expired):
+            status[newly_expired] = EXPIRED
+            self._invalidate("expired_initiatives")
+
+    def process_lifecycle(self) -> None:
+        """
+        PSUB 3c: unlock locks of accepted initiatives and expired locks.
+
+        Only locks of initiatives accepted since the last call and locks
+        with a due expiry deadline are considered; epochs with neither
+        return without touching the lock table.
+        """
+        epoch = self.current_epoch
+        accepted_rows, self.accepted_unlocks = self.accepted_unlocks, []
+        due = self.lock_deadlines.pop_due(epoch)
+        locks = self.locks
+        if not (accepted_rows or due) or not len(locks):
+            return
+
+        lock_initiatives = locks.view("initiative")
+        unlock = np.zeros(len(locks), dtype=bool)
+        if accepted_rows:
+            accepted = np.zeros(len(self.initiatives), dtype=bool)
+            accepted[accepted_rows] = True
+            unlock |= accepted[lock_initiatives]
+        if due and self.lock_ledger:
+            # Lock IDs are sorted, so due locks are found by binary search
+            ids = locks.view("lock_id")
+            due_ids = np.array(due)
+            rows = np.minimum(np.searchsorted(ids, due_ids), len(ids) - 1)
+            unlock[rows[ids[rows] == due_ids]] = True
+        elif due:
+            # Deadlines of overwritten locks are stale; the expiry check drops them
+            stride = len(self.initiatives)
+            due_keys = [user * stride + initiative for user, initiative in due]
+            keys = locks.view("user") * stride + lock_initiatives
+            unlock |= np.isin(keys, due_keys) & (epoch >= locks.view("expiry"))
+        if not unlock.any():
+            return
+
+        amounts = locks.view("amount")[unlock]
+        np.add.at(self.balances, locks.view("user")[unlock], amounts)
+        if self._touched is not None:
+            self._touched[locks.view("user")[unlock]] = True
+            self._redeemed_lock_ids.extend(locks.view("lock_id")[unlock].tolist())
+        # Added left to right like the lifecycle SUF, for parity: amounts.sum() is
+        # pairwise and sum() compensated on Python 3.12+, so either can differ
+        total_unlocked = functools.reduce(operator.add, amounts.tolist(), 0)
+        self.circulating_supply += total_unlocked
+        self.locked_supply = max(0, self.locked_supply - total_unlocked)
+        removed = [locks.view(name)[unlock] for name in AGGREGATE_COLUMNS]
+        locks.remove(unlock)
+        self._refresh_aggregate(self.aggregate.remove(*removed))
+
+        # Initiatives left without locks can expire once they are inactive
+        released = np.unique(removed[0])
+        released = released[
+            (self.initiatives.status[released] == LIVE) & (self.aggregate.counts(released) == 0)
+        ]
+        deadlines = np.maximum(
+            self.initiatives.last_support_epoch[released] + self.params["inactivity_period"],
+            epoch + 1,
+        )
+        for deadline, row in zip(deadlines.tolist(), released.tolist()):
+            self.inactivity_deadlines.push(deadline, row)
+
+        self._invalidate("balances", "circulating_supply", "locked_supply", "locks")
+
+    def _lock_key(self, row: int) -> Any:
+        """Key of a lock's expiry deadline."""
+        if self.lock_ledger:
+            return int(self.locks.lock_id[row])
+        return (int(self.locks.user[row]), int(self.locks.initiative[row]))
+
+    def lock_weights(self) -> np.ndarray:
+        """Current weight of every lock, evaluated from its anchor."""
+        if self.fixed_point:
+            return self.locks.to_tokens(self.locks.weights(self.decayed_through))
+        return self.locks.weights_at(self.decayed_through, self.powers)
+
+    def _refresh_aggregate(self, stale: np.ndarray) -> None:
+        """Reset the aggregate sums of stale initiatives from their locks."""
+        if not len(stale):
+            return
+        flagged = np.zeros(len(self.initiatives), dtype=bool)
+        flagged[stale] = True
+        rows = flagged[self.locks.view("initiative")]
+        self.aggregate.reset(stale, *(self.locks.view(name)[rows] for name in AGGREGATE_COLUMNS))
+
+    def step(self) -> None:
+        """Advance one timestep through every PSUB without recording."""
+        for _ in self.substeps():
+            pass
+
+    def next_event_epoch(self, until: int) -> int:
+        """
+        Return the next epoch, at most until, in which a PSUB can change state.
+
+        Events are epochs in which a user attempts an action and due lock
+        expiry and inactivity deadlines. In the epochs in between, no
+        actions are applied, acceptance only checks supported initiatives
+        and nothing is due, so the only change is decay, which is closed-form
+        in the epoch. Checking every initiative for acceptance makes every
+        epoch an event.
+        """
+        epoch = self.current_epoch + 1
+        if self.next_action_epoch is None:
+            self.next_action_epoch = epoch + sample_quiet_epochs(
+                self.params, len(self.balances), self.rng
+            )
+        if self.check_all_initiatives or requires_exhaustive_acceptance(self.params):
+            return epoch
+        return max(epoch, min(until, self.next_action_epoch, self.next_deadline(until)))
+
+    def next_deadline(self, default: int) -> int:
+        """
+        Return the earliest lock expiry or inactivity deadline, or default.
+
+        Stale deadlines at the front of the queues, of overwritten or
+        released locks and of initiatives that were supported since or are
+        no longer live, are dropped first.
+        """
+        locks = self.locks
+        initiatives = self.initiatives
+        inactivity_period = self.params["inactivity_period"]
+
+        def lock_is_current(epoch: int, key: Any) -> bool:
+            row = locks.row_of(key) if self.lock_ledger else locks.find(*key)
+            return row >= 0 and locks.expiry[row] == epoch
+
+        def initiative_is_current(epoch: int, row: int) -> bool:
+            return (
+                initiatives.status[row] == LIVE
+                and epoch >= initiatives.last_support_epoch[row] + inactivity_period
+                and self.aggregate.counts(np.array([row]))[0] == 0
+            )
+
+        self.lock_deadlines.prune(lock_is_current)
+        self.inactivity_deadlines.prune(initiative_is_current)
+        epochs = [
+            queue.next_epoch()
+            for queue in (self.lock_deadlines, self.inactivity_deadlines)
+            if len(queue)
+        ]
+        return min(epochs, default=default)
+
+    def substeps(self, until: Optional[int] = None):
+        """
+        Run one timestep, yielding after each PSUB.
+
+        By default the timestep is the next epoch. With until, it is the
+        next event epoch (see next_event_epoch) and the quiet epochs before
+        it are skipped. Skipping draws user actions with
+        sample_active_epoch_actions, so runs match epoch-by-epoch stepping
+        in distribution but not under the same seed.
+        """
+        if until is None:
+            self.advance_time()
+            yield
+            if self.sparse_population:
+                actions = sample_sparse_user_actions(
+                    self.params, self.balances, self.initiatives.live_rows(), self.np_rng
+                )
+            else:
+                actions = sample_user_actions(
+                    self.params, self.balances, self.initiatives.live_rows(), self.rng
+                )
+        else:
+            epoch = self.next_event_epoch(until)
+            self.advance_time(epoch - self.current_epoch)
+            yield
+            actions = []
+            if epoch == self.next_action_epoch:
+                self.next_action_epoch = None
+                actions = sample_active_epoch_actions(
+                    self.params, self.balances, self.initiatives.live_rows(), self.rng
+                )
+        self.apply_user_actions(actions)
+        yield
+        self.decay_and_aggregate()
+        yield
+        self.process_accepted()
+        yield
+        self.process_expired()
+        yield
+        self.process_lifecycle()
+        yield
+
+    # ------------------------------------------------------------------
+    # Materialization
+    # ------------------------------------------------------------------
+
+    def _invalidate(self, *names: str) -> None:
+        for name in names:
+            self._cache.pop(name, None)
+
+    def _materialize(self, name: str) -> Any:
+        if name == "current_epoch":
+            return self.current_epoch
+        if name == "current_time":
+            return self.current_time.isoformat()
+        if name == "circulating_supply":
+            return self.circulating_supply
+        if name == "locked_supply":
+            return self.locked_supply
+        if name == "balances":
+            return dict(zip(self.user_ids, self.balances.tolist()))
+        if name == "initiatives":
+            table = self.initiatives
+            weights = table.view("weight").tolist()
+            last_epochs = table.view("last_support_epoch").tolist()
+            return {
+                table.ids[i]: {
+                    "id": table.ids[i],
+                    "title": table.titles[i],
+                    "description": table.descriptions[i],
+                    "created_at": table.created_at[i],
+                    "weight": weights[i],
+                    "last_support_time": table.last_support_time[i],
+                    "last_support_epoch": last_epochs[i],
+                }
+                for i in range(len(table))
+            }
+        if name == "accepted_initiatives":
+            rows = np.flatnonzero(self.initiatives.view("status") == ACCEPTED)
+            return {self.initiatives.ids[i] for i in rows}
+        if name == "expired_initiatives":
+            rows = np.flatnonzero(self.initiatives.view("status") == EXPIRED)
+            return {self.initiatives.ids[i] for i in rows}
+        if name == "locks":
+            return self._lock_records(slice(None))
+        if name == "reward_history":
+            return self.incentives.ledger.history(
+                self.user_ids, self.initiatives.ids, self.reward_history
+            )
+        raise KeyError(name)
+
+    def _lock_records(self, rows: Any) -> Dict[Any, Dict[str, Any]]:
+        """Lock records of the given rows, keyed as in the locks variable."""
+        locks = self.locks
+        columns = [
+            self.lock_weights()[rows].tolist()
+            if column == "current_weight"
+            else locks.view(column)[rows].tolist()
+            for column in LOCK_RECORD_COLUMNS
+        ]
+        keys = locks.view("lock_id")[rows].tolist() if self.lock_ledger else None
+        records = {}
+        for i, (user, init, amount, duration, start, expiry, initial, current) in enumerate(
+            zip(*columns)
+        ):
+            user_id = self.user_ids[user]
+            init_id = self.initiatives.ids[init]
+            record = {
+                "user_id": user_id,
+                "initiative_id": init_id,
+                "amount": amount,
+                "lock_duration_epochs": duration,
+                "start_epoch": start,
+                "initial_weight": initial,
+                "current_weight": current,
+                "expiry_epoch": expiry,
+            }
+            if keys is None:
+                records[(user_id, init_id)] = record
+            else:
+                records[keys[i]] = {"lock_id": keys[i], **record}
+        return records
+
+    def _delta(self, name: str) -> Dict[Any, Any]:
+        """Changes to balances or locks since the previous record, in sparse population mode."""
+        if name == "balances":
+            rows = np.flatnonzero(self._touched)
+            self._touched[rows] = False
+            return dict(zip([self.user_ids[i] for i in rows], self.balances[rows].tolist()))
+        locks = self.locks
+        start = int(np.searchsorted(locks.view("lock_id"), self._recorded_lock_id))
+        delta: Dict[Any, Any] = dict.fromkeys(self._redeemed_lock_ids)
+        if start < len(locks):
+            delta.update(self._lock_records(slice(start, None)))
+        self._recorded_lock_id = locks.next_id
+        self._redeemed_lock_ids = []
+        return delta
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return the state in cadCAD dict form.
+
+        Variables that did not change since the previous snapshot reuse the
+        same objects, so records should be treated as read-only. In sparse
+        population mode, balances and locks are deltas from the previous
+        snapshot (see population), and supporters_count holds the number of
+        live locks.
+        """
+        record = {}
+        for name in STATE_VARIABLES:
+            if name == "rewards_distributed" and self.incentives is not None:
+                record[name] = self.constants[name] + self.incentives.distributed
+            elif name in self.constants:
+                record[name] = self.constants[name]
+            elif self.sparse_population and name in DELTA_VARIABLES:
+                record[name] = self._delta(name)
+            elif name == "reward_earnings":
+                record[name] = self.reward_earnings
+            elif name == "reward_history" and self.incentives is None:
+                record[name] = self.reward_history
+            else:
+                if name not in self._cache:
+                    self._cache[name] = self._materialize(name)
+                record[name] = self._cache[name]
+        if self.sparse_population:
+            record[SUMMARY_COUNTS["locks"]] = len(self.locks)
+        return record
+
+
+def run_native_simulation(
+    initial_state: Dict,
+    num_epochs: Optional[int] = None,
+    sim_params: Optional[Dict[str, Any]] = None,
+    skip_quiet_epochs: bool = False,
+) -> List[Dict]:
+    """
+    Run the simulation on the native engine and return cadCAD-shaped records.
+
+    Accepts the same ``initial_state`` and simulation parameters as
+    ``cadcad.model.run_simulation``. Monte Carlo runs (``N``) are executed
+    one after another and tagged with their ``run`` number.
+
+    With skip_quiet_epochs, each run jumps from event to event (see
+    NativeEngine.next_event_epoch) and only records the timesteps it
+    visits. The state in a skipped timestep is that of the previous
+    recorded one, with lock and initiative weights further decayed.
+    """
+    if sim_params is None:
+        from ..model import simulation_parameters as sim_params
+
+    timesteps = range(num_epochs) if num_epochs is not None else sim_params["T"]
+    params = sim_params["M"]
+
+    results: List[Dict] = []
+    for run in range(1, sim_params.get("N", 1) + 1):
+        engine = NativeEngine(initial_state, params)
+        results.extend(record_run(engine, run, len(timesteps), skip_quiet_epochs))
+
+    return results
+
+
+def record_run(
+    engine: NativeEngine, run: int, num_timesteps: int, skip: bool = False
+) -> List[Dict]:
+    """
+    Step engine through num_timesteps and return its cadCAD-shaped records.
+
+    With skip, each step runs engine.substeps(until) with until at the end
+    of the horizon, and only the timesteps it visits are recorded. Records
+    are kept as selected by the history_retention parameter; in sparse
+    population mode, deltas of the records not kept are folded into the
+    next record kept.
+    """
+    retention = HistoryRetention.from_params(engine.params)
+    # Deltas of dropped records, carried over to the next kept one
+    pending: Dict[str, Dict] = {name: {} for name in DELTA_VARIABLES}
+
+    def retain(records: List[Dict], final: bool = False) -> List[Dict]:
+        kept = retention.retain(records, final)
+        if engine.sparse_population:
+            fold_deltas(records, len(kept), pending)
+        return kept
+
+    results: List[Dict] = []
+    record = engine.snapshot()
+    record.update(simulation=0, subset="default", run=run, substep=0, timestep=0)
+    timestep_records = [record]
+
+    start = engine.current_epoch
+    until = start + num_timesteps if skip else None
+    while engine.current_epoch < start + num_timesteps:
+        results.extend(retain(timestep_records))
+        timestep_records = []
+        for substep, _ in enumerate(engine.substeps(until), start=1):
+            timestep = engine.current_epoch - start
+            record = engine.snapshot()
+            record.update(
+                simulation=0, subset="default", run=run, substep=substep, timestep=timestep
+            )
+            timestep_records.append(record)
+    results.extend(retain(timestep_records, final=True))
+
+    return results
@@ -0,0 +1,168 @@
+"""
+Fixed-point lock weights matching the Signals contracts.
+
+Signals.sol keeps token amounts as integers and evaluates lock weights
+with DecayCurves.linear and DecayCurves.exponential, which scale the curve
+parameter by SignalsConstants.PRECISION and truncate at every integer
+division. With the fixed_point parameter set, the native engine keeps lock
+amounts in base units of token_decimals decimals and evaluates weights with
+the same integer arithmetic, so acceptance near acceptance_threshold is
+decided as the contracts would decide it.
+
+Weights follow the contracts rather than the float model: a lock weighs
+curve(elapsed) floored at its amount while elapsed < duration, and its
+amount afterwards, where elapsed is the number of epochs since it started.
+
+Columns are int64 while every intermediate product provably fits, and
+switch to object arrays of Python ints once one might not. The curve
+parameter's ratio to PRECISION is reduced first, which leaves every
+quotient unchanged and keeps products small: a multiplier of 0.9 is
+applied as w * 9 // 10.
+"""
+
+from fractions import Fraction
+from math import gcd
+from typing import Any, Dict
+
+import numpy as np
+
+from .tables import LockLedger, LockTable
+
+# SignalsConstants.PRECISION
+PRECISION = 10**18
+
+LINEAR = "linear"
+EXPONENTIAL = "exponential"
+
+INT64_MAX = int(np.iinfo(np.int64).max)
+
+
+def to_units(value: float, decimals: int) -> int:
+    """Convert a token amount to integer base units, rounding to the nearest unit."""
+    return round(Fraction(value) * 10**decimals)
+
+
+class DecayCurve:
+    """A DecayCurves curve and its parameter, scaled by PRECISION."""
+
+    def __init__(self, kind: str, parameter: int):
+        if kind not in (LINEAR, EXPONENTIAL):
+            raise ValueError(f"Unknown decay curve: {kind}")
+        if parameter < 0:
+            raise ValueError(f"Decay curve parameter must not be negative: {parameter}")
+        self.kind = kind
+        self.parameter = parameter
+        divisor = gcd(parameter, PRECISION)
+        self.numerator = parameter // divisor
+        self.denominator = PRECISION // divisor
+
+    @classmethod
+    def from_params(cls, params: Dict[str, Any]) -> "DecayCurve":
+        """
+        Build the curve selected by the model parameters.
+
+        decay_curve_parameter defaults to decay_multiplier for the
+        exponential curve, read as the decimal it is written as, and to a
+        1:1 decay for the linear one.
+        """
+        kind = params.get("decay_curve", EXPONENTIAL)
+        parameter = params.get("decay_curve_parameter")
+        if parameter is None:
+            if kind == EXPONENTIAL:
+                parameter = Fraction(str(params["decay_multiplier"])) * PRECISION
+            else:
+                parameter = PRECISION
+        return cls(kind, int(parameter))
+
+    @property
+    def growth(self) -> int:
+        """Largest factor an intermediate product exceeds a lock's initial weight by."""
+        return max(self.numerator, 1)
+
+
+class FixedPointLockTable(LockTable):
+    """
+    LockTable that also keeps amounts and weights as scaled integers.
+
+    units holds each lock's amount in base units. For the exponential
+    curve, chain holds the weight after chain_step truncating decay steps;
+    weights advances it lazily, so epochs passed to it must not decrease.
+    """
+
+    COLUMNS = {
+        **LockTable.COLUMNS,
+        "units": np.int64,
+        "chain": np.int64,
+        "chain_step": np.int64,
+    }
+
+    def __init__(self, curve: DecayCurve, decimals: int = 18, capacity: int = 64):
+        super().__init__(capacity)
+        self.curve = curve
+        self.decimals = decimals
+        self.scale = 10**decimals
+
+    @property
+    def exact(self) -> bool:
+        """Whether the integer columns have switched to Python ints."""
+        return self.units.dtype == object
+
+    def _widen(self) -> None:
+        self.units = self.units.astype(object)
+        self.chain = self.chain.astype(object)
+
+    def put(
+        self, user: int, initiative: int, amount: float, duration: int, start: int, **kwargs
+    ) -> int:
+        row = super().put(user, initiative, amount, duration, start, **kwargs)
+        units = to_units(amount, self.decimals)
+        if not self.exact and units * duration * self.curve.growth > INT64_MAX:
+            self._widen()
+        self.units[row] = units
+        self.chain[row] = units * duration
+        self.chain_step[row] = 0
+        return row
+
+    def weights(self, epoch: int) -> np.ndarray:
+        """Return every lock's weight at epoch in base units, as the contracts compute it."""
+        units = self.view("units")
+        duration = self.view("duration")
+        elapsed = np.minimum(epoch - self.view("start"), duration)
+        curve = self.curve
+
+        if curve.kind == EXPONENTIAL:
+            chain = self.view("chain")
+            steps = self.view("chain_step")
+            # Each pass applies one truncating step to the locks still behind
+            target = np.minimum(elapsed, duration - 1)
+            due = np.flatnonzero(steps < target)
+            while len(due):
+                chain[due] = chain[due] * curve.numerator // curve.denominator
+                steps[due] += 1
+                due = due[steps[due] < target[due]]
+            decayed = chain
+        else:
+            decayed = units * duration - units * elapsed * curve.numerator // curve.denominator
+
+        # Where the linear curve would underflow and revert, the floor applies
+        return np.where(elapsed >= duration, units, np.maximum(decayed, units))
+
+    def aggregate(self, epoch: int, n_initiatives: int) -> np.ndarray:
+        """Return the summed weight of each initiative's locks at epoch in base units."""
+        weights = self.weights(epoch)
+        if weights.dtype != object and len(weights):
+            if int(weights.max()) > INT64_MAX // len(weights):
+                weights = weights.astype(object)
+        sums = np.zeros(n_initiatives, dtype=weights.dtype)
+        np.add.at(sums, self.view("initiative"), weights)
+        return sums
+
+    def to_tokens(self, units: np.ndarray) -> np.ndarray:
+        """Convert base units to float token amounts."""
+        return np.asarray(units, dtype=np.float64) / self.scale
+
+
+class FixedPointLockLedger(LockLedger, FixedPointLockTable):
+    """LockLedger that also keeps amounts and weights as scaled integers."""
+
+    COLUMNS = {**FixedPointLockTable.COLUMNS, **LockLedger.COLUMNS}
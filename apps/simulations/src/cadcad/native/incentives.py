@@ -0,0 +1,340 @@
+"""
+Incentives pool rewards for the native engine.
+
+Models IncentivesPool's participation rewards. Every support credits its
+initiative with the lock's initial weight, as Signals._addLock does through
+addIncentivesCreditForLock, and the credit lands in one of the
+initiative's INCENTIVE_RESOLUTION time buckets. The buckets cover one
+epoch (an hour) each from the initiative's first credit; once the last
+bucket has passed, adjacent buckets are merged pairwise and the interval
+doubles (_reduceIncentiveBuckets).
+
+When an initiative is accepted, every credit recorded for it is settled at
+once, as claimIncentivesForLocks settles a payee's locks: a credit's share
+of the initiative's reward is its amount times its bucket's multiplier
+over the multiplier-weighted total of the buckets used, and payments stop
+when the board's budget runs out. Bucket multipliers are computed in WAD
+integers exactly as IncentivesMath.bucketMultipliers computes them.
+
+Payments are written to a RewardLedger, a columnar, append-only
+reward_history; its records read as the dicts of State.record_reward.
+"""
+
+from fractions import Fraction
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .tables import _grow
+
+# IncentivesPool.INCENTIVE_RESOLUTION
+INCENTIVE_RESOLUTION = 24
+
+# IncentivesPool.INCENTIVE_STARTING_INTERVAL, one hour, in epochs
+INCENTIVE_STARTING_INTERVAL = 1
+
+WAD = 10**18
+
+
+def _div(numerator: int, denominator: int) -> int:
+    """Integer division truncating toward zero, as Solidity's int256 division."""
+    quotient = abs(numerator) // abs(denominator)
+    return quotient if (numerator < 0) == (denominator < 0) else -quotient
+
+
+def geometric_linear_interpolation(x: int, x1: int, y1: int, x2: int, y2: int) -> int:
+    """IncentivesMath.geometricLinearInterpolation."""
+    return y1 + _div((x - x1) * (y2 - y1), x2 - x1)
+
+
+def scale_parameters(config: Sequence[int], buckets: int) -> List[int]:
+    """IncentivesMath.scaleParameters: interpolate config values over a number of buckets."""
+    if buckets == 1:
+        return [WAD]
+    if buckets == len(config):
+        return list(config)
+    interpolated = [0] * buckets
+    interpolated[0] = config[0]
+    interpolated[-1] = config[-1]
+    if buckets > 2:
+        multiplier = (buckets - 1) * WAD // (len(config) - 1)
+        indexes = [i * WAD * multiplier // WAD for i in range(len(config))]
+        last = 0
+        for i in range(1, buckets - 1):
+            desired = i * WAD
+            while indexes[last + 1] < desired:
+                last += 1
+            interpolated[i] = geometric_linear_interpolation(
+                desired, indexes[last], config[last], indexes[last + 1], config[last + 1]
+            )
+    return interpolated
+
+
+def bucket_multipliers(config: Sequence[int], buckets: int) -> List[int]:
+    """IncentivesMath.bucketMultipliers: each bucket's share of the whole, in WAD."""
+    scaled = scale_parameters(config, buckets)
+    total = sum(scaled)
+    return [value * WAD // total for value in scaled]
+
+
+# Columns of a RewardLedger
+REWARD_COLUMNS = {
+    "epoch": np.int64,
+    "user": np.int64,
+    "initiative": np.int64,
+    "reward_amount": np.float64,
+    "support_amount": np.float64,
+    "lock_duration": np.int64,
+    "credit": np.float64,
+    "bucket": np.int64,
+    "initiative_weight": np.float64,
+}
+
+# Per-credit columns of an IncentivesPool
+CREDIT_COLUMNS = {
+    "credit_amount": np.float64,
+    "credit_epoch": np.int64,
+    "credit_user": np.int64,
+    "support_amount": np.float64,
+    "lock_duration": np.int64,
+}
+
+
+class RewardLedger:
+    """Append-only columns of reward payments, one row per settled credit."""
+
+    def __init__(self, acceptance_threshold: float, capacity: int = 64):
+        self.size = 0
+        self.acceptance_threshold = acceptance_threshold
+        for name, dtype in REWARD_COLUMNS.items():
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+
+    def __len__(self) -> int:
+        return self.size
+
+    def extend(self, **columns: np.ndarray) -> None:
+        """Append rows given as one array per column."""
+        rows = len(columns["epoch"])
+        capacity = len(self.epoch)
+        if self.size + rows > capacity:
+            capacity = max(capacity * 2, self.size + rows)
+            for name in REWARD_COLUMNS:
+                setattr(self, name, _grow(getattr(self, name), capacity))
+        for name in REWARD_COLUMNS:
+            getattr(self, name)[self.size : self.size + rows] = columns[name]
+        self.size += rows
+
+    def view(self, name: str) -> np.ndarray:
+        """Return the live slice of a column."""
+        return getattr(self, name)[: self.size]
+
+    def history(
+        self,
+        user_ids: List[str],
+        initiative_ids: List[str],
+        prefix: Sequence[Dict[str, Any]] = (),
+    ) -> "RewardHistory":
+        """Return the rows appended so far as reward_history records, after prefix."""
+        return RewardHistory(self, self.size, user_ids, initiative_ids, prefix)
+
+
+class RewardHistory(Sequence):
+    """
+    A fixed-length view of a RewardLedger that reads as a list of dicts.
+
+    Rows appended to the ledger later are not part of the view, so a
+    record's reward_history does not change as the run goes on.
+    """
+
+    def __init__(
+        self,
+        ledger: RewardLedger,
+        size: int,
+        user_ids: List[str],
+        initiative_ids: List[str],
+        prefix: Sequence[Dict[str, Any]] = (),
+    ):
+        # Columns are replaced, never resized in place, when the ledger grows
+        self.columns = {name: getattr(ledger, name) for name in REWARD_COLUMNS}
+        self.size = size
+        self.threshold = ledger.acceptance_threshold
+        self.user_ids = user_ids
+        self.initiative_ids = initiative_ids
+        self.prefix = prefix
+
+    def __len__(self) -> int:
+        return len(self.prefix) + self.size
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        if index < len(self.prefix):
+            return self.prefix[index]
+        row = index - len(self.prefix)
+        fields = {name: column[row].item() for name, column in self.columns.items()}
+        return {
+            "epoch": fields["epoch"],
+            "user_id": self.user_ids[fields["user"]],
+            "initiative_id": self.initiative_ids[fields["initiative"]],
+            "reward_amount": fields["reward_amount"],
+            "support_amount": fields["support_amount"],
+            "lock_duration": fields["lock_duration"],
+            "credit": fields["credit"],
+            "bucket": fields["bucket"],
+            "initiative_weight": fields["initiative_weight"],
+            "weight_percentage": fields["initiative_weight"] / self.threshold,
+        }
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for index in range(len(self)):
+            yield self[index]
+
+
+class IncentivesPool:
+    """
+    Per-initiative incentive buckets and credits, and a board's reward budget.
+
+    Bucket credits and end epochs are [initiatives, INCENTIVE_RESOLUTION]
+    arrays. Credits are appended to columns, with each initiative's
+    credits listed for settlement.
+    """
+
+    def __init__(
+        self,
+        config: Sequence[int],
+        reward_per_initiative: float,
+        budget: float,
+        acceptance_threshold: float,
+        capacity: int = 64,
+    ):
+        if not 2 <= len(config) <= INCENTIVE_RESOLUTION:
+            raise ValueError(f"Incentive parameters must hold 2 to 24 values: {config}")
+        self.config = list(config)
+        self.reward_per_initiative = reward_per_initiative
+        self.budget = budget
+        self.distributed = 0.0
+
+        self.bucket_credits = np.zeros((capacity, INCENTIVE_RESOLUTION), dtype=np.float64)
+        self.bucket_ends = np.zeros((capacity, INCENTIVE_RESOLUTION), dtype=np.int64)
+        self.last_used = np.zeros(capacity, dtype=np.int64)
+
+        self.size = 0
+        for name, dtype in CREDIT_COLUMNS.items():
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+        self.credits_by_initiative: Dict[int, List[int]] = {}
+
+        self.ledger = RewardLedger(acceptance_threshold)
+
+    @classmethod
+    def from_params(cls, params: Dict[str, Any]) -> Optional["IncentivesPool"]:
+        """Build the pool the model parameters describe, or None if rewards are off."""
+        budget = params.get("incentives_budget", 0.0)
+        if not params.get("reward_enabled", True) or budget <= 0:
+            return None
+        config = [
+            int(Fraction(str(value)) * WAD)
+            for value in params.get("incentive_parameters", (2.0, 1.0))
+        ]
+        return cls(
+            config,
+            params.get("incentive_reward_per_initiative", 1000.0),
+            budget,
+            params["acceptance_threshold"],
+        )
+
+    def _reserve(self, initiative: int) -> None:
+        capacity = len(self.last_used)
+        if initiative < capacity:
+            return
+        capacity = max(capacity * 2, initiative + 1)
+        for name in ("bucket_credits", "bucket_ends"):
+            array = getattr(self, name)
+            grown = np.zeros((capacity, INCENTIVE_RESOLUTION), dtype=array.dtype)
+            grown[: len(array)] = array
+            setattr(self, name, grown)
+        self.last_used = _grow(self.last_used, capacity)
+
+    def _reduce(self, initiative: int) -> None:
+        """Merge adjacent buckets pairwise and double the interval (_reduceIncentiveBuckets)."""
+        half = INCENTIVE_RESOLUTION // 2
+        credits = self.bucket_credits[initiative]
+        ends = self.bucket_ends[initiative]
+        credits[:half] = credits[0::2] + credits[1::2]
+        ends[:half] = ends[1::2]
+        interval = ends[1] - ends[0]
+        credits[half:] = 0
+        ends[half:] = ends[half - 1] + interval * np.arange(1, half + 1)
+
+    def credit(
+        self, initiative: int, user: int, amount: float, epoch: int, support: float, duration: int
+    ) -> None:
+        """Credit a lock to its initiative's bucket at epoch (addIncentivesCreditForLock)."""
+        self._reserve(initiative)
+        ends = self.bucket_ends[initiative]
+        bucket = int(self.last_used[initiative])
+        if bucket == 0 and ends[0] == 0:
+            ends[:] = epoch + INCENTIVE_STARTING_INTERVAL * np.arange(1, INCENTIVE_RESOLUTION + 1)
+        while True:
+            if bucket == INCENTIVE_RESOLUTION:
+                self._reduce(initiative)
+                bucket = INCENTIVE_RESOLUTION // 2 - 1
+            if ends[bucket] > epoch:
+                break
+            bucket += 1
+        self.bucket_credits[initiative, bucket] += amount
+        self.last_used[initiative] = bucket
+
+        row = self.size
+        if row == len(self.credit_amount):
+            capacity = 2 * row
+            for name in CREDIT_COLUMNS:
+                setattr(self, name, _grow(getattr(self, name), capacity))
+        self.credit_amount[row] = amount
+        self.credit_epoch[row] = epoch
+        self.credit_user[row] = user
+        self.support_amount[row] = support
+        self.lock_duration[row] = duration
+        self.size += 1
+        self.credits_by_initiative.setdefault(initiative, []).append(row)
+
+    def settle(self, initiative: int, epoch: int, weight: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Pay out every credit of an accepted initiative, as far as the budget allows.
+
+        Returns the paid users and amounts, one per credit, in credit order.
+        """
+        rows = np.array(self.credits_by_initiative.pop(initiative, []), dtype=np.int64)
+        if not len(rows) or initiative >= len(self.last_used):
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+
+        used = int(self.last_used[initiative]) + 1
+        multipliers = np.array(bucket_multipliers(self.config, used), dtype=np.float64) / WAD
+        total = float(self.bucket_credits[initiative, :used] @ multipliers)
+
+        # Each credit's bucket is the first whose end is after it, else the first
+        epochs = self.credit_epoch[rows]
+        buckets = np.argmax(epochs[:, None] < self.bucket_ends[initiative, None, :used], axis=1)
+        credits = self.credit_amount[rows]
+        shares = credits * multipliers[buckets] / total if total > 0 else np.zeros(len(rows))
+        amounts = self.reward_per_initiative * shares
+        paid = np.minimum(amounts, np.maximum(self.budget - (np.cumsum(amounts) - amounts), 0))
+        self.budget -= float(paid.sum())
+        self.distributed += float(paid.sum())
+
+        users = self.credit_user[rows]
+        self.ledger.extend(
+            epoch=np.full(len(rows), epoch),
+            user=users,
+            initiative=np.full(len(rows), initiative),
+            reward_amount=paid,
+            support_amount=self.support_amount[rows],
+            lock_duration=self.lock_duration[rows],
+            credit=credits,
+            bucket=buckets,
+            initiative_weight=np.full(len(rows), weight),
+        )
+        return users, paid
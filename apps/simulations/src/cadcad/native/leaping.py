@@ -0,0 +1,243 @@
+"""
+Approximate tau-leaping for the native engine.
+
+LeapingEngine advances by leaps of several epochs. The user actions of a
+leap are drawn as one batch from binomial attempt counts and applied at
+the end of the leap, followed by a single pass of decay, acceptance,
+expiry and lifecycle processing. Leaps shrink so that no deadline falls
+inside one and so that the leading initiative is unlikely to cross the
+acceptance threshold mid-leap.
+
+Leaping is biased against epoch-by-epoch stepping: actions are delayed to
+the end of their leap and initiatives created in a leap cannot be
+supported until the next one. leap_bias_report measures the bias for a
+parameter set.
+"""
+
+import random
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from ..sufs.governance import requires_exhaustive_acceptance
+from .actions import CREATE, SUPPORT, Action, _draw_support
+from .engine import NativeEngine, record_run
+from .tables import ACCEPTED, EXPIRED
+
+# Defaults for the leap parameters, read from the model parameters when set
+MAX_LEAP_EPOCHS = 24
+LEAP_TOLERANCE = 0.1
+
+# Final-state quantities compared by leap_bias_report
+BIAS_METRICS = (
+    "circulating_supply",
+    "locked_supply",
+    "locks",
+    "initiatives",
+    "accepted_initiatives",
+    "expired_initiatives",
+)
+
+
+def sample_leap_actions(
+    params: Dict[str, Any],
+    balances: np.ndarray,
+    live_initiatives: np.ndarray,
+    epochs: int,
+    generator: np.random.Generator,
+    rng: random.Random = random,
+) -> List[Action]:
+    """
+    Draw the user actions of a leap over several epochs as one batch.
+
+    Each user's create and support attempts over the leap are binomial in
+    the number of epochs. The attempts are taken in random order against
+    running balances, and each is drawn as in sample_user_actions.
+    """
+    num_users = len(balances)
+    users = np.arange(num_users)
+    creates = generator.binomial(epochs, params["prob_create_initiative"], size=num_users)
+    supports = generator.binomial(epochs, params["prob_support_initiative"], size=num_users)
+    kinds = np.repeat([CREATE, SUPPORT], [creates.sum(), supports.sum()])
+    attempts = np.concatenate([np.repeat(users, creates), np.repeat(users, supports)])
+    order = generator.permutation(len(attempts))
+
+    creation_stake = params["initiative_creation_stake"]
+    balances = balances.copy()
+    live = live_initiatives.tolist()
+    actions: List[Action] = []
+    for kind, user in zip(kinds[order].tolist(), attempts[order].tolist()):
+        if kind == CREATE:
+            if balances[user] >= creation_stake:
+                actions.append(Action(CREATE, user))
+                balances[user] -= creation_stake
+        else:
+            action = _draw_support(params, user, float(balances[user]), live, rng)
+            if action is not None:
+                actions.append(action)
+                balances[user] -= action.amount
+
+    return actions
+
+
+class LeapingEngine(NativeEngine):
+    """
+    NativeEngine that advances by leaps of several epochs.
+
+    The leap size is bounded by the max_leap_epochs parameter, by the next
+    lock expiry or inactivity deadline, and by leap_tolerance: the expected
+    support weight an initiative gains during a leap may close at most
+    that fraction of the leading live initiative's remaining distance to
+    the threshold. Exhaustive acceptance forces single-epoch leaps.
+    """
+
+    def __init__(
+        self,
+        initial_state: Dict[str, Any],
+        params: Dict[str, Any],
+        rng: random.Random = random,
+    ):
+        super().__init__(initial_state, params, rng)
+        self.generator = np.random.default_rng(rng.getrandbits(64))
+        self.max_leap = params.get("max_leap_epochs", MAX_LEAP_EPOCHS)
+        self.tolerance = params.get("leap_tolerance", LEAP_TOLERANCE)
+
+    def leap_size(self, until: int) -> int:
+        """Return the number of epochs to advance by, at least one."""
+        epoch = self.current_epoch
+        if self.check_all_initiatives or requires_exhaustive_acceptance(self.params):
+            return 1
+        size = min(self.max_leap, self.next_deadline(until) - epoch, until - epoch)
+
+        live = self.initiatives.live_rows()
+        funded = self.balances[self.balances > 0]
+        if len(live) and len(funded):
+            params = self.params
+            gap = params["acceptance_threshold"] - self.initiatives.weight[live].max()
+            mean_amount = (1 + funded.mean() * params["max_support_tokens_fraction"]) / 2
+            mean_duration = (
+                params["min_lock_duration_epochs"] + params["max_lock_duration_epochs"]
+            ) / 2
+            # Expected support weight one initiative receives per epoch
+            rate = (
+                len(funded) * params["prob_support_initiative"] * mean_amount * mean_duration
+            ) / len(live)
+            if rate > 0:
+                size = min(size, int(self.tolerance * gap / rate))
+        return max(size, 1)
+
+    def substeps(self, until: Optional[int] = None):
+        """Run one leap, yielding after each PSUB; until bounds the leap's end."""
+        if until is None:
+            until = self.current_epoch + 1
+        epochs = self.leap_size(until)
+        self.advance_time(epochs)
+        yield
+        actions = sample_leap_actions(
+            self.params,
+            self.balances,
+            self.initiatives.live_rows(),
+            epochs,
+            self.generator,
+            self.rng,
+        )
+        self.apply_user_actions(actions)
+        yield
+        self.decay_and_aggregate()
+        yield
+        self.process_accepted()
+        yield
+        self.process_expired()
+        yield
+        self.process_lifecycle()
+        yield
+
+
+def run_leaping_simulation(
+    initial_state: Dict,
+    num_epochs: Optional[int] = None,
+    sim_params: Optional[Dict[str, Any]] = None,
+) -> List[Dict]:
+    """
+    Run the simulation with LeapingEngine and return cadCAD-shaped records.
+
+    Takes the same arguments as run_native_simulation. Only the timesteps
+    at the end of each leap are recorded.
+    """
+    if sim_params is None:
+        from ..model import simulation_parameters as sim_params
+
+    timesteps = range(num_epochs) if num_epochs is not None else sim_params["T"]
+    params = sim_params["M"]
+
+    results: List[Dict] = []
+    for run in range(1, sim_params.get("N", 1) + 1):
+        engine = LeapingEngine(initial_state, params)
+        results.extend(record_run(engine, run, len(timesteps), skip=True))
+
+    return results
+
+
+def _final_metrics(engine: NativeEngine, num_epochs: int, leap: bool) -> Dict[str, float]:
+    until = engine.current_epoch + num_epochs
+    while engine.current_epoch < until:
+        for _ in engine.substeps(until if leap else None):
+            pass
+    status = engine.initiatives.view("status")
+    return {
+        "circulating_supply": engine.circulating_supply,
+        "locked_supply": engine.locked_supply,
+        "locks": len(engine.locks),
+        "initiatives": len(engine.initiatives),
+        "accepted_initiatives": int((status == ACCEPTED).sum()),
+        "expired_initiatives": int((status == EXPIRED).sum()),
+    }
+
+
+def leap_bias_report(
+    initial_state: Dict[str, Any],
+    params: Dict[str, Any],
+    num_epochs: int,
+    runs: int = 20,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """
+    Compare LeapingEngine against epoch-by-epoch stepping over many runs.
+
+    Returns, for each metric in BIAS_METRICS, the mean final value of both
+    engines, their difference (bias), the bias relative to the reference
+    mean and the standard error of the difference, together with the wall
+    time of each engine and the speedup. A bias within a few standard
+    errors is indistinguishable from sampling noise.
+    """
+    rng = random.Random(seed)
+    samples: Dict[str, List[Dict[str, float]]] = {"reference": [], "leaping": []}
+    timings = {}
+    for name, engine_class in (("reference", NativeEngine), ("leaping", LeapingEngine)):
+        started = time.perf_counter()
+        for _ in range(runs):
+            engine = engine_class(initial_state, params, random.Random(rng.getrandbits(64)))
+            samples[name].append(_final_metrics(engine, num_epochs, name == "leaping"))
+        timings[name] = time.perf_counter() - started
+
+    metrics = {}
+    for metric in BIAS_METRICS:
+        reference = np.array([sample[metric] for sample in samples["reference"]], dtype=float)
+        leaping = np.array([sample[metric] for sample in samples["leaping"]], dtype=float)
+        bias = leaping.mean() - reference.mean()
+        spread = reference.var(ddof=1) + leaping.var(ddof=1) if runs > 1 else 0.0
+        metrics[metric] = {
+            "reference": reference.mean(),
+            "leaping": leaping.mean(),
+            "bias": bias,
+            "relative_bias": bias / reference.mean() if reference.mean() else float("nan"),
+            "stderr": float(np.sqrt(spread / runs)),
+        }
+
+    return {
+        "metrics": metrics,
+        "reference_seconds": timings["reference"],
+        "leaping_seconds": timings["leaping"],
+        "speedup": timings["reference"] / timings["leaping"],
+    }
@@ -0,0 +1,135 @@
+"""
+Parity harness between the cadCAD and native engines.
+
+Runs both engines from the same initial state under the same ``random``
+seed and compares every record. Initiative IDs are ``uuid4`` values that
+differ between runs, so initiatives are matched by creation order.
+"""
+
+import contextlib
+import copy
+import io
+import math
+import random
+from typing import Any, Dict, List, Optional
+
+from ..model import run_simulation
+from .engine import run_native_simulation
+
+SCALAR_FIELDS = ("current_epoch", "circulating_supply", "locked_supply")
+
+
+def _close(a: float, b: float, rel_tol: float, abs_tol: float) -> bool:
+    return math.isclose(a, b, rel_tol=rel_tol, abs_tol=abs_tol)
+
+
+def compare_records(
+    reference: List[Dict[str, Any]],
+    candidate: List[Dict[str, Any]],
+    rel_tol: float = 1e-9,
+    abs_tol: float = 1e-6,
+    max_mismatches: int = 20,
+) -> List[str]:
+    """Return human-readable mismatches between two result lists."""
+    mismatches: List[str] = []
+
+    def report(index: int, message: str) -> bool:
+        record = reference[index]
+        mismatches.append(
+            f"record {index} (timestep {record.get('timestep')}, "
+            f"substep {record.get('substep')}): {message}"
+        )
+        return len(mismatches) >= max_mismatches
+
+    if len(reference) != len(candidate):
+        return [f"length differs: {len(reference)} != {len(candidate)}"]
+
+    for index, (ref, cand) in enumerate(zip(reference, candidate)):
+        for field in SCALAR_FIELDS:
+            if not _close(ref[field], cand[field], rel_tol, abs_tol):
+                if report(index, f"{field} {ref[field]} != {cand[field]}"):
+                    return mismatches
+
+        ref_balances, cand_balances = ref["balances"], cand["balances"]
+        if ref_balances.keys() != cand_balances.keys():
+            if report(index, "balance holders differ"):
+                return mismatches
+        else:
+            for user_id, balance in ref_balances.items():
+                if not _close(balance, cand_balances[user_id], rel_tol, abs_tol):
+                    if report(index, f"balance of {user_id} {balance} != {cand_balances[user_id]}"):
+                        return mismatches
+
+        ref_ids, cand_ids = list(ref["initiatives"]), list(cand["initiatives"])
+        if len(ref_ids) != len(cand_ids):
+            if report(index, f"initiative count {len(ref_ids)} != {len(cand_ids)}"):
+                return mismatches
+            continue
+        id_map = dict(zip(ref_ids, cand_ids))
+
+        for ref_id, cand_id in id_map.items():
+            ref_weight = ref["initiatives"][ref_id]["weight"]
+            cand_weight = cand["initiatives"][cand_id]["weight"]
+            if not _close(ref_weight, cand_weight, rel_tol, abs_tol):
+                if report(index, f"weight of initiative #{ref_ids.index(ref_id)} differs"):
+                    return mismatches
+
+        for field in ("accepted_initiatives", "expired_initiatives"):
+            mapped = {id_map[i] for i in ref[field] if i in id_map}
+            if mapped != set(cand[field]):
+                if report(index, f"{field} differ"):
+                    return mismatches
+
+        mapped_locks = {
+            (user_id, id_map.get(init_id)): lock
+            for (user_id, init_id), lock in ref["locks"].items()
+        }
+        if mapped_locks.keys() != cand["locks"].keys():
+            if report(index, "lock keys differ"):
+                return mismatches
+            continue
+        for key, lock in mapped_locks.items():
+            other = cand["locks"][key]
+            for field in ("amount", "current_weight"):
+                if not _close(lock[field], other[field], rel_tol, abs_tol):
+                    if report(index, f"lock {key[0]} {field} {lock[field]} != {other[field]}"):
+                        return mismatches
+            for field in ("lock_duration_epochs", "start_epoch", "expiry_epoch"):
+                if lock[field] != other[field]:
+                    if report(index, f"lock {key[0]} {field} {lock[field]} != {other[field]}"):
+                        return mismatches
+
+    return mismatches
+
+
+def check_parity(
+    initial_state: Dict[str, Any],
+    sim_params: Dict[str, Any],
+    seed: int = 0,
+    num_epochs: Optional[int] = None,
+    quiet: bool = True,
+) -> List[str]:
+    """
+    Run both engines under ``random.seed(seed)`` and return the mismatches.
+
+    An empty list means the native engine reproduced the cadCAD run. Only
+    a single run is compared, since cadCAD's single mode executes one run
+    regardless of ``N``. The cadCAD SUFs log every action, so their output
+    is silenced when quiet.
+    """
+    sim_params = {**sim_params, "N": 1}
+    random.seed(seed)
+    with contextlib.redirect_stdout(io.StringIO()) if quiet else contextlib.nullcontext():
+        reference = run_simulation(
+            copy.deepcopy(initial_state),
+            num_epochs=num_epochs,
+            sim_params=sim_params,
+        )
+
+    random.seed(seed)
+    candidate = run_native_simulation(
+        copy.deepcopy(initial_state),
+        num_epochs=num_epochs,
+        sim_params=sim_params,
+    )
+    return compare_records(reference, candidate)
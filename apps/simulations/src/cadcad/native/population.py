@@ -0,0 +1,69 @@
+"""
+Sparse population mode for large holder populations.
+
+By default every epoch visits every user when sampling actions, and
+every record holds a full copy of the balances and locks. With the
+sparse_population parameter, the native engine instead only touches the
+users who act (see actions.sample_sparse_user_actions), keeps locks in a
+LockLedger so supports are appended without a search, and records deltas:
+
+- "balances" maps the IDs of users whose balance changed since the
+  previous record to their new balance
+- "locks" maps the IDs of locks minted since the previous record to their
+  lock records, and the IDs of locks redeemed since to None; a lock's
+  current_weight is its weight when it was first recorded
+
+Since the size of a delta is not a count, each record also carries
+supporters_count, the number of live locks, which summarize_record and
+results_to_dataframe use instead of counting its locks.
+
+The first record of a run holds the full balances and locks as a delta
+from nothing. Records dropped by history retention have their deltas
+folded into the next record kept, so the kept records still replay to the
+full state; expand_deltas does so.
+"""
+
+from typing import Any, Dict, Iterable, Iterator, List
+
+# Variables recorded as deltas in sparse population mode
+DELTA_VARIABLES = ("balances", "locks")
+
+
+def fold_deltas(
+    records: List[Dict[str, Any]], num_kept: int, pending: Dict[str, Dict[Any, Any]]
+) -> None:
+    """
+    Carry the deltas of dropped records over to the next kept one.
+
+    records holds one timestep's records, of which history retention kept
+    the last num_kept; pending collects the deltas of dropped records
+    until then, across timesteps.
+    """
+    dropped = len(records) - num_kept
+    for record in records[:dropped]:
+        for name in DELTA_VARIABLES:
+            pending[name].update(record[name])
+    if num_kept:
+        record = records[dropped]
+        for name in DELTA_VARIABLES:
+            if pending[name]:
+                record[name] = {**pending[name], **record[name]}
+                pending[name] = {}
+
+
+def expand_deltas(records: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """Yield each delta record with its full balances and locks, replayed per run."""
+    state: Dict[str, Dict[Any, Any]] = {}
+    run = None
+    for record in records:
+        if record.get("run") != run:
+            run = record.get("run")
+            state = {name: {} for name in DELTA_VARIABLES}
+        for name in DELTA_VARIABLES:
+            values = state[name]
+            for key, value in record[name].items():
+                if value is None:
+                    values.pop(key, None)
+                else:
+                    values[key] = value
+        yield {**record, **{name: dict(state[name]) for name in DELTA_VARIABLES}}
@@ -0,0 +1,50 @@
+"""
+Deadline scheduling for the native simulation engine.
+
+Lock expiry and initiative inactivity are both deadlines keyed on an
+epoch. Instead of scanning every lock and initiative each epoch, the
+engine pushes deadlines into a DeadlineQueue and pops the ones that are
+due, so epochs without due deadlines do no lifecycle work.
+"""
+
+import heapq
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+
+class DeadlineQueue:
+    """
+    Min-heap of (epoch, item) deadlines with lazy invalidation.
+
+    Rescheduling an item pushes a new deadline without removing the old
+    one. Stale entries are returned by pop_due like any other, and the
+    owner validates them against the current state before acting.
+    """
+
+    def __init__(self, deadlines: Iterable[Tuple[int, Any]] = ()):
+        self._heap: List[Tuple[int, Any]] = list(deadlines)
+        heapq.heapify(self._heap)
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, epoch: int, item: Any) -> None:
+        """Schedule item at epoch."""
+        heapq.heappush(self._heap, (epoch, item))
+
+    def next_epoch(self) -> Optional[int]:
+        """Return the earliest scheduled epoch, or None if nothing is scheduled."""
+        return self._heap[0][0] if self._heap else None
+
+    def prune(self, is_current: Callable[[int, Any], bool]) -> None:
+        """Drop deadlines from the front of the queue until is_current holds for one."""
+        heap = self._heap
+        while heap and not is_current(*heap[0]):
+            heapq.heappop(heap)
+
+    def pop_due(self, epoch: int) -> List[Any]:
+        """Remove and return the items scheduled at or before epoch, earliest first."""
+        heap = self._heap
+        due = []
+        while heap and heap[0][0] <= epoch:
+            due.append(heapq.heappop(heap)[1])
+        return due
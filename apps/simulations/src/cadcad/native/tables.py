@@ -0,0 +1,454 @@
+"""
+Struct-of-arrays tables for the native simulation engine.
+
+Locks and initiatives are stored column-wise in contiguous NumPy arrays
+instead of dicts of dataclasses. Row order matches the insertion order of
+the equivalent cadCAD dicts, so reductions over the arrays add floats in
+the same order as the SUFs do.
+"""
+
+from datetime import datetime
+from typing import Dict, List, Any, Tuple
+
+import numpy as np
+
+# Initiative status codes
+LIVE = 0
+ACCEPTED = 1
+EXPIRED = 2
+
+
+def _grow(array: np.ndarray, capacity: int) -> np.ndarray:
+    """Return a copy of array with room for at least capacity rows."""
+    grown = np.zeros(capacity, dtype=array.dtype)
+    grown[: len(array)] = array
+    return grown
+
+
+# Fields of a cadCAD lock record, in record order
+LOCK_RECORD_COLUMNS = {
+    "user": np.int64,
+    "initiative": np.int64,
+    "amount": np.float64,
+    "duration": np.int64,
+    "start": np.int64,
+    "expiry": np.int64,
+    "initial_weight": np.float64,
+    "current_weight": np.float64,
+}
+
+
+class LockTable:
+    """
+    Column store for active locks (one row per support).
+
+    Weights are not stored per epoch. Each row keeps an anchor instead:
+    the weight the aggregate reads for the lock in the epoch after
+    anchor_epoch. New locks are anchored at their start with their initial
+    weight; locks loaded from a state at the epoch they were loaded.
+    Current weights are evaluated from the anchor on demand (weights_at).
+    rows maps each (user, initiative) key to its row, so finding a lock
+    does not scan the table.
+    """
+
+    COLUMNS = {
+        "user": np.int64,
+        "initiative": np.int64,
+        "amount": np.float64,
+        "duration": np.int64,
+        "start": np.int64,
+        "expiry": np.int64,
+        "initial_weight": np.float64,
+        "anchor_weight": np.float64,
+        "anchor_epoch": np.int64,
+    }
+
+    def __init__(self, capacity: int = 64):
+        self.size = 0
+        self.rows: Dict[Tuple[int, int], int] = {}
+        for name, dtype in self.COLUMNS.items():
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _reserve(self, rows: int) -> None:
+        capacity = len(self.user)
+        if self.size + rows <= capacity:
+            return
+        new_capacity = max(capacity * 2, self.size + rows)
+        for name in self.COLUMNS:
+            setattr(self, name, _grow(getattr(self, name), new_capacity))
+
+    def find(self, user: int, initiative: int) -> int:
+        """Return the row holding the (user, initiative) lock, or -1."""
+        return self.rows.get((user, initiative), -1)
+
+    def _append(self) -> int:
+        self._reserve(1)
+        self.size += 1
+        return self.size - 1
+
+    def _row_for(self, user: int, initiative: int, row: int = None) -> int:
+        if row is None:
+            row = self.find(user, initiative)
+        if row < 0:
+            row = self._append()
+            self.rows[(user, initiative)] = row
+        return row
+
+    def put(
+        self,
+        user: int,
+        initiative: int,
+        amount: float,
+        duration: int,
+        start: int,
+        initial_weight: float = None,
+        current_weight: float = None,
+        expiry: int = None,
+        anchor_epoch: int = None,
+        row: int = None,
+    ) -> int:
+        """
+        Insert or overwrite the (user, initiative) lock.
+
+        Mirrors assignment into the cadCAD ``locks`` dict: an existing key
+        keeps its position, a new key is appended at the end. row skips the
+        lookup when the caller has already found the lock's row with find
+        (-1 for a new lock).
+        """
+        row = self._row_for(user, initiative, row)
+        weight = amount * duration if initial_weight is None else initial_weight
+        self.user[row] = user
+        self.initiative[row] = initiative
+        self.amount[row] = amount
+        self.duration[row] = duration
+        self.start[row] = start
+        self.expiry[row] = start + duration if expiry is None else expiry
+        self.initial_weight[row] = weight
+        self.anchor_weight[row] = weight if current_weight is None else current_weight
+        self.anchor_epoch[row] = start if anchor_epoch is None else anchor_epoch
+        return row
+
+    def remove(self, mask: np.ndarray) -> None:
+        """Drop rows where mask is True, preserving the order of the rest."""
+        mask = mask[: self.size]
+        removed = np.flatnonzero(mask)
+        if not len(removed):
+            return
+        for key in zip(self.user[removed].tolist(), self.initiative[removed].tolist()):
+            self.rows.pop(key, None)
+        keep = np.flatnonzero(~mask)
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            column[: len(keep)] = column[keep]
+        self.size = len(keep)
+
+        # Rows before the first removed one keep their position
+        if self.rows:
+            first = int(removed[0])
+            users = self.user[first : self.size].tolist()
+            initiatives = self.initiative[first : self.size].tolist()
+            self.rows.update(zip(zip(users, initiatives), range(first, self.size)))
+
+    def view(self, name: str) -> np.ndarray:
+        """Return the live slice of a column."""
+        return getattr(self, name)[: self.size]
+
+    def weights_at(self, decayed_through: int, powers: "PowerTable") -> np.ndarray:
+        """
+        Return current lock weights once decay has run through an epoch.
+
+        A lock decays in every epoch after its anchor and before its
+        expiry, so its weight is anchor_weight * m**k in closed form.
+        """
+        last_decay = np.minimum(decayed_through, self.view("expiry") - 1)
+        decays = np.maximum(last_decay - self.view("anchor_epoch"), 0)
+        return self.view("anchor_weight") * powers(decays)
+
+
+# Lock fields kept for redeemed locks in a LockLedger
+REDEEMED_COLUMNS = ("lock_id", "user", "initiative", "amount", "duration", "start", "expiry")
+
+
+class LockLedger(LockTable):
+    """
+    Append-only lock table keyed by lock ID, as Signals.sol mints lock tokens.
+
+    Every put appends a new lock with the next ID, counting from 1 like
+    lockCount, so a user may hold several locks on one initiative. Rows
+    stay in ID order through removals, so a live lock is found by binary
+    search. Removed locks are redeemed: their rows move to a columnar
+    archive, where lock and locks_for_initiative still find them, as
+    getTokenLock and locksForInitiative do. Locks are not indexed by
+    (user, initiative); find scans for the first match.
+    """
+
+    COLUMNS = {**LockTable.COLUMNS, "lock_id": np.int64}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.next_id = 1
+        self._redeemed: List[Dict[str, np.ndarray]] = []
+
+    def find(self, user: int, initiative: int) -> int:
+        """Return the row of the user's oldest live lock on an initiative, or -1."""
+        n = self.size
+        rows = np.flatnonzero((self.user[:n] == user) & (self.initiative[:n] == initiative))
+        return int(rows[0]) if len(rows) else -1
+
+    def _row_for(self, user: int, initiative: int, row: int = None) -> int:
+        row = self._append()
+        self.lock_id[row] = self.next_id
+        self.next_id += 1
+        return row
+
+    def remove(self, mask: np.ndarray) -> None:
+        """Redeem rows where mask is True, archiving them."""
+        mask = mask[: self.size]
+        if mask.any():
+            self._redeemed.append({name: self.view(name)[mask] for name in REDEEMED_COLUMNS})
+        super().remove(mask)
+
+    def redeemed(self, name: str) -> np.ndarray:
+        """Return a column of the redeemed locks, in redemption order."""
+        if len(self._redeemed) > 1:
+            self._redeemed = [
+                {
+                    column: np.concatenate([chunk[column] for chunk in self._redeemed])
+                    for column in REDEEMED_COLUMNS
+                }
+            ]
+        if not self._redeemed:
+            return np.zeros(0, dtype=self.COLUMNS[name])
+        return self._redeemed[0][name]
+
+    def row_of(self, lock_id: int) -> int:
+        """Return the row of a live lock, or -1."""
+        ids = self.view("lock_id")
+        row = int(np.searchsorted(ids, lock_id))
+        return row if row < len(ids) and ids[row] == lock_id else -1
+
+    def lock(self, lock_id: int) -> Dict[str, Any]:
+        """Return a lock's fields and whether it was withdrawn, as getTokenLock does."""
+        row = self.row_of(lock_id)
+        if row >= 0:
+            fields = {name: getattr(self, name)[row].item() for name in REDEEMED_COLUMNS}
+            return {**fields, "withdrawn": False}
+        rows = np.flatnonzero(self.redeemed("lock_id") == lock_id)
+        if not len(rows):
+            raise KeyError(lock_id)
+        fields = {name: self.redeemed(name)[rows[0]].item() for name in REDEEMED_COLUMNS}
+        return {**fields, "withdrawn": True}
+
+    def locks_for_initiative(self, initiative: int) -> List[int]:
+        """IDs of every lock ever placed on an initiative, in ID order."""
+        live = self.view("lock_id")[self.view("initiative") == initiative]
+        redeemed = self.redeemed("lock_id")[self.redeemed("initiative") == initiative]
+        return np.sort(np.concatenate((live, redeemed))).tolist()
+
+
+class PowerTable:
+    """Powers of a decay multiplier, m**k for k = 0, 1, ..., grown on demand."""
+
+    def __init__(self, multiplier: float, size: int = 64):
+        self.multiplier = multiplier
+        self.table = np.ones(1, dtype=np.float64)
+        self._extend(size)
+
+    def _extend(self, size: int) -> None:
+        factors = np.full(size - len(self.table) + 1, self.multiplier, dtype=np.float64)
+        factors[0] = self.table[-1]
+        self.table = np.concatenate((self.table[:-1], np.cumprod(factors)))
+
+    def __call__(self, exponents: np.ndarray) -> np.ndarray:
+        if len(exponents):
+            needed = int(exponents.max()) + 1
+            if needed > len(self.table):
+                self._extend(max(needed, 2 * len(self.table)))
+        return self.table[exponents]
+
+
+class InitiativeTable:
+    """Column store for initiatives plus a side table of display fields."""
+
+    def __init__(self, capacity: int = 64):
+        self.size = 0
+        self.weight = np.zeros(capacity, dtype=np.float64)
+        self.last_support_epoch = np.zeros(capacity, dtype=np.int64)
+        self.status = np.zeros(capacity, dtype=np.int8)
+        self.ids: List[str] = []
+        self.titles: List[str] = []
+        self.descriptions: List[str] = []
+        self.created_at: List[Any] = []
+        self.last_support_time: List[Any] = []
+        self.index: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return self.size
+
+    def add(
+        self,
+        initiative_id: str,
+        title: str,
+        description: str,
+        created_at: datetime,
+        last_support_epoch: int,
+        last_support_time: datetime = None,
+        weight: float = 0.0,
+        status: int = LIVE,
+    ) -> int:
+        """Append an initiative and return its row."""
+        if self.size == len(self.weight):
+            capacity = len(self.weight) * 2
+            self.weight = _grow(self.weight, capacity)
+            self.last_support_epoch = _grow(self.last_support_epoch, capacity)
+            self.status = _grow(self.status, capacity)
+        row = self.size
+        self.size += 1
+        self.weight[row] = weight
+        self.last_support_epoch[row] = last_support_epoch
+        self.status[row] = status
+        self.ids.append(initiative_id)
+        self.titles.append(title)
+        self.descriptions.append(description)
+        self.created_at.append(created_at)
+        self.last_support_time.append(
+            created_at if last_support_time is None else last_support_time
+        )
+        self.index[initiative_id] = row
+        return row
+
+    def view(self, name: str) -> np.ndarray:
+        """Return the live slice of a column."""
+        return getattr(self, name)[: self.size]
+
+    def live_rows(self) -> np.ndarray:
+        """Rows of initiatives that are neither accepted nor expired."""
+        return np.flatnonzero(self.status[: self.size] == LIVE)
+
+
+class AggregateWeights:
+    """
+    Per-initiative aggregate lock weight under a common decay multiplier.
+
+    Every live lock decays by the same multiplier m each epoch, so the
+    weight an initiative reads at epoch t factors as m**(t - 1 - base) times
+    a running sum in which each lock contributes anchor_weight *
+    m**(base - anchor_epoch). The sums change only when locks are added or
+    removed, and reading every weight is O(initiatives) instead of
+    O(locks).
+
+    A lock added during epoch t is read at its full weight in t and t + 1,
+    so it is held in a pending sum until the read at t folds it in. base
+    moves forward, rescaling the sums, before contributions of new locks
+    would leave a safe floating point range.
+
+    Removing a lock leaves rounding residue proportional to its
+    contribution. remove() reports initiatives whose residue could exceed
+    REFRESH_RATIO**-1 of their remaining sum; the owner resets them from
+    their locks.
+    """
+
+    # Largest factor m**(base - epoch) allowed in either direction
+    RESCALE_LIMIT = 1e100
+    # Ratio of added to remaining contributions that triggers a reset
+    REFRESH_RATIO = 1e4
+
+    def __init__(self, multiplier: float, epoch: int, capacity: int = 64):
+        if not 0 < multiplier:
+            raise ValueError(f"decay multiplier must be positive, got {multiplier}")
+        self.multiplier = multiplier
+        self.base = epoch
+        self.last_read = epoch
+        self.scaled = np.zeros(capacity, dtype=np.float64)
+        self.pending = np.zeros(capacity, dtype=np.float64)
+        self.pending_scaled = np.zeros(capacity, dtype=np.float64)
+        self.magnitude = np.zeros(capacity, dtype=np.float64)
+        self.count = np.zeros(capacity, dtype=np.int64)
+
+    SUMS = ("scaled", "pending", "pending_scaled", "magnitude", "count")
+
+    def _reserve(self, size: int) -> None:
+        capacity = len(self.scaled)
+        if size <= capacity:
+            return
+        capacity = max(capacity * 2, size)
+        for name in self.SUMS:
+            setattr(self, name, _grow(getattr(self, name), capacity))
+
+    def _update(
+        self, initiatives: np.ndarray, weights: np.ndarray, epochs: np.ndarray, sign: int
+    ) -> None:
+        if not len(initiatives):
+            return
+        self._reserve(int(initiatives.max()) + 1)
+        scaled = weights * self.multiplier ** (self.base - epochs).astype(np.float64)
+        pending = epochs > self.last_read
+        np.add.at(self.count, initiatives, sign)
+        np.add.at(self.scaled, initiatives[~pending], sign * scaled[~pending])
+        np.add.at(self.pending_scaled, initiatives[pending], sign * scaled[pending])
+        np.add.at(self.pending, initiatives[pending], sign * weights[pending])
+        if sign > 0:
+            np.add.at(self.magnitude, initiatives, np.abs(scaled))
+
+    def add(self, initiatives: np.ndarray, weights: np.ndarray, epochs: np.ndarray) -> None:
+        """Add locks by initiative, anchor weight and anchor epoch."""
+        self._update(initiatives, weights, epochs, 1)
+
+    def remove(
+        self, initiatives: np.ndarray, weights: np.ndarray, epochs: np.ndarray
+    ) -> np.ndarray:
+        """
+        Remove locks previously added with the same anchors.
+
+        Returns the initiatives whose sums should be reset from their locks.
+        """
+        self._update(initiatives, weights, epochs, -1)
+        # Initiatives left without locks read exactly zero, free of rounding residue
+        empty = self.count == 0
+        for name in self.SUMS:
+            getattr(self, name)[empty] = 0
+        remaining = np.abs(self.scaled + self.pending_scaled)
+        return np.flatnonzero(~empty & (self.magnitude > self.REFRESH_RATIO * remaining))
+
+    def counts(self, initiatives: np.ndarray) -> np.ndarray:
+        """Return the number of locks held by each of the given initiatives."""
+        self._reserve(int(initiatives.max()) + 1 if len(initiatives) else 0)
+        return self.count[initiatives]
+
+    def reset(
+        self,
+        stale: np.ndarray,
+        initiatives: np.ndarray,
+        weights: np.ndarray,
+        epochs: np.ndarray,
+    ) -> None:
+        """Recompute the sums of the stale initiatives from all of their locks."""
+        for name in self.SUMS:
+            getattr(self, name)[stale] = 0
+        self._update(initiatives, weights, epochs, 1)
+
+    def read(self, epoch: int, size: int) -> np.ndarray:
+        """Return the weights of the first size initiatives as read at epoch."""
+        self._reserve(size)
+        weights = (
+            self.multiplier ** (epoch - 1 - self.base) * self.scaled[:size] + self.pending[:size]
+        )
+        self.scaled += self.pending_scaled
+        self.pending[:] = 0.0
+        self.pending_scaled[:] = 0.0
+        self.last_read = epoch
+        limit = self.RESCALE_LIMIT
+        if not 1 / limit < self.multiplier ** (epoch - self.base) < limit:
+            self.rebase(epoch)
+        return weights
+
+    def rebase(self, epoch: int) -> None:
+        """Move base to epoch, rescaling the running sums."""
+        factor = self.multiplier ** (epoch - self.base)
+        self.scaled *= factor
+        self.pending_scaled *= factor
+        self.magnitude *= factor
+        self.base = epoch
@@ -0,0 +1,345 @@
+"""
+Persistent, structurally shared containers for cadCAD state variables.
+
+cadCAD deep-copies the previous record before every substep, so with plain
+dicts and sets the cost of a substep grows with the size of the state
+rather than with the number of entries it changes. The containers here are
+immutable: copying one returns the same object, and an update produces a
+new container that shares everything it did not touch with the old one.
+
+PersistentMap keeps its entries in insertion order in chunks of at most
+CHUNK_SIZE entries, and a key index split into INDEX_SHARDS shards by key
+hash. Setting or deleting a key copies the chunk holding it and the shard
+indexing it, so a substep that touches three locks copies a few dozen
+entries instead of the whole table. Updates are made through an evolver,
+a mutable view that copies each chunk and shard at most once, and whose
+persistent() method returns the updated container.
+"""
+
+from collections.abc import (
+    ItemsView,
+    Mapping,
+    MutableMapping,
+    MutableSet,
+    Set as AbstractSet,
+    ValuesView,
+)
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional, Set, Tuple
+
+# Entries per chunk and number of key index shards (a power of two)
+CHUNK_SIZE = 32
+INDEX_SHARDS = 64
+
+
+class _ChunkValues(ValuesView):
+    """Values view that walks the chunks instead of looking up each key."""
+
+    def __iter__(self) -> Iterator[Any]:
+        for chunk in self._mapping._chunks:
+            yield from chunk.values()
+
+
+class _ChunkItems(ItemsView):
+    """Items view that walks the chunks instead of looking up each key."""
+
+    def __iter__(self) -> Iterator[Tuple[Any, Any]]:
+        for chunk in self._mapping._chunks:
+            yield from chunk.items()
+
+
+class PersistentMap(Mapping):
+    """
+    Immutable insertion-ordered mapping with structural sharing.
+
+    Compares equal to any mapping with the same items. copy and deepcopy
+    return the map itself, so values are shared and must not be mutated
+    in place; replace them with set or an evolver instead.
+    """
+
+    __slots__ = ("_chunks", "_shards", "_len")
+
+    def __init__(self, data: Any = ()):
+        evolver = MapEvolver(_EMPTY)
+        evolver.update(data)
+        self._chunks, self._shards, self._len = evolver._parts()
+
+    @classmethod
+    def _from_parts(
+        cls, chunks: List[Dict[Any, Any]], shards: List[Dict[Any, int]], length: int
+    ) -> "PersistentMap":
+        instance = object.__new__(cls)
+        instance._chunks = chunks
+        instance._shards = shards
+        instance._len = length
+        return instance
+
+    def __getitem__(self, key: Hashable) -> Any:
+        return self._chunks[self._shards[hash(key) & (INDEX_SHARDS - 1)][key]][key]
+
+    def __contains__(self, key: object) -> bool:
+        try:
+            return key in self._shards[hash(key) & (INDEX_SHARDS - 1)]
+        except TypeError:
+            return False
+
+    def __iter__(self) -> Iterator[Any]:
+        for chunk in self._chunks:
+            yield from chunk
+
+    def __len__(self) -> int:
+        return self._len
+
+    def values(self) -> ValuesView:
+        return _ChunkValues(self)
+
+    def items(self) -> ItemsView:
+        return _ChunkItems(self)
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        return len(self) == len(other) and dict(self.items()) == dict(other.items())
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"PersistentMap({dict(self.items())!r})"
+
+    def __copy__(self) -> "PersistentMap":
+        return self
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "PersistentMap":
+        return self
+
+    def __reduce__(self):
+        return (PersistentMap, (dict(self.items()),))
+
+    def evolver(self) -> "MapEvolver":
+        """Return a mutable view whose persistent() method returns the updated map."""
+        return MapEvolver(self)
+
+    def set(self, key: Hashable, value: Any) -> "PersistentMap":
+        """Return a map with key set to value."""
+        evolver = self.evolver()
+        evolver[key] = value
+        return evolver.persistent()
+
+    def delete(self, key: Hashable) -> "PersistentMap":
+        """Return a map without key; raises KeyError if it is missing."""
+        evolver = self.evolver()
+        del evolver[key]
+        return evolver.persistent()
+
+    def update(self, *args, **kwargs) -> "PersistentMap":
+        """Return a map updated as dict.update would update a copy."""
+        evolver = self.evolver()
+        evolver.update(*args, **kwargs)
+        return evolver.persistent()
+
+
+class MapEvolver(MutableMapping):
+    """
+    Mutable view of a PersistentMap that copies chunks and shards on write.
+
+    New keys are appended to the last chunk, so insertion order is kept.
+    persistent() may be called repeatedly; writes after it copy again.
+    """
+
+    def __init__(self, base: PersistentMap):
+        self._base = base
+        self._chunks = list(base._chunks)
+        self._shards = list(base._shards)
+        self._len = base._len
+        self._own_chunks: Set[int] = set()
+        self._own_shards: Set[int] = set()
+
+    def _chunk(self, number: int) -> Dict[Any, Any]:
+        if number not in self._own_chunks:
+            self._chunks[number] = dict(self._chunks[number])
+            self._own_chunks.add(number)
+        return self._chunks[number]
+
+    def _shard(self, number: int) -> Dict[Any, int]:
+        if number not in self._own_shards:
+            self._shards[number] = dict(self._shards[number])
+            self._own_shards.add(number)
+        return self._shards[number]
+
+    def __getitem__(self, key: Hashable) -> Any:
+        return self._chunks[self._shards[hash(key) & (INDEX_SHARDS - 1)][key]][key]
+
+    def __contains__(self, key: object) -> bool:
+        try:
+            return key in self._shards[hash(key) & (INDEX_SHARDS - 1)]
+        except TypeError:
+            return False
+
+    def __iter__(self) -> Iterator[Any]:
+        for chunk in self._chunks:
+            yield from chunk
+
+    def __len__(self) -> int:
+        return self._len
+
+    def values(self) -> ValuesView:
+        return _ChunkValues(self)
+
+    def items(self) -> ItemsView:
+        return _ChunkItems(self)
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        shard_number = hash(key) & (INDEX_SHARDS - 1)
+        number = self._shards[shard_number].get(key)
+        if number is None:
+            number = len(self._chunks) - 1
+            if number < 0 or len(self._chunks[number]) >= CHUNK_SIZE:
+                self._chunks.append({})
+                number += 1
+                self._own_chunks.add(number)
+            self._shard(shard_number)[key] = number
+            self._len += 1
+        self._chunk(number)[key] = value
+
+    def __delitem__(self, key: Hashable) -> None:
+        shard = self._shard(hash(key) & (INDEX_SHARDS - 1))
+        number = shard.pop(key)
+        del self._chunk(number)[key]
+        self._len -= 1
+
+    def _parts(self) -> Tuple[List[Dict[Any, Any]], List[Dict[Any, int]], int]:
+        # Chunks left mostly empty by deletions are merged once they
+        # outnumber the chunks a freshly built map would need
+        if len(self._chunks) > 2 * (self._len // CHUNK_SIZE + 1):
+            items = [item for chunk in self._chunks for item in chunk.items()]
+            self._chunks = [
+                dict(items[start : start + CHUNK_SIZE])
+                for start in range(0, len(items), CHUNK_SIZE)
+            ]
+            self._shards = [{} for _ in range(INDEX_SHARDS)]
+            for number, chunk in enumerate(self._chunks):
+                for key in chunk:
+                    self._shards[hash(key) & (INDEX_SHARDS - 1)][key] = number
+        self._own_chunks = set()
+        self._own_shards = set()
+        return list(self._chunks), list(self._shards), self._len
+
+    def persistent(self) -> PersistentMap:
+        """Return the updated map; the base map is returned if nothing was written."""
+        if not self._own_chunks and not self._own_shards and self._len == self._base._len:
+            return self._base
+        self._base = PersistentMap._from_parts(*self._parts())
+        return self._base
+
+
+_EMPTY = PersistentMap._from_parts([], [{} for _ in range(INDEX_SHARDS)], 0)
+
+
+class PersistentSet(AbstractSet):
+    """
+    Immutable insertion-ordered set backed by a PersistentMap.
+
+    Compares equal to any set with the same elements; copy and deepcopy
+    return the set itself.
+    """
+
+    __slots__ = ("_map",)
+
+    def __init__(self, elements: Iterable[Hashable] = ()):
+        self._map = PersistentMap(dict.fromkeys(elements))
+
+    @classmethod
+    def _from_map(cls, elements: PersistentMap) -> "PersistentSet":
+        instance = object.__new__(cls)
+        instance._map = elements
+        return instance
+
+    @classmethod
+    def _from_iterable(cls, elements: Iterable[Hashable]) -> "PersistentSet":
+        return cls(elements)
+
+    def __contains__(self, element: object) -> bool:
+        return element in self._map
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._map)
+
+    def __len__(self) -> int:
+        return len(self._map)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"PersistentSet({list(self._map)!r})"
+
+    def __copy__(self) -> "PersistentSet":
+        return self
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "PersistentSet":
+        return self
+
+    def __reduce__(self):
+        return (PersistentSet, (list(self._map),))
+
+    def evolver(self) -> "SetEvolver":
+        """Return a mutable view whose persistent() method returns the updated set."""
+        return SetEvolver(self)
+
+    def add(self, element: Hashable) -> "PersistentSet":
+        """Return a set that also holds element."""
+        if element in self._map:
+            return self
+        return PersistentSet._from_map(self._map.set(element, None))
+
+    def discard(self, element: Hashable) -> "PersistentSet":
+        """Return a set without element."""
+        if element not in self._map:
+            return self
+        return PersistentSet._from_map(self._map.delete(element))
+
+
+class SetEvolver(MutableSet):
+    """Mutable view of a PersistentSet, see MapEvolver."""
+
+    def __init__(self, base: PersistentSet):
+        self._base = base
+        self._elements = base._map.evolver()
+
+    def __contains__(self, element: object) -> bool:
+        return element in self._elements
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._elements)
+
+    def __len__(self) -> int:
+        return len(self._elements)
+
+    def add(self, element: Hashable) -> None:
+        if element not in self._elements:
+            self._elements[element] = None
+
+    def discard(self, element: Hashable) -> None:
+        if element in self._elements:
+            del self._elements[element]
+
+    def persistent(self) -> PersistentSet:
+        """Return the updated set; the base set is returned if nothing was written."""
+        elements = self._elements.persistent()
+        if elements is not self._base._map:
+            self._base = PersistentSet._from_map(elements)
+        return self._base
+
+
+def as_persistent_map(data: Optional[Mapping] = None) -> PersistentMap:
+    """Return data as a PersistentMap, converting plain mappings once."""
+    if isinstance(data, PersistentMap):
+        return data
+    return PersistentMap(data or ())
+
+
+def as_persistent_set(data: Optional[Iterable[Hashable]] = None) -> PersistentSet:
+    """Return data as a PersistentSet, converting plain sets once."""
+    if isinstance(data, PersistentSet):
+        return data
+    return PersistentSet(data or ())
@@ -1,20 +1,100 @@
-from typing import Dict, List, Any
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Any, Optional, Tuple, Union
 import random
 
+import numpy as np
+
+# Action kinds of a UserActionBatch, indexing ACTION_TYPES
+CREATE_INITIATIVE = 0
+SUPPORT_INITIATIVE = 1
+ACTION_TYPES = ("create_initiative", "support_initiative")
+
+
+@dataclass
+class UserActionBatch:
+    """
+    Columnar batch of user actions, in the order they are applied.
+
+    Row i is a create_initiative action if kind[i] == CREATE_INITIATIVE and
+    a support_initiative action otherwise. initiative_id, amount and
+    lock_duration_epochs are only meaningful for supports. Creates take
+    the title and description p_user_actions would give them at epoch.
+    """
+
+    epoch: int
+    kind: np.ndarray
+    user_id: np.ndarray
+    initiative_id: np.ndarray
+    amount: np.ndarray
+    lock_duration_epochs: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.kind)
+
+    def rows(self) -> Iterator[Tuple[str, Any, Optional[str], float, int]]:
+        """Yield (type, user_id, initiative_id, amount, lock_duration_epochs) per action."""
+        return zip(
+            [ACTION_TYPES[kind] for kind in self.kind.tolist()],
+            self.user_id.tolist(),
+            self.initiative_id.tolist(),
+            self.amount.tolist(),
+            self.lock_duration_epochs.tolist(),
+        )
+
+    def describe(self, user_id: Any) -> Tuple[str, str]:
+        """Return the title and description of an initiative created by user_id."""
+        return (
+            f"Initiative by {user_id} at epoch {self.epoch}",
+            f"A new idea proposed by {user_id}.",
+        )
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Return the actions in the list-of-dicts layout of p_user_actions."""
+        actions = []
+        for action_type, user_id, initiative_id, amount, duration in self.rows():
+            if action_type == "create_initiative":
+                title, description = self.describe(user_id)
+                actions.append(
+                    {
+                        "type": action_type,
+                        "user_id": user_id,
+                        "title": title,
+                        "description": description,
+                    }
+                )
+            else:
+                actions.append(
+                    {
+                        "type": action_type,
+                        "user_id": user_id,
+                        "initiative_id": initiative_id,
+                        "amount": amount,
+                        "lock_duration_epochs": duration,
+                    }
+                )
+        return actions
+
 
 def p_user_actions(
     params: Dict[str, Any],
     substep: int,
     state_history: List[Dict[str, Any]],
     previous_state: Dict[str, Any],
-) -> Dict[str, List[Dict[str, Any]]]:
+) -> Dict[str, Union[List[Dict[str, Any]], UserActionBatch]]:
     """
     Policy to determine actions taken by users in a given timestep.
     Users can decide to create new initiatives or support existing ones.
+
+    With the vectorized_user_actions parameter set, the actions are drawn
+    by p_user_actions_vectorized instead.
     """
+    if params.get("vectorized_user_actions", False):
+        return p_user_actions_vectorized(params, substep, state_history, previous_state)
+
     current_epoch = previous_state["current_epoch"]
     user_ids = list(previous_state["balances"].keys())
     actions: List[Dict[str, Any]] = []
+    active_initiatives = _active_initiative_ids(previous_state)
 
     random.shuffle(user_ids)
 
@@ -35,14 +115,8 @@ def p_user_actions(
         if random.random() < params["prob_support_initiative"]:
             user_balance = previous_state["balances"].get(user_id, 0)
             if user_balance > 0:
-                active_initiatives = {
-                    init_id: init_obj
-                    for init_id, init_obj in previous_state["initiatives"].items()
-                    if init_id not in previous_state["accepted_initiatives"]
-                    and init_id not in previous_state["expired_initiatives"]
-                }
                 if active_initiatives:
-                    chosen_initiative_id = random.choice(list(active_initiatives.keys()))
+                    chosen_initiative_id = random.choice(active_initiatives)
                     max_tokens_to_lock = user_balance * params["max_support_tokens_fraction"]
                     tokens_to_lock = random.uniform(1, max_tokens_to_lock)
                     tokens_to_lock = max(1.0, min(tokens_to_lock, user_balance))
@@ -63,6 +137,88 @@ def p_user_actions(
     return {"user_actions": actions}
 
 
+def _active_initiative_ids(previous_state: Dict[str, Any]) -> List[str]:
+    """Ids of the initiatives that are neither accepted nor expired, in insertion order."""
+    accepted = previous_state["accepted_initiatives"]
+    expired = previous_state["expired_initiatives"]
+    return [
+        init_id
+        for init_id in previous_state["initiatives"]
+        if init_id not in accepted and init_id not in expired
+    ]
+
+
+def p_user_actions_vectorized(
+    params: Dict[str, Any],
+    substep: int,
+    state_history: List[Dict[str, Any]],
+    previous_state: Dict[str, Any],
+) -> Dict[str, UserActionBatch]:
+    """
+    Vectorized p_user_actions returning a columnar UserActionBatch.
+
+    The create and support decisions of all users are drawn as Bernoulli
+    masks, and the chosen initiatives, lock amounts and durations as
+    arrays. The actions follow the same distribution and ordering as
+    p_user_actions (users in random order, each user's create before their
+    support) but not the same random draws: the NumPy generator is seeded
+    from Python's random module, so runs stay reproducible under
+    random.seed.
+    """
+    rng = np.random.default_rng(random.getrandbits(64))
+    balances_by_user = previous_state["balances"]
+    num_users = len(balances_by_user)
+    order = rng.permutation(num_users)
+    user_ids = np.array(list(balances_by_user), dtype=object)[order]
+    balances = np.fromiter(balances_by_user.values(), dtype=float, count=num_users)[order]
+
+    creates = rng.random(num_users) < params["prob_create_initiative"]
+    creates &= balances >= params["initiative_creation_stake"]
+    supports = rng.random(num_users) < params["prob_support_initiative"]
+    active_initiatives = _active_initiative_ids(previous_state)
+    supports &= (balances > 0) & bool(active_initiatives)
+
+    creators = np.flatnonzero(creates)
+    supporters = np.flatnonzero(supports)
+    supporter_balances = balances[supporters]
+    chosen = (
+        np.array(active_initiatives, dtype=object)[
+            rng.integers(len(active_initiatives), size=len(supporters))
+        ]
+        if active_initiatives
+        else np.empty(0, dtype=object)
+    )
+    # As random.uniform, which also allows an upper bound below 1
+    max_tokens_to_lock = supporter_balances * params["max_support_tokens_fraction"]
+    amounts = 1.0 + (max_tokens_to_lock - 1.0) * rng.random(len(supporters))
+    amounts = np.maximum(1.0, np.minimum(amounts, supporter_balances))
+    durations = rng.integers(
+        params["min_lock_duration_epochs"],
+        params["max_lock_duration_epochs"],
+        size=len(supporters),
+        endpoint=True,
+    )
+
+    # Interleave by user position, each user's create before their support
+    sequence = np.argsort(np.concatenate([2 * creators, 2 * supporters + 1]), kind="stable")
+    num_creates = len(creators)
+    batch = UserActionBatch(
+        epoch=previous_state["current_epoch"],
+        kind=np.repeat([CREATE_INITIATIVE, SUPPORT_INITIATIVE], [num_creates, len(supporters)])[
+            sequence
+        ],
+        user_id=np.concatenate([user_ids[creators], user_ids[supporters]])[sequence],
+        initiative_id=np.concatenate([np.full(num_creates, None, dtype=object), chosen])[sequence],
+        amount=np.concatenate([np.zeros(num_creates), amounts])[sequence],
+        lock_duration_epochs=np.concatenate([np.zeros(num_creates, dtype=np.int64), durations])[
+            sequence
+        ],
+    )
+
+    print(f"User actions generated: {len(batch)}")
+    return {"user_actions": batch}
+
+
 # We might add other policies here later, e.g., p_delegate_actions, etc.
 # For now, p_user_actions is the main behavioral policy.
 
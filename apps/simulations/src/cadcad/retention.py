@@ -0,0 +1,152 @@
+"""
+History retention for simulation results.
+
+By default every substep of every timestep is kept as a full state record,
+so the results of a long run hold hundreds of copies of the balances,
+locks and initiatives. The history_retention parameter selects what is
+kept instead:
+
+- "full": every substep record (the default)
+- "last_substep": the last substep record of each timestep
+- "every_k": every substep record of each history_retention_interval-th
+  timestep and of the last timestep of each run
+- "summary": every substep record reduced to its scalar fields and the
+  sizes of its collections (see summarize_record)
+- "final": only the final record of each run
+
+The policy is applied while the simulation runs. cadCAD hands policies
+the list of completed timesteps as state_history, and p_retain_history
+prunes the newest one at the start of every timestep; the last timestep
+of each run is pruned by HistoryRetention.finish once the run returns.
+"""
+
+from collections.abc import Mapping, Set as AbstractSet
+from typing import Any, Dict, List
+
+RETENTION_MODES = ("full", "last_substep", "every_k", "summary", "final")
+
+# Collection fields replaced by their sizes in summary records, under the
+# column names used by results_to_dataframe
+SUMMARY_COUNTS = {
+    "initiatives": "initiatives_count",
+    "accepted_initiatives": "accepted_count",
+    "expired_initiatives": "expired_count",
+    "locks": "supporters_count",
+}
+
+
+def summarize_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Return the scalar fields of a record and the sizes of its collections.
+
+    A count the record already carries, as sparse population records do
+    for their lock deltas, is kept.
+    """
+    summary = {
+        key: value
+        for key, value in record.items()
+        if not isinstance(value, (Mapping, AbstractSet, list, tuple))
+    }
+    for field, count in SUMMARY_COUNTS.items():
+        if field in record and count not in record:
+            summary[count] = len(record[field])
+    return summary
+
+
+class HistoryRetention:
+    """Decide which records of a timestep are kept."""
+
+    def __init__(self, mode: str = "full", interval: int = 1):
+        if mode not in RETENTION_MODES:
+            raise ValueError(f"Unknown history retention: {mode}")
+        if interval < 1:
+            raise ValueError(f"History retention interval must be positive: {interval}")
+        self.mode = mode
+        self.interval = interval
+
+    @classmethod
+    def from_params(cls, params: Dict[str, Any]) -> "HistoryRetention":
+        """Build the retention selected by the model parameters."""
+        return cls(
+            params.get("history_retention", "full"),
+            params.get("history_retention_interval", 1),
+        )
+
+    def retain(self, records: List[Dict[str, Any]], final: bool = False) -> List[Dict[str, Any]]:
+        """
+        Return the records kept of one timestep.
+
+        records holds the substep records of a single timestep in order;
+        final marks the last timestep of a run.
+        """
+        mode = self.mode
+        if mode == "full" or not records:
+            return records
+        if mode == "last_substep":
+            return records[-1:]
+        if mode == "every_k":
+            keep = final or records[-1]["timestep"] % self.interval == 0
+            return records if keep else []
+        if mode == "summary":
+            return [summarize_record(record) for record in records]
+        return records[-1:] if final else []
+
+    def prune(self, state_history: List[List[Dict[str, Any]]]) -> None:
+        """Apply the retention in place to the newest timestep of a cadCAD history."""
+        if self.mode != "full" and state_history:
+            state_history[-1][:] = self.retain(state_history[-1])
+
+    def finish(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Apply the retention to the last timestep of each run in results.
+
+        The other timesteps are expected to have been pruned already, as
+        p_retain_history does during a cadCAD run.
+        """
+        if self.mode == "full":
+            return results
+
+        finished: List[Dict[str, Any]] = []
+        start = 0
+        for index in range(1, len(results) + 1):
+            if index < len(results) and results[index].get("run") == results[start].get("run"):
+                continue
+            # results[start:index] is one run; find its last timestep
+            timestep = results[index - 1]["timestep"]
+            last = index
+            while last > start and results[last - 1]["timestep"] == timestep:
+                last -= 1
+            finished.extend(results[start:last])
+            finished.extend(self.retain(results[last:index], final=True))
+            start = index
+        return finished
+
+    def apply(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Apply the retention to the unpruned records of a single run."""
+        if self.mode == "full":
+            return records
+
+        kept: List[Dict[str, Any]] = []
+        start = 0
+        for index in range(1, len(records) + 1):
+            if index < len(records) and records[index]["timestep"] == records[start]["timestep"]:
+                continue
+            kept.extend(self.retain(records[start:index], final=index == len(records)))
+            start = index
+        return kept
+
+
+def p_retain_history(
+    params: Dict[str, Any],
+    substep: int,
+    state_history: List[List[Dict[str, Any]]],
+    previous_state: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    Policy that applies the history retention to the previous timestep.
+
+    It runs at the start of every timestep, once cadCAD has taken the
+    timestep's initial state from the previous one, and signals nothing.
+    """
+    HistoryRetention.from_params(params).prune(state_history)
+    return {}
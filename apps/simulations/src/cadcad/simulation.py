@@ -0,0 +1,212 @@
+"""
+Step-by-step simulation on the cadCAD PSUB pipeline.
+
+run_simulation runs every timestep before returning the whole history.
+Simulation runs the same PSUBs one timestep at a time through cadCAD's
+per-timestep pipeline, keeping only the records of the latest timestep.
+Callers step it directly, run it for a number of timesteps or until a
+predicate holds, or iterate over it to stream TimestepViews into their
+own sinks:
+
+    simulation = Simulation(initial_state, sim_params)
+    for view in simulation:
+        sink.write(view.state)
+        if view["locked_supply"] > limit:
+            break
+
+A run can be checkpointed at the end of any timestep and resumed later,
+or forked into several runs that continue it under different parameters
+(see checkpoint.py).
+"""
+
+import random
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from cadCAD.configuration import Processor
+from cadCAD.engine.simulation import Executor as SimExecutor
+
+from .checkpoint import Checkpoint
+from .model import psubs, simulation_parameters
+
+
+@dataclass(frozen=True)
+class TimestepView:
+    """
+    The records of one completed timestep.
+
+    records holds one record per substep, or only the initial record for
+    timestep 0. Records are shared with the simulation and must not be
+    mutated.
+    """
+
+    run: int
+    timestep: int
+    records: Tuple[Dict[str, Any], ...]
+
+    @property
+    def state(self) -> Dict[str, Any]:
+        """The state at the end of the timestep."""
+        return self.records[-1]
+
+    def __getitem__(self, variable: str) -> Any:
+        return self.records[-1][variable]
+
+
+class Simulation:
+    """
+    A single run of the model that advances one timestep at a time.
+
+    Takes the same initial_state and simulation parameters as
+    run_simulation; N is ignored, since a Simulation is a single run
+    tagged with run. The horizon is num_epochs, or the length of T, and
+    bounds iteration, run and run_until; step advances past it.
+
+    A Simulation draws from Python's global random state. Simulations
+    created by resume or fork instead carry their own copy of the
+    checkpointed state and swap it in around each timestep, so they
+    continue the checkpointed random stream however they are interleaved.
+    The PSUBs receive the timestep the simulation started from as the
+    start_timestep parameter, so the first timestep after a resume checks
+    every initiative for acceptance under the resumed parameters.
+    """
+
+    def __init__(
+        self,
+        initial_state: Dict[str, Any],
+        sim_params: Optional[Dict[str, Any]] = None,
+        num_epochs: Optional[int] = None,
+        run: int = 1,
+        timestep: int = 0,
+    ):
+        if sim_params is None:
+            sim_params = simulation_parameters
+
+        self.params = sim_params["M"]
+        self.horizon = num_epochs if num_epochs is not None else len(sim_params["T"])
+        self.run_id = run
+        self.timestep = timestep
+        self.start_timestep = timestep
+        self._rng_state: Optional[Tuple[Any, ...]] = None
+
+        self._configs = Processor().generate_config(initial_state, psubs, [])
+        self._executor = SimExecutor([lambda a, b: a + b])
+
+        # A state resumed at a later timestep is already a tagged record
+        record = dict(initial_state)
+        if timestep == 0:
+            record.update(simulation=0, subset="default", run=run, substep=0, timestep=0)
+        self._records: List[Dict[str, Any]] = [record]
+        self.view = TimestepView(run, timestep, (record,))
+
+    @property
+    def state(self) -> Dict[str, Any]:
+        """The latest record."""
+        return self.view.state
+
+    @property
+    def done(self) -> bool:
+        """Whether the horizon has been reached."""
+        return self.timestep >= self.horizon
+
+    def step(self) -> TimestepView:
+        """Run one timestep and return its view."""
+        self.timestep += 1
+        if self._rng_state is None:
+            records = self._pipeline()
+        else:
+            outer = random.getstate()
+            random.setstate(self._rng_state)
+            try:
+                records = self._pipeline()
+            finally:
+                self._rng_state = random.getstate()
+                random.setstate(outer)
+        # The pipeline returns the timestep's initial state first
+        self._records = records[1:]
+        self.view = TimestepView(self.run_id, self.timestep, tuple(self._records))
+        return self.view
+
+    def _pipeline(self) -> List[Dict[str, Any]]:
+        params = {**self.params, "start_timestep": self.start_timestep}
+        return self._executor.state_update_pipeline(
+            params, [self._records], self._configs, {}, self.timestep, self.run_id, None
+        )
+
+    def __iter__(self) -> Iterator[TimestepView]:
+        """Yield the view of each timestep until the horizon."""
+        while not self.done:
+            yield self.step()
+
+    def run(self, num_timesteps: Optional[int] = None) -> TimestepView:
+        """Run num_timesteps timesteps, at most up to the horizon, and return the last view."""
+        until = self.horizon
+        if num_timesteps is not None:
+            until = min(until, self.timestep + num_timesteps)
+        while self.timestep < until:
+            self.step()
+        return self.view
+
+    def run_until(
+        self, predicate: Callable[[TimestepView], bool], max_timesteps: Optional[int] = None
+    ) -> TimestepView:
+        """
+        Run until predicate holds for a timestep's view and return that view.
+
+        Stops at the horizon, or after max_timesteps timesteps, if the
+        predicate never holds; check it on the returned view.
+        """
+        until = self.horizon
+        if max_timesteps is not None:
+            until = min(until, self.timestep + max_timesteps)
+        while self.timestep < until:
+            if predicate(self.step()):
+                break
+        return self.view
+
+    def checkpoint(self) -> Checkpoint:
+        """Capture the run at the end of the latest timestep."""
+        return Checkpoint(
+            state=dict(self.state),
+            timestep=self.timestep,
+            run=self.run_id,
+            horizon=self.horizon,
+            params=dict(self.params),
+            rng_state=self._rng_state if self._rng_state is not None else random.getstate(),
+        )
+
+    @classmethod
+    def resume(
+        cls,
+        checkpoint: Checkpoint,
+        params: Optional[Dict[str, Any]] = None,
+        num_epochs: Optional[int] = None,
+    ) -> "Simulation":
+        """
+        Continue a run from a checkpoint.
+
+        params overrides individual model parameters from the timestep
+        after the checkpoint on, and num_epochs the checkpointed horizon.
+        Without overrides the resumed run reproduces the records the
+        original run went on to produce.
+        """
+        horizon = num_epochs if num_epochs is not None else checkpoint.horizon
+        sim_params = {"T": range(horizon), "M": {**checkpoint.params, **(params or {})}}
+        simulation = cls(checkpoint.state, sim_params, horizon, checkpoint.run, checkpoint.timestep)
+        simulation._rng_state = checkpoint.rng_state
+        return simulation
+
+    @classmethod
+    def fork(
+        cls,
+        checkpoint: Checkpoint,
+        variants: Iterable[Dict[str, Any]],
+        num_epochs: Optional[int] = None,
+    ) -> List["Simulation"]:
+        """
+        Resume one checkpoint once per variant of parameter overrides.
+
+        The forks start from the same state and random stream, so they
+        differ only through their parameters.
+        """
+        return [cls.resume(checkpoint, variant, num_epochs) for variant in variants]
@@ -1,11 +1,39 @@
+from collections.abc import Mapping
+from copy import copy
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, Set, Any, Tuple, List, Optional
+from typing import Dict, Iterator, Set, Any, Tuple, List, Optional
 from supply.allocate import allocate_tokens
 
 
-@dataclass
-class Initiative:
+class Record(Mapping):
+    """
+    Read-only mapping over the fields of a slotted record.
+
+    Initiatives and locks are emitted into cadCAD records as the objects
+    themselves and read there like the field dicts they replace, so no
+    per-instance __dict__ or emitted dict is kept alongside each record.
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, name: str) -> Any:
+        if name in self.__slots__:
+            return getattr(self, name)
+        raise KeyError(name)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.__slots__
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__slots__)
+
+    def __len__(self) -> int:
+        return len(self.__slots__)
+
+
+@dataclass(eq=False, slots=True)
+class Initiative(Record):
     id: str
     title: str
     description: str
@@ -15,8 +43,8 @@ class Initiative:
     last_support_epoch: int = 0
 
 
-@dataclass
-class Support:
+@dataclass(eq=False, slots=True)
+class Support(Record):
     user_id: str
     initiative_id: str
     amount: float
@@ -38,6 +66,166 @@ class Support:
             self.current_weight = max(0, self.current_weight)
 
 
+LockKey = Tuple[str, str]
+
+
+class Locks(dict):
+    """
+    Locks keyed by (user_id, initiative_id) with maintained secondary indexes.
+
+    by_initiative, by_user, by_start and by_expiry map an initiative, a
+    user, a start epoch or an expiry epoch to the keys of its locks, kept
+    in lock order and updated as locks are added, replaced and removed.
+    Support objects must not be changed in place once stored; assign a
+    replacement instead.
+
+    A copy shares the index buckets with the original; either copies a
+    bucket before its first write to it, so copying costs one entry per
+    bucket rather than one per lock.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self.by_initiative: Dict[str, Dict[LockKey, None]] = {}
+        self.by_user: Dict[str, Dict[LockKey, None]] = {}
+        self.by_start: Dict[int, Dict[LockKey, None]] = {}
+        self.by_expiry: Dict[int, Dict[LockKey, None]] = {}
+        # Insertion sequence of each key, used to restore lock order
+        self.order: Dict[LockKey, int] = {}
+        self._next = 0
+        # ids of the index buckets not shared with a copy
+        self._owned: Set[int] = set()
+        self.update(*args, **kwargs)
+
+    def _own(self, index: Dict[Any, Dict[LockKey, None]], value: Any) -> Dict[LockKey, None]:
+        bucket = index[value]
+        if id(bucket) not in self._owned:
+            bucket = index[value] = dict(bucket)
+            self._owned.add(id(bucket))
+        return bucket
+
+    def _add(self, index: Dict[Any, Dict[LockKey, None]], value: Any, key: LockKey) -> None:
+        if value in index:
+            self._own(index, value)[key] = None
+        else:
+            bucket = index[value] = {key: None}
+            self._owned.add(id(bucket))
+
+    def _discard(self, index: Dict[Any, Dict[LockKey, None]], value: Any, key: LockKey) -> None:
+        bucket = self._own(index, value)
+        del bucket[key]
+        if not bucket:
+            del index[value]
+            self._owned.discard(id(bucket))
+
+    def __setitem__(self, key: LockKey, support: Support) -> None:
+        previous = self.get(key)
+        if previous is None:
+            user_id, initiative_id = key
+            self._add(self.by_initiative, initiative_id, key)
+            self._add(self.by_user, user_id, key)
+            self._add(self.by_start, support.start_epoch, key)
+            self._add(self.by_expiry, support.expiry_epoch, key)
+            self.order[key] = self._next
+            self._next += 1
+        else:
+            if previous.start_epoch != support.start_epoch:
+                self._discard(self.by_start, previous.start_epoch, key)
+                self._add(self.by_start, support.start_epoch, key)
+            if previous.expiry_epoch != support.expiry_epoch:
+                self._discard(self.by_expiry, previous.expiry_epoch, key)
+                self._add(self.by_expiry, support.expiry_epoch, key)
+        super().__setitem__(key, support)
+
+    def __delitem__(self, key: LockKey) -> None:
+        support = self[key]
+        super().__delitem__(key)
+        user_id, initiative_id = key
+        self._discard(self.by_initiative, initiative_id, key)
+        self._discard(self.by_user, user_id, key)
+        self._discard(self.by_start, support.start_epoch, key)
+        self._discard(self.by_expiry, support.expiry_epoch, key)
+        del self.order[key]
+
+    _missing = object()
+
+    def pop(self, key: LockKey, default: Any = _missing) -> Any:
+        if key not in self:
+            if default is self._missing:
+                raise KeyError(key)
+            return default
+        support = self[key]
+        del self[key]
+        return support
+
+    def popitem(self) -> Tuple[LockKey, Support]:
+        key = next(reversed(self))
+        return key, self.pop(key)
+
+    def setdefault(self, key: LockKey, default: Support = None) -> Support:
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs) -> None:
+        for key, support in dict(*args, **kwargs).items():
+            self[key] = support
+
+    def clear(self) -> None:
+        super().clear()
+        self.by_initiative.clear()
+        self.by_user.clear()
+        self.by_start.clear()
+        self.by_expiry.clear()
+        self.order.clear()
+        self._owned.clear()
+
+    def copy(self) -> "Locks":
+        """Return a shallow copy whose indexes share their buckets with this one."""
+        other = Locks.__new__(Locks)
+        dict.update(other, self)
+        other.by_initiative = dict(self.by_initiative)
+        other.by_user = dict(self.by_user)
+        other.by_start = dict(self.by_start)
+        other.by_expiry = dict(self.by_expiry)
+        other.order = dict(self.order)
+        other._next = self._next
+        other._owned = set()
+        # Buckets are now shared, so both sides copy before writing
+        self._owned = set()
+        return other
+
+    def __reduce__(self):
+        return (Locks, (dict(self),))
+
+    def count(self, initiative_id: str) -> int:
+        """Number of locks held on an initiative."""
+        return len(self.by_initiative.get(initiative_id, ()))
+
+    def for_initiative(self, initiative_id: str) -> List[Support]:
+        """Locks held on an initiative, in lock order."""
+        return [self[key] for key in self.by_initiative.get(initiative_id, ())]
+
+    def for_user(self, user_id: str) -> List[Support]:
+        """Locks held by a user, in lock order."""
+        return [self[key] for key in self.by_user.get(user_id, ())]
+
+    def started(self, epoch: int) -> List[LockKey]:
+        """Keys of locks that started at epoch."""
+        return list(self.by_start.get(epoch, ()))
+
+    def expiring(self, epoch: int) -> List[LockKey]:
+        """Keys of locks whose expiry epoch is at or before epoch, in lock order."""
+        keys = [
+            key
+            for expiry_epoch, bucket in self.by_expiry.items()
+            if expiry_epoch <= epoch
+            for key in bucket
+        ]
+        keys.sort(key=self.order.__getitem__)
+        return keys
+
+
 @dataclass
 class State:
     def __init__(self, **kwargs):
@@ -46,7 +234,8 @@ class State:
         self.initiatives: Dict[str, Initiative] = kwargs.get("initiatives", {})
         self.accepted_initiatives: Set[str] = kwargs.get("accepted_initiatives", set())
         self.expired_initiatives: Set[str] = kwargs.get("expired_initiatives", set())
-        self.locks: Dict[Tuple[str, str], Support] = kwargs.get("locks", {})
+        locks = kwargs.get("locks", {})
+        self.locks: Locks = locks if isinstance(locks, Locks) else Locks(locks)
         self.acceptance_threshold: float = kwargs.get("acceptance_threshold", 1000.0)
         self.inactivity_period: int = kwargs.get("inactivity_period", 10)
         self.decay_multiplier: float = kwargs.get("decay_multiplier", 0.95)
@@ -66,10 +255,8 @@ class State:
 
     def __dict__(self):
         """Convert state to dictionary for cadCAD."""
-        initiatives_copy = (
-            {k: v.__dict__ for k, v in self.initiatives.items()} if self.initiatives else {}
-        )
-        locks_copy = {k: v.__dict__ for k, v in self.locks.items()} if self.locks else {}
+        initiatives_copy = dict(self.initiatives)
+        locks_copy = dict(self.locks)
         balances_copy = dict(self.balances)
         accepted_copy = set(self.accepted_initiatives)
         expired_copy = set(self.expired_initiatives)
@@ -99,23 +286,27 @@ class State:
 
     def get_initiative_weight(self, initiative_id: str) -> float:
         """Calculate total current weight for an initiative from all its supporters."""
-        return sum(
-            support.current_weight
-            for (uid, init_id), support in self.locks.items()
-            if init_id == initiative_id
-        )
+        return sum(support.current_weight for support in self.locks.for_initiative(initiative_id))
 
     def update_initiative_weights(self) -> None:
-        """Update current weights for all initiatives based on their support."""
+        """
+        Update current weights for all initiatives based on their support.
+
+        Initiatives whose weight changes are replaced by updated copies
+        rather than mutated, since they may be shared with other states.
+        """
         for initiative_id, initiative in self.initiatives.items():
-            initiative.weight = self.get_initiative_weight(initiative_id)
+            weight = self.get_initiative_weight(initiative_id)
+            if initiative.weight != weight:
+                initiative = copy(initiative)
+                initiative.weight = weight
+                self.initiatives[initiative_id] = initiative
 
     def get_user_support(self, user_id: str) -> Dict[str, Support]:
         """Get all support entries for a user."""
         return {
-            initiative_id: support
-            for (uid, initiative_id), support in self.locks.items()
-            if uid == user_id
+            initiative_id: self.locks[(uid, initiative_id)]
+            for uid, initiative_id in self.locks.by_user.get(user_id, ())
         }
 
     def record_reward(
@@ -14,6 +14,9 @@ from .base import (
     StateUpdateFunction,
     get_state_obj,
     create_suf,
+    BlockTransactionSUF,
+    TransactionCache,
+    create_transaction_sufs,
     log_epoch_transition,
     log_action,
 )
@@ -51,6 +54,9 @@ __all__ = [
     "StateUpdateFunction",
     "get_state_obj",
     "create_suf",
+    "BlockTransactionSUF",
+    "TransactionCache",
+    "create_transaction_sufs",
     "log_epoch_transition",
     "log_action",
     # User actions
@@ -5,64 +5,175 @@ This module provides common utilities and base classes to reduce
 code duplication across SUF implementations.
 """
 
+import sys
+from collections import deque
 from datetime import datetime
-from typing import Dict, List, Any, Tuple, Callable, TypeVar
+from typing import Dict, List, Any, Set, Tuple, Callable, TypeVar
 from abc import ABC, abstractmethod
 
-from ..state import State, Initiative, Support
+from ..persistent import PersistentMap, as_persistent_map
+from ..state import State, Initiative, Record, Support, Locks
 
 # Type variable for SUF return types
 SUFReturn = TypeVar("SUFReturn", Tuple[str, Any], List[Tuple[str, Any]])
 
 
+def _intern(value: Any) -> Any:
+    """Intern ID strings, so rebuilt keys and records share one object per ID."""
+    return sys.intern(value) if type(value) is str else value
+
+
+def _build_initiative(init_data: Any) -> Initiative:
+    """Create an Initiative object from its cadCAD dict representation."""
+    if isinstance(init_data, dict):
+        initiative = Initiative(**init_data)
+        initiative.id = _intern(initiative.id)
+        return initiative
+    elif isinstance(init_data, Initiative):
+        return init_data
+    else:
+        raise TypeError(f"Unexpected type for initiative data: {type(init_data)}")
+
+
+def _build_support(sup_data: Any) -> Support:
+    """Create a Support object from its cadCAD dict representation."""
+    if isinstance(sup_data, dict):
+        # Handle field mapping and filtering
+        init_fields = {}
+        for k, v in sup_data.items():
+            if k not in ["initial_weight", "current_weight", "expiry_epoch"]:
+                if k == "creation_epoch":
+                    init_fields["start_epoch"] = v
+                elif k in ("user_id", "initiative_id"):
+                    init_fields[k] = _intern(v)
+                else:
+                    init_fields[k] = v
+
+        support_obj = Support(**init_fields)
+
+        # Preserve calculated fields
+        if "initial_weight" in sup_data:
+            support_obj.initial_weight = sup_data["initial_weight"]
+        if "current_weight" in sup_data:
+            support_obj.current_weight = sup_data["current_weight"]
+        if "expiry_epoch" in sup_data:
+            support_obj.expiry_epoch = sup_data["expiry_epoch"]
+
+        return support_obj
+    elif isinstance(sup_data, Support):
+        return sup_data
+    else:
+        raise TypeError(f"Unexpected type for support data: {type(sup_data)}")
+
+
+class TypedStateCache:
+    """
+    Typed initiatives and locks kept alive across substeps.
+
+    cadCAD hands every block a deep copy of the previous record, so the
+    dicts a SUF receives are never the ones it returned. The cache keeps
+    the dict forms it recently produced (see emit) together with the typed
+    objects behind them; an incoming dict that compares equal to one of
+    them reuses those objects instead of rebuilding every record. The
+    emitted values are the slotted records themselves (see state.Record).
+
+    Cached objects are shared between SUFs and with emitted records, so
+    they are read-only: a SUF that changes an initiative or lock replaces
+    it with a copy instead of mutating it in place. That also lets emit
+    find the changed entries by identity and build the new PersistentMap
+    from the one the objects were read from, sharing everything else.
+    """
+
+    # Emitted forms remembered per variable (a block's SUFs may still read
+    # the previous form after one of them has emitted a new one)
+    HISTORY = 2
+
+    def __init__(self):
+        self._entries: Dict[str, deque] = {}
+        # Entry last returned by typed, which emit diffs against
+        self._bases: Dict[str, Tuple[PersistentMap, Dict[Any, Any]]] = {}
+        self._time: Tuple[Any, Any] = (None, None)
+
+    def _history(self, variable: str) -> deque:
+        if variable not in self._entries:
+            self._entries[variable] = deque(maxlen=self.HISTORY)
+        return self._entries[variable]
+
+    def typed(
+        self,
+        variable: str,
+        data: Dict[Any, Any],
+        build: Callable[[Any], Any],
+        container: type = dict,
+    ) -> Dict[Any, Any]:
+        """Return a fresh container of typed objects for a cadCAD collection."""
+        history = self._history(variable)
+        for entry in reversed(history):
+            emitted, objects = entry
+            if data is emitted or data == emitted:
+                self._bases[variable] = entry
+                return objects.copy()
+
+        objects = container()
+        for key, value in data.items():
+            key = tuple(map(_intern, key)) if isinstance(key, (list, tuple)) else _intern(key)
+            objects[key] = build(value)
+        self._bases.pop(variable, None)
+        self.emit(variable, objects)
+        return objects.copy()
+
+    def emit(self, variable: str, objects: Dict[Any, Any]) -> PersistentMap:
+        """Return the cadCAD dict form of typed objects and remember it."""
+        base = self._bases.pop(variable, None)
+        if base is None:
+            emitted = as_persistent_map(objects)
+        else:
+            base_emitted, base_objects = base
+            evolver = base_emitted.evolver()
+            for key in base_objects:
+                if key not in objects:
+                    del evolver[key]
+            for key, obj in objects.items():
+                if base_objects.get(key) is not obj:
+                    evolver[key] = obj
+            emitted = evolver.persistent()
+        entry = (emitted, objects.copy())
+        self._history(variable).append(entry)
+        self._bases[variable] = entry
+        return emitted
+
+    def parse_time(self, value: str) -> datetime:
+        """Parse an ISO timestamp, reusing the last result."""
+        if self._time[0] != value:
+            self._time = (value, datetime.fromisoformat(value))
+        return self._time[1]
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        self._entries.clear()
+        self._bases.clear()
+        self._time = (None, None)
+
+
+# Shared by every SUF in the process
+state_cache = TypedStateCache()
+
+
 def get_state_obj(previous_state_dict: Dict[str, Any]) -> State:
     """
     Reconstruct State object from cadCAD dict representation.
 
     This is a critical utility that handles the conversion between
     cadCAD's dict-based state and our dataclass-based State objects.
+    Initiatives and locks come from the typed state cache, so the
+    returned objects must not be mutated in place.
     """
-    # Create Initiative objects from dicts
-    initiatives_dict_of_obj = {}
-    for init_id, init_data in previous_state_dict.get("initiatives", {}).items():
-        if isinstance(init_data, dict):
-            initiatives_dict_of_obj[init_id] = Initiative(**init_data)
-        elif isinstance(init_data, Initiative):
-            initiatives_dict_of_obj[init_id] = init_data
-        else:
-            raise TypeError(f"Unexpected type for initiative data: {type(init_data)}")
-
-    # Create Support objects from dicts
-    locks_dict_of_obj = {}
+    initiatives_dict_of_obj = state_cache.typed(
+        "initiatives", previous_state_dict.get("initiatives", {}), _build_initiative
+    )
     # Handle both new "locks" key and legacy "supporters" key for backwards compatibility
     locks_data = previous_state_dict.get("locks", previous_state_dict.get("supporters", {}))
-    for sup_key_tuple, sup_data in locks_data.items():
-        key = tuple(sup_key_tuple) if isinstance(sup_key_tuple, list) else sup_key_tuple
-        if isinstance(sup_data, dict):
-            # Handle field mapping and filtering
-            init_fields = {}
-            for k, v in sup_data.items():
-                if k not in ["initial_weight", "current_weight", "expiry_epoch"]:
-                    if k == "creation_epoch":
-                        init_fields["start_epoch"] = v
-                    else:
-                        init_fields[k] = v
-
-            support_obj = Support(**init_fields)
-
-            # Preserve calculated fields
-            if "initial_weight" in sup_data:
-                support_obj.initial_weight = sup_data["initial_weight"]
-            if "current_weight" in sup_data:
-                support_obj.current_weight = sup_data["current_weight"]
-            if "expiry_epoch" in sup_data:
-                support_obj.expiry_epoch = sup_data["expiry_epoch"]
-
-            locks_dict_of_obj[key] = support_obj
-        elif isinstance(sup_data, Support):
-            locks_dict_of_obj[key] = sup_data
-        else:
-            raise TypeError(f"Unexpected type for support data: {type(sup_data)}")
+    locks_dict_of_obj = state_cache.typed("locks", locks_data, _build_support, Locks)
 
     # Create State instance
     current_state_params = previous_state_dict.copy()
@@ -71,7 +182,7 @@ def get_state_obj(previous_state_dict: Dict[str, Any]) -> State:
 
     # Handle datetime parsing
     if isinstance(current_state_params.get("current_time"), str):
-        current_state_params["current_time"] = datetime.fromisoformat(
+        current_state_params["current_time"] = state_cache.parse_time(
             current_state_params["current_time"]
         )
 
@@ -94,7 +205,9 @@ class StateUpdateFunction(ABC):
     @staticmethod
     def to_cadcad_dict(obj: Any) -> Any:
         """Convert dataclass objects to dictionaries for cadCAD compatibility."""
-        if hasattr(obj, "__dict__"):
+        if isinstance(obj, Record):
+            return obj
+        elif hasattr(obj, "__dict__"):
             return obj.__dict__
         elif isinstance(obj, dict):
             return {k: StateUpdateFunction.to_cadcad_dict(v) for k, v in obj.items()}
@@ -103,6 +216,11 @@ class StateUpdateFunction(ABC):
         else:
             return obj
 
+    @staticmethod
+    def emit(variable: str, objects: Dict[Any, Any]) -> Dict[str, Any]:
+        """Convert typed initiatives or locks to their cadCAD dict form."""
+        return state_cache.emit(variable, objects)
+
     @abstractmethod
     def execute(
         self,
@@ -139,6 +257,104 @@ def create_suf(suf_class: type) -> Callable:
     return suf_function
 
 
+class BlockTransactionSUF(StateUpdateFunction):
+    """
+    Base class for SUFs that update several state variables in one pass.
+
+    cadCAD calls one SUF per state variable, passing every SUF in a block
+    the same previous_state and policy_input objects. Subclasses implement
+    compute() for the whole block. The SUFs of one block, created together
+    by create_transaction_sufs, share a TransactionCache, so the pass runs
+    once and each variable reads its entry.
+    """
+
+    VARIABLES: Tuple[str, ...] = ()
+
+    def __init__(self, variable: str, cache: "TransactionCache"):
+        if variable not in self.VARIABLES:
+            raise ValueError(f"Unknown variable for {type(self).__name__}: {variable}")
+        self.variable = variable
+        self.cache = cache
+
+    @classmethod
+    @abstractmethod
+    def compute(
+        cls,
+        params: Dict[str, Any],
+        previous_state: Dict[str, Any],
+        policy_input: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Return the updated value of every variable in VARIABLES."""
+        pass
+
+    def execute(
+        self,
+        params: Dict[str, Any],
+        substep: int,
+        state_history: List[Dict[str, Any]],
+        previous_state: Dict[str, Any],
+        policy_input: Dict[str, Any],
+    ) -> Tuple[str, Any]:
+        inputs = (params, previous_state, policy_input)
+        result = self.cache.read(self.variable, inputs, self.compute)
+        return (self.variable, result[self.variable])
+
+
+class TransactionCache:
+    """
+    The result of a block's latest pass, keyed by the identity of its inputs.
+
+    The result is released once every variable of the block has read it,
+    so the cache does not keep a state alive after its substep, and a
+    pass over new inputs replaces it.
+    """
+
+    def __init__(self, variables: Tuple[str, ...]):
+        self.variables = frozenset(variables)
+        self.inputs: Tuple[Any, ...] = ()
+        self.result: Dict[str, Any] = {}
+        self.unread: Set[str] = set()
+
+    def read(
+        self, variable: str, inputs: Tuple[Any, ...], compute: Callable[..., Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Return the result of compute(*inputs), running it on first use."""
+        cached = len(self.inputs) == len(inputs) and all(
+            a is b for a, b in zip(self.inputs, inputs)
+        )
+        if not cached:
+            self.inputs, self.result = inputs, compute(*inputs)
+            self.unread = set(self.variables)
+        result = self.result
+        self.unread.discard(variable)
+        if not self.unread:
+            self.inputs, self.result = (), {}
+        return result
+
+
+def _transaction_suf(suf_instance: BlockTransactionSUF) -> Callable:
+    def suf_function(
+        params: Dict[str, Any],
+        substep: int,
+        state_history: List[Dict[str, Any]],
+        previous_state: Dict[str, Any],
+        policy_input: Dict[str, Any],
+    ) -> Tuple[str, Any]:
+        return suf_instance.execute(params, substep, state_history, previous_state, policy_input)
+
+    # Preserve function name for debugging
+    suf_function.__name__ = f"{type(suf_instance).__name__.lower()}_{suf_instance.variable}"
+    return suf_function
+
+
+def create_transaction_sufs(suf_class: type) -> Dict[str, Callable]:
+    """Create the cadCAD SUFs of a block transaction, one per variable, sharing one cache."""
+    cache = TransactionCache(suf_class.VARIABLES)
+    return {
+        variable: _transaction_suf(suf_class(variable, cache)) for variable in suf_class.VARIABLES
+    }
+
+
 def log_epoch_transition(state: State, message: str = "") -> None:
     """Utility function for consistent epoch transition logging."""
     print(f"\n🕐 === EPOCH {state.current_epoch} {message} ===")
@@ -8,8 +8,11 @@ This module contains SUFs that handle governance mechanics:
 - Initiative expiration
 """
 
+from copy import copy
 from typing import Dict, List, Any, Tuple, Set
+
 from .base import StateUpdateFunction, log_action, create_suf
+from ..persistent import as_persistent_set
 
 
 class CalculateCurrentSupport(StateUpdateFunction):
@@ -33,12 +36,14 @@ class CalculateCurrentSupport(StateUpdateFunction):
         )
 
         active_supports_count = 0
-        for support in state.locks.values():
+        for sup_key, support in state.locks.items():
             if (
                 state.current_epoch < support.expiry_epoch
             ):  # Only decay active, non-expired supports
-                old_weight = support.current_weight
+                # Cached locks are shared, so decay a copy
+                support = copy(support)
                 support.decay(decay_multiplier, state.current_epoch)
+                state.locks[sup_key] = support
                 active_supports_count += 1
 
         if active_supports_count > 0:
@@ -49,8 +54,7 @@ class CalculateCurrentSupport(StateUpdateFunction):
             )
 
         # Convert dataclass objects to dictionaries for cadCAD compatibility
-        locks_dict = {k: self.to_cadcad_dict(v) for k, v in state.locks.items()}
-        return ("locks", locks_dict)
+        return ("locks", self.emit("locks", state.locks))
 
 
 class UpdateInitiativeAggregateWeightsSUF(StateUpdateFunction):
@@ -78,12 +82,39 @@ class UpdateInitiativeAggregateWeightsSUF(StateUpdateFunction):
                 )
 
         # Convert dataclass objects to dictionaries for cadCAD compatibility
-        initiatives_dict = {k: self.to_cadcad_dict(v) for k, v in state.initiatives.items()}
-        return ("initiatives", initiatives_dict)
+        return ("initiatives", self.emit("initiatives", state.initiatives))
+
+
+def requires_exhaustive_acceptance(params: Dict[str, Any]) -> bool:
+    """
+    Return whether every live initiative must be checked for acceptance.
+
+    With a decay multiplier of at most one, an initiative's weight only
+    rises in an epoch in which it receives support, so by default only
+    initiatives supported this epoch are checked. The exhaustive_acceptance
+    parameter opts back into checking all of them, for weight curves or
+    parameter changes that can raise weight otherwise. A growing decay
+    multiplier or a threshold that unsupported initiatives already meet
+    imply it.
+    """
+    return (
+        params.get("exhaustive_acceptance", False)
+        or params.get("decay_multiplier", 1.0) > 1
+        or params["acceptance_threshold"] <= 0
+    )
 
 
 class ProcessAcceptedInitiativesSUF(StateUpdateFunction):
-    """SUF for handling initiative acceptance."""
+    """
+    SUF for handling initiative acceptance.
+
+    Only initiatives with a lock started this epoch are checked, unless
+    requires_exhaustive_acceptance says otherwise. The first timestep of a
+    run checks every initiative, since the initial state may hold
+    initiatives that are already over the threshold. So does the first
+    timestep after start_timestep, the timestep a resumed run starts from,
+    since the resumed run may have lowered the threshold.
+    """
 
     def execute(
         self,
@@ -97,13 +128,24 @@ class ProcessAcceptedInitiativesSUF(StateUpdateFunction):
         acceptance_threshold = params["acceptance_threshold"]
 
         newly_accepted_initiatives_this_step: Set[str] = set()
+        # The accepted set is shared with previous_state, so add to an evolver
+        state.accepted_initiatives = as_persistent_set(state.accepted_initiatives).evolver()
+
+        first_timestep = previous_state.get("timestep", 0) <= params.get("start_timestep", 0) + 1
+        if requires_exhaustive_acceptance(params) or first_timestep:
+            candidates = list(state.initiatives)
+        else:
+            candidates = list(
+                dict.fromkeys(key[1] for key in state.locks.started(state.current_epoch))
+            )
 
         # Check for Initiative Acceptance
-        for init_id, initiative in list(state.initiatives.items()):
+        for init_id in candidates:
             if (
                 init_id not in state.accepted_initiatives
                 and init_id not in state.expired_initiatives
             ):
+                initiative = state.initiatives[init_id]
                 if initiative.weight >= acceptance_threshold:
                     state.accepted_initiatives.add(init_id)
                     newly_accepted_initiatives_this_step.add(init_id)
@@ -120,7 +162,7 @@ class ProcessAcceptedInitiativesSUF(StateUpdateFunction):
                 f"{len(newly_accepted_initiatives_this_step)} initiatives accepted this epoch",
             )
 
-        return ("accepted_initiatives", state.accepted_initiatives)
+        return ("accepted_initiatives", state.accepted_initiatives.persistent())
 
 
 class ProcessExpiredInitiativesSUF(StateUpdateFunction):
@@ -144,6 +186,7 @@ class ProcessExpiredInitiativesSUF(StateUpdateFunction):
         )
 
         newly_expired_initiatives = []
+        state.expired_initiatives = as_persistent_set(state.expired_initiatives).evolver()
 
         # Check for Initiative Expiration (Inactivity)
         for init_id, initiative in list(state.initiatives.items()):
@@ -152,7 +195,7 @@ class ProcessExpiredInitiativesSUF(StateUpdateFunction):
                 and init_id not in state.expired_initiatives
             ):
                 # Check if initiative still has any active support
-                has_active_support = any(s.initiative_id == init_id for s in state.locks.values())
+                has_active_support = state.locks.count(init_id) > 0
                 epochs_since_last_support = state.current_epoch - initiative.last_support_epoch
 
                 log_action(
@@ -177,7 +220,7 @@ class ProcessExpiredInitiativesSUF(StateUpdateFunction):
                 f"{len(newly_expired_initiatives)} initiatives expired this epoch",
             )
 
-        return ("expired_initiatives", state.expired_initiatives)
+        return ("expired_initiatives", state.expired_initiatives.persistent())
 
 
 # Create function-based SUFs for cadCAD compatibility
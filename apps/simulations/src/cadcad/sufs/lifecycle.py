@@ -4,192 +4,105 @@ Lifecycle State Update Functions (SUFs).
 This module contains SUFs that handle initiative and support lifecycles:
 - Token unlocking for accepted initiatives and expired supports
 - Support removal for completed lifecycles
+
+The unlock set is computed once per block from the lock indexes (see
+collect_unlocks), and the balance credits, supply deltas and lock removals
+are all derived from it.
 """
 
 from typing import Dict, List, Any, Tuple
 
-from .base import StateUpdateFunction, log_action, create_suf
+from .base import BlockTransactionSUF, create_transaction_sufs, log_action
+from ..persistent import as_persistent_map
+from ..state import State
 
+# State variables written by the lifecycle block
+LIFECYCLE_VARIABLES = (
+    "balances",
+    "circulating_supply",
+    "locked_supply",
+    "locks",
+)
 
-class ProcessSupportLifecycleBalancesSUF(StateUpdateFunction):
-    """SUF for handling token unlocking for accepted initiatives and expired supports."""
 
-    def execute(
-        self,
-        params: Dict[str, Any],
-        substep: int,
-        state_history: List[Dict[str, Any]],
-        previous_state: Dict[str, Any],
-        policy_input: Dict[str, Any],
-    ) -> Tuple[str, Any]:
-        state = self.get_state_obj(previous_state)
-        acceptance_threshold = params["acceptance_threshold"]
+def collect_unlocks(state: State) -> List[Tuple[str, str]]:
+    """
+    Return the keys of locks released this epoch.
 
-        total_unlocked = 0
+    A lock is released if its initiative was accepted or, otherwise, if it
+    has reached its expiry epoch. Locks of accepted initiatives come first,
+    grouped by initiative, followed by expired locks in lock order. Only
+    the locks found through the initiative and expiry indexes are visited.
+    """
+    accepted = state.accepted_initiatives
 
-        # 1. Unlock tokens for accepted initiatives
-        for init_id in state.accepted_initiatives:
-            # Unlock all tokens for this accepted initiative
-            for sup_key, support_obj in list(state.locks.items()):
-                if support_obj.initiative_id == init_id:
-                    state.balances[support_obj.user_id] = (
-                        state.balances.get(support_obj.user_id, 0) + support_obj.amount
-                    )
-                    total_unlocked += support_obj.amount
-
-        # 2. Unlock tokens for expired supports (for non-accepted initiatives)
-        for sup_key, support_obj in list(state.locks.items()):
-            if support_obj.initiative_id not in state.accepted_initiatives:
-                if state.current_epoch >= support_obj.expiry_epoch:
-                    state.balances[support_obj.user_id] = (
-                        state.balances.get(support_obj.user_id, 0) + support_obj.amount
-                    )
-                    total_unlocked += support_obj.amount
+    unlocks = []
+    for init_id in accepted:
+        unlocks.extend(state.locks.by_initiative.get(init_id, ()))
+    expired = [
+        sup_key
+        for sup_key in state.locks.expiring(state.current_epoch)
+        if sup_key[1] not in accepted
+    ]
+    return unlocks + expired
 
-        if total_unlocked > 0:
-            log_action(
-                state.current_epoch,
-                "unlock",
-                f"Unlocked {total_unlocked} tokens from lifecycle processing",
-            )
 
-        return ("balances", state.balances)
+class ProcessSupportLifecycleSUF(BlockTransactionSUF):
+    """SUF for unlocking tokens of accepted initiatives and expired supports."""
 
+    VARIABLES = LIFECYCLE_VARIABLES
 
-class ProcessSupportLifecycleCirculatingSupplySUF(StateUpdateFunction):
-    """SUF for handling circulating supply updates for accepted initiatives and expired supports."""
-
-    def execute(
-        self,
+    @classmethod
+    def compute(
+        cls,
         params: Dict[str, Any],
-        substep: int,
-        state_history: List[Dict[str, Any]],
         previous_state: Dict[str, Any],
         policy_input: Dict[str, Any],
-    ) -> Tuple[str, Any]:
-        state = self.get_state_obj(previous_state)
-        acceptance_threshold = params["acceptance_threshold"]
+    ) -> Dict[str, Any]:
+        state = cls.get_state_obj(previous_state)
+        unlocks = collect_unlocks(state)
 
+        balances = as_persistent_map(state.balances).evolver()
         total_unlocked = 0
-
-        # 1. Unlock tokens for accepted initiatives
-        for init_id in state.accepted_initiatives:
-            # Unlock all tokens for this accepted initiative
-            for sup_key, support_obj in list(state.locks.items()):
-                if support_obj.initiative_id == init_id:
-                    state.circulating_supply += support_obj.amount
-                    total_unlocked += support_obj.amount
-
-        # 2. Unlock tokens for expired supports (for non-accepted initiatives)
-        for sup_key, support_obj in list(state.locks.items()):
-            if support_obj.initiative_id not in state.accepted_initiatives:
-                if state.current_epoch >= support_obj.expiry_epoch:
-                    state.circulating_supply += support_obj.amount
-                    total_unlocked += support_obj.amount
+        for sup_key in unlocks:
+            # Use original token amount, not weighted amount
+            support_obj = state.locks.pop(sup_key)
+            balances[support_obj.user_id] = (
+                balances.get(support_obj.user_id, 0) + support_obj.amount
+            )
+            total_unlocked += support_obj.amount
 
         if total_unlocked > 0:
             log_action(
                 state.current_epoch,
                 "unlock",
-                f"Added {total_unlocked} tokens back to circulating supply",
+                f"Unlocked {total_unlocked} tokens from lifecycle processing",
             )
-
-        return ("circulating_supply", state.circulating_supply)
-
-
-class ProcessSupportLifecycleLockedSupplySUF(StateUpdateFunction):
-    """SUF for handling locked supply updates when tokens are unlocked."""
-
-    def execute(
-        self,
-        params: Dict[str, Any],
-        substep: int,
-        state_history: List[Dict[str, Any]],
-        previous_state: Dict[str, Any],
-        policy_input: Dict[str, Any],
-    ) -> Tuple[str, Any]:
-        state = self.get_state_obj(previous_state)
-        acceptance_threshold = params["acceptance_threshold"]
-
-        total_unlocked = 0
-
-        # 1. Calculate tokens to unlock for accepted initiatives
-        for init_id in state.accepted_initiatives:
-            # Unlock all tokens for this accepted initiative
-            for sup_key, support_obj in list(state.locks.items()):
-                if support_obj.initiative_id == init_id:
-                    # Use original token amount, not weighted amount
-                    total_unlocked += support_obj.amount
-
-        # 2. Calculate tokens to unlock for expired supports (for non-accepted initiatives)
-        for sup_key, support_obj in list(state.locks.items()):
-            if support_obj.initiative_id not in state.accepted_initiatives:
-                if state.current_epoch >= support_obj.expiry_epoch:
-                    # Use original token amount, not weighted amount
-                    total_unlocked += support_obj.amount
-
-        new_locked_supply = max(0, state.locked_supply - total_unlocked)
-
-        if state.locked_supply - total_unlocked < 0:
+        if unlocks:
             log_action(
                 state.current_epoch,
-                "warning",
-                f"Attempted to unlock {total_unlocked} tokens but only {state.locked_supply} were locked. Setting locked_supply to 0.",
+                "process",
+                f"Removed {len(unlocks)} completed supports",
             )
-
-        return ("locked_supply", new_locked_supply)
-
-
-class ProcessSupportLifecycleSupportersSUF(StateUpdateFunction):
-    """SUF for handling support removal for accepted initiatives and expired supports."""
-
-    def execute(
-        self,
-        params: Dict[str, Any],
-        substep: int,
-        state_history: List[Dict[str, Any]],
-        previous_state: Dict[str, Any],
-        policy_input: Dict[str, Any],
-    ) -> Tuple[str, Any]:
-        state = self.get_state_obj(previous_state)
-        acceptance_threshold = params["acceptance_threshold"]
-
-        supports_to_remove = []
-
-        # 1. Remove supports for accepted initiatives
-        for init_id in state.accepted_initiatives:
-            # Remove all supports for this accepted initiative
-            for sup_key, support_obj in list(state.locks.items()):
-                if support_obj.initiative_id == init_id:
-                    supports_to_remove.append(sup_key)
-
-        # 2. Remove expired supports (for non-accepted initiatives)
-        for sup_key, support_obj in list(state.locks.items()):
-            if support_obj.initiative_id not in state.accepted_initiatives:
-                if state.current_epoch >= support_obj.expiry_epoch:
-                    supports_to_remove.append(sup_key)
-
-        # Remove the supports
-        for sup_key in supports_to_remove:
-            if sup_key in state.locks:
-                del state.locks[sup_key]
-
-        if supports_to_remove:
+        if state.locked_supply - total_unlocked < 0:
             log_action(
                 state.current_epoch,
-                "process",
-                f"Removed {len(supports_to_remove)} completed supports",
+                "warning",
+                f"Attempted to unlock {total_unlocked} tokens but only {state.locked_supply} were locked. Setting locked_supply to 0.",
             )
 
-        # Convert dataclass objects to dictionaries for cadCAD compatibility
-        locks_dict = {k: self.to_cadcad_dict(v) for k, v in state.locks.items()}
-        return ("locks", locks_dict)
+        return {
+            "balances": balances.persistent(),
+            "circulating_supply": state.circulating_supply + total_unlocked,
+            "locked_supply": max(0, state.locked_supply - total_unlocked),
+            # Convert dataclass objects to dictionaries for cadCAD compatibility
+            "locks": cls.emit("locks", state.locks),
+        }
 
 
 # Create function-based SUFs for cadCAD compatibility
-s_process_support_lifecycle_balances = create_suf(ProcessSupportLifecycleBalancesSUF)
-s_process_support_lifecycle_circulating_supply = create_suf(
-    ProcessSupportLifecycleCirculatingSupplySUF
-)
-s_process_support_lifecycle_locked_supply = create_suf(ProcessSupportLifecycleLockedSupplySUF)
-s_process_support_lifecycle_supporters = create_suf(ProcessSupportLifecycleSupportersSUF)
+lifecycle_sufs = create_transaction_sufs(ProcessSupportLifecycleSUF)
+s_process_support_lifecycle_balances = lifecycle_sufs["balances"]
+s_process_support_lifecycle_circulating_supply = lifecycle_sufs["circulating_supply"]
+s_process_support_lifecycle_locked_supply = lifecycle_sufs["locked_supply"]
+s_process_support_lifecycle_supporters = lifecycle_sufs["locks"]
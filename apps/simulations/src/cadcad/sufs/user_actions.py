@@ -1,234 +1,179 @@
 """
 User action State Update Functions (SUFs).
 
-This module contains SUFs that handle user-initiated actions:
+This module contains the SUFs that handle user-initiated actions:
 - Initiative creation
 - Initiative support
 - Balance updates from user actions
-- Circulating supply updates from user actions
+- Circulating and locked supply updates from user actions
+
+All five state variables are produced by a single transactional pass over
+the policy's actions (see apply_user_actions). Each action is validated
+once against the running balance and applied atomically, so the variables
+always agree about which actions were accepted.
 """
 
 import uuid
-from typing import Dict, List, Any, Tuple
-
-from .base import StateUpdateFunction, log_action, create_suf
-from ..state import Initiative, Support
-
-
-class ApplyUserActionsInitiativesSUF(StateUpdateFunction):
-    """SUF for applying user actions that affect initiatives."""
-
-    def execute(
-        self,
-        params: Dict[str, Any],
-        substep: int,
-        state_history: List[Dict[str, Any]],
-        previous_state: Dict[str, Any],
-        policy_input: Dict[str, Any],
-    ) -> Tuple[str, Any]:
-        state = self.get_state_obj(previous_state)
-        actions = policy_input.get("user_actions", [])
-
-        for action in actions:
-            action_type = action.get("type")
-            user_id = action.get("user_id")
-
+from copy import copy
+from typing import Dict, Iterator, List, Any, Optional, Tuple, Union
+
+from .base import BlockTransactionSUF, create_transaction_sufs, log_action
+from ..persistent import as_persistent_map
+from ..policies import UserActionBatch
+from ..state import State, Initiative, Support
+
+# State variables written by the user actions block
+USER_ACTION_VARIABLES = (
+    "initiatives",
+    "locks",
+    "balances",
+    "circulating_supply",
+    "locked_supply",
+)
+
+
+def _action_rows(
+    actions: Union[List[Dict[str, Any]], UserActionBatch],
+) -> Iterator[Tuple[Any, ...]]:
+    """
+    Yield (type, user_id, initiative_id, amount, lock_duration_epochs, title,
+    description) for each action, from either policy output layout.
+    """
+    if isinstance(actions, UserActionBatch):
+        for action_type, user_id, initiative_id, amount, duration in actions.rows():
+            title: Optional[str] = None
+            description: Optional[str] = None
             if action_type == "create_initiative":
-                creation_stake = params["initiative_creation_stake"]
-                if state.balances.get(user_id, 0) >= creation_stake:
-                    new_initiative_id = str(uuid.uuid4())
-                    initiative = Initiative(
-                        id=new_initiative_id,
-                        title=action.get("title", "Untitled Initiative"),
-                        description=action.get("description", ""),
-                        created_at=state.current_time,
-                        last_support_epoch=state.current_epoch,
-                    )
-                    state.initiatives[new_initiative_id] = initiative
-                    log_action(
-                        state.current_epoch,
-                        "create",
-                        f"User {user_id} created initiative '{initiative.title}' (ID: {new_initiative_id[:8]}...)",
-                    )
-
-        # Convert dataclass objects to dictionaries for cadCAD compatibility
-        initiatives_dict = {k: self.to_cadcad_dict(v) for k, v in state.initiatives.items()}
-        log_action(
-            state.current_epoch,
-            "process",
-            f"Total initiatives after creation: {len(initiatives_dict)}",
+                title, description = actions.describe(user_id)
+            yield action_type, user_id, initiative_id, amount, duration, title, description
+        return
+
+    for action in actions:
+        yield (
+            action.get("type"),
+            action.get("user_id"),
+            action.get("initiative_id"),
+            action.get("amount"),
+            action.get("lock_duration_epochs"),
+            action.get("title", "Untitled Initiative"),
+            action.get("description", ""),
         )
-        return ("initiatives", initiatives_dict)
-
-
-class ApplyUserActionsSupportersSUF(StateUpdateFunction):
-    """SUF for applying user actions that affect supporters."""
-
-    def execute(
-        self,
-        params: Dict[str, Any],
-        substep: int,
-        state_history: List[Dict[str, Any]],
-        previous_state: Dict[str, Any],
-        policy_input: Dict[str, Any],
-    ) -> Tuple[str, Any]:
-        state = self.get_state_obj(previous_state)
-        actions = policy_input.get("user_actions", [])
-
-        for action in actions:
-            action_type = action.get("type")
-            user_id = action.get("user_id")
-
-            if action_type == "support_initiative":
-                initiative_id = action.get("initiative_id")
-                amount = action.get("amount")
-                lock_duration_epochs = action.get("lock_duration_epochs")
-
-                if initiative_id in state.initiatives and state.balances.get(user_id, 0) >= amount:
-                    support_key = (user_id, initiative_id)
-                    support = Support(
-                        user_id=user_id,
-                        initiative_id=initiative_id,
-                        amount=amount,
-                        lock_duration_epochs=lock_duration_epochs,
-                        start_epoch=state.current_epoch,
-                    )
-                    state.locks[support_key] = support
-                    log_action(
-                        state.current_epoch,
-                        "support",
-                        f"User {user_id} supported initiative {initiative_id[:8]}... with {amount:.1f} tokens for {lock_duration_epochs} epochs",
-                    )
-
-                    # Update initiative's last support epoch
-                    if initiative_id in state.initiatives:
-                        state.initiatives[initiative_id].last_support_time = state.current_time
-                        state.initiatives[initiative_id].last_support_epoch = state.current_epoch
-
-        # Convert dataclass objects to dictionaries for cadCAD compatibility
-        locks_dict = {k: self.to_cadcad_dict(v) for k, v in state.locks.items()}
-        log_action(
-            state.current_epoch,
-            "process",
-            f"Total locks after actions: {len(locks_dict)}",
-        )
-        return ("locks", locks_dict)
-
-
-class ApplyUserActionsBalancesSUF(StateUpdateFunction):
-    """SUF for applying user actions that affect balances."""
 
-    def execute(
-        self,
-        params: Dict[str, Any],
-        substep: int,
-        state_history: List[Dict[str, Any]],
-        previous_state: Dict[str, Any],
-        policy_input: Dict[str, Any],
-    ) -> Tuple[str, Any]:
-        state = self.get_state_obj(previous_state)
-        actions = policy_input.get("user_actions", [])
-
-        for action in actions:
-            action_type = action.get("type")
-            user_id = action.get("user_id")
-
-            if action_type == "create_initiative":
-                creation_stake = params["initiative_creation_stake"]
-                if state.balances.get(user_id, 0) >= creation_stake:
-                    state.balances[user_id] -= creation_stake
-                    log_action(
-                        state.current_epoch,
-                        "process",
-                        f"Deducted {creation_stake} tokens from user {user_id} for initiative creation",
-                    )
-
-            elif action_type == "support_initiative":
-                initiative_id = action.get("initiative_id")
-                amount = action.get("amount")
-
-                if initiative_id in state.initiatives and state.balances.get(user_id, 0) >= amount:
-                    state.balances[user_id] -= amount
-                    log_action(
-                        state.current_epoch,
-                        "process",
-                        f"Locked {amount} tokens from user {user_id} for supporting initiative",
-                    )
-
-        return ("balances", state.balances)
-
-
-class ApplyUserActionsCirculatingSupplySUF(StateUpdateFunction):
-    """SUF for applying user actions that affect circulating supply."""
-
-    def execute(
-        self,
-        params: Dict[str, Any],
-        substep: int,
-        state_history: List[Dict[str, Any]],
-        previous_state: Dict[str, Any],
-        policy_input: Dict[str, Any],
-    ) -> Tuple[str, Any]:
-        state = self.get_state_obj(previous_state)
-        actions = policy_input.get("user_actions", [])
 
-        total_locked = 0
-        for action in actions:
-            action_type = action.get("type")
-            user_id = action.get("user_id")
-
-            if action_type == "support_initiative":
-                initiative_id = action.get("initiative_id")
-                amount = action.get("amount")
-
-                if initiative_id in state.initiatives and state.balances.get(user_id, 0) >= amount:
-                    total_locked += amount
+def apply_user_actions(
+    state: State,
+    params: Dict[str, Any],
+    actions: Union[List[Dict[str, Any]], UserActionBatch],
+) -> State:
+    """
+    Apply user actions to state in a single pass.
+
+    actions is either a list of action dicts or a columnar UserActionBatch.
+    Mutates and returns state. An action is applied only if it is valid
+    against the state left by the actions before it:
+    - create_initiative requires the creation stake, which is deducted
+    - support_initiative requires an existing initiative and enough balance;
+      the amount moves from the user's balance into locked supply
+    """
+    creation_stake = params["initiative_creation_stake"]
+
+    for (
+        action_type,
+        user_id,
+        initiative_id,
+        amount,
+        lock_duration_epochs,
+        title,
+        description,
+    ) in _action_rows(actions):
+        balance = state.balances.get(user_id, 0)
+
+        if action_type == "create_initiative":
+            if balance < creation_stake:
+                continue
+            new_initiative_id = str(uuid.uuid4())
+            initiative = Initiative(
+                id=new_initiative_id,
+                title=title,
+                description=description,
+                created_at=state.current_time,
+                last_support_time=state.current_time,
+                last_support_epoch=state.current_epoch,
+            )
+            state.initiatives[new_initiative_id] = initiative
+            state.balances[user_id] = balance - creation_stake
+            log_action(
+                state.current_epoch,
+                "create",
+                f"User {user_id} created initiative '{initiative.title}' (ID: {new_initiative_id[:8]}...)",
+            )
 
-        new_circulating_supply = state.circulating_supply - total_locked
-        if total_locked > 0:
+        elif action_type == "support_initiative":
+            if initiative_id not in state.initiatives or balance < amount:
+                continue
+            state.locks[(user_id, initiative_id)] = Support(
+                user_id=user_id,
+                initiative_id=initiative_id,
+                amount=amount,
+                lock_duration_epochs=lock_duration_epochs,
+                start_epoch=state.current_epoch,
+            )
+            state.balances[user_id] = balance - amount
+            state.circulating_supply -= amount
+            state.locked_supply += amount
+
+            # Initiatives may be shared with other states, so update a copy
+            initiative = copy(state.initiatives[initiative_id])
+            state.initiatives[initiative_id] = initiative
+            initiative.last_support_time = state.current_time
+            initiative.last_support_epoch = state.current_epoch
             log_action(
                 state.current_epoch,
-                "process",
-                f"Locked {total_locked} tokens, new circulating supply: {new_circulating_supply}",
+                "support",
+                f"User {user_id} supported initiative {initiative_id[:8]}... with {amount:.1f} tokens for {lock_duration_epochs} epochs",
             )
 
-        return ("circulating_supply", new_circulating_supply)
+    return state
 
 
-class ApplyUserActionsLockedSupplySUF(StateUpdateFunction):
-    """SUF for applying user actions that affect locked supply."""
+class ApplyUserActionsSUF(BlockTransactionSUF):
+    """SUF for applying user actions to all five user action variables."""
 
-    def execute(
-        self,
+    VARIABLES = USER_ACTION_VARIABLES
+
+    @classmethod
+    def compute(
+        cls,
         params: Dict[str, Any],
-        substep: int,
-        state_history: List[Dict[str, Any]],
         previous_state: Dict[str, Any],
         policy_input: Dict[str, Any],
-    ) -> Tuple[str, Any]:
-        state = self.get_state_obj(previous_state)
+    ) -> Dict[str, Any]:
+        state = cls.get_state_obj(previous_state)
+        # get_state_obj shares the balances with previous_state, so write
+        # through an evolver that copies only the entries it changes
+        state.balances = as_persistent_map(state.balances).evolver()
         actions = policy_input.get("user_actions", [])
-
-        total_locked = 0
-        for action in actions:
-            action_type = action.get("type")
-            user_id = action.get("user_id")
-
-            if action_type == "support_initiative":
-                initiative_id = action.get("initiative_id")
-                amount = action.get("amount")
-
-                if initiative_id in state.initiatives and state.balances.get(user_id, 0) >= amount:
-                    total_locked += amount
-
-        new_locked_supply = state.locked_supply + total_locked
-
-        return ("locked_supply", new_locked_supply)
+        apply_user_actions(state, params, actions)
+
+        result = {
+            "initiatives": cls.emit("initiatives", state.initiatives),
+            "locks": cls.emit("locks", state.locks),
+            "balances": state.balances.persistent(),
+            "circulating_supply": state.circulating_supply,
+            "locked_supply": state.locked_supply,
+        }
+        log_action(
+            state.current_epoch,
+            "process",
+            f"Applied {len(actions)} user actions: {len(result['initiatives'])} initiatives, {len(result['locks'])} locks",
+        )
+        return result
 
 
 # Create function-based SUFs for cadCAD compatibility
-s_apply_user_actions_initiatives = create_suf(ApplyUserActionsInitiativesSUF)
-s_apply_user_actions_supporters = create_suf(ApplyUserActionsSupportersSUF)
-s_apply_user_actions_balances = create_suf(ApplyUserActionsBalancesSUF)
-s_apply_user_actions_circulating_supply = create_suf(ApplyUserActionsCirculatingSupplySUF)
-s_apply_user_actions_locked_supply = create_suf(ApplyUserActionsLockedSupplySUF)
+user_action_sufs = create_transaction_sufs(ApplyUserActionsSUF)
+s_apply_user_actions_initiatives = user_action_sufs["initiatives"]
+s_apply_user_actions_supporters = user_action_sufs["locks"]
+s_apply_user_actions_balances = user_action_sufs["balances"]
+s_apply_user_actions_circulating_supply = user_action_sufs["circulating_supply"]
+s_apply_user_actions_locked_supply = user_action_sufs["locked_supply"]
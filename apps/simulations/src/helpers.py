@@ -1,5 +1,6 @@
 import json
 import os
+from collections.abc import Mapping, Set as AbstractSet
 from datetime import datetime
 
 from cadcad.helpers import results_to_dataframe
@@ -23,13 +24,15 @@ def save_simulation_results(results, initial_state, output_dir="results"):
     def json_serializer(obj):
         if isinstance(obj, datetime):
             return obj.isoformat()
-        elif isinstance(obj, set):
+        elif isinstance(obj, AbstractSet):
             return list(obj)
+        elif isinstance(obj, Mapping):
+            return dict(obj.items())
         raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
 
     # Convert tuple keys to strings for JSON compatibility
     def convert_tuple_keys(data):
-        if isinstance(data, dict):
+        if isinstance(data, Mapping):
             new_dict = {}
             for key, value in data.items():
                 if isinstance(key, tuple):
@@ -7,8 +7,9 @@ to test governance system properties across different configurations.
 
 import json
 import os
+import random
 import time
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from datetime import datetime
 from typing import Dict, List, Any, Optional, Tuple, Iterator
 from concurrent.futures import ProcessPoolExecutor, as_completed
@@ -16,9 +17,13 @@ import itertools
 import numpy as np
 import pandas as pd
 
-from cadcad.model import run_simulation
+from cadcad.convergence import run_until_steady, steady_state_detector
+from cadcad.model import run_simulation, simulation_parameters
+from cadcad.native.batched import run_batched_simulation
 from cadcad.state import generate_initial_state
 from cadcad.helpers import results_to_dataframe
+from cadcad.retention import HistoryRetention
+from cadcad.simulation import Simulation
 from supply import TokenDistributionGenerator
 from .metrics import GovernanceMetrics
 
@@ -52,6 +57,25 @@ class ExperimentConfig:
     parallel_execution: bool = True
     max_workers: Optional[int] = None
 
+    # Run the Monte Carlo replicas of each configuration as one batched
+    # array simulation (cadcad.native.batched) instead of one run each.
+    # Configurations selecting a mode the batch does not implement fail.
+    batched_monte_carlo: bool = False
+
+    # Stop each run once it reaches a steady state (cadcad.convergence),
+    # with steady_state_options passed to steady_state_detector. Batched
+    # runs always run to num_epochs.
+    early_stopping: bool = False
+    steady_state_options: Dict[str, Any] = field(default_factory=dict)
+
+    # Parameters in late_parameters take effect only after burn_in_epochs,
+    # before which the model defaults apply. Configurations that differ
+    # only in them share one simulated burn-in, checkpointed and forked
+    # into each configuration (cadcad.checkpoint). Not used with batched
+    # runs or early stopping.
+    burn_in_epochs: int = 0
+    late_parameters: List[str] = field(default_factory=list)
+
 
 class ExperimentRunner:
     """Main class for running comprehensive statistical experiments."""
@@ -90,6 +114,77 @@ class ExperimentRunner:
 
         return experiment_matrix
 
+    def _simulation_parameters(self, experiment: Dict[str, Any]) -> Dict[str, Any]:
+        """Build simulation parameters with the experiment's parameters applied."""
+        sim_params = dict(simulation_parameters)
+        sim_params["M"] = {**simulation_parameters["M"], **experiment["parameters"]}
+        return sim_params
+
+    def _generate_initial_state(self, experiment: Dict[str, Any]) -> Dict[str, Any]:
+        """Generate the initial state for an experiment's token distribution."""
+        initial_state = self.distribution_generator.generate_state(
+            num_users=self.config.num_users,
+            total_supply=self.config.total_supply,
+            distribution_config=experiment["distribution_config"],
+            random_seed=experiment["random_seed"],
+        )
+
+        # Update initial state with experiment parameters
+        initial_state.update(experiment["parameters"])
+        return initial_state
+
+    def _experiment_result(
+        self,
+        experiment: Dict[str, Any],
+        results: List[Dict[str, Any]],
+        execution_time: float,
+        stop_epoch: Optional[int] = None,
+        stop_reason: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Calculate metrics for a finished run and package the result.
+
+        stop_epoch and stop_reason record an early stop at a steady state.
+        """
+        df = results_to_dataframe(results)
+        metrics = self.metrics_calculator.calculate_all_metrics(results, df)
+
+        result = {
+            "experiment_id": experiment["experiment_id"],
+            "run_id": experiment["run_id"],
+            "parameters": experiment["parameters"],
+            "distribution_config": experiment["distribution_config"],
+            "metrics": metrics,
+            "execution_time": execution_time,
+            "stop_epoch": stop_epoch,
+            "stop_reason": stop_reason,
+            "success": True,
+            "error": None,
+        }
+
+        if self.config.save_raw_data:
+            result["raw_results"] = results
+            result["dataframe"] = df.to_dict("records")
+
+        return result
+
+    def _failed_result(
+        self, experiment: Dict[str, Any], execution_time: float, error: Exception
+    ) -> Dict[str, Any]:
+        """Package a failed run."""
+        return {
+            "experiment_id": experiment["experiment_id"],
+            "run_id": experiment["run_id"],
+            "parameters": experiment["parameters"],
+            "distribution_config": experiment["distribution_config"],
+            "metrics": {},
+            "execution_time": execution_time,
+            "stop_epoch": None,
+            "stop_reason": None,
+            "success": False,
+            "error": str(error),
+        }
+
     def run_single_experiment(self, experiment: Dict[str, Any]) -> Dict[str, Any]:
         """Run a single experiment configuration."""
         start_time = time.time()
@@ -98,53 +193,160 @@ class ExperimentRunner:
         np.random.seed(experiment["random_seed"])
 
         try:
-            # Generate initial state with specified distribution
-            initial_state = self.distribution_generator.generate_state(
-                num_users=self.config.num_users,
-                total_supply=self.config.total_supply,
-                distribution_config=experiment["distribution_config"],
-                random_seed=experiment["random_seed"],
+            initial_state = self._generate_initial_state(experiment)
+
+            if self.config.early_stopping:
+                detector = steady_state_detector(**self.config.steady_state_options)
+                results, stop_epoch = run_until_steady(
+                    initial_state,
+                    num_epochs=self.config.num_epochs,
+                    sim_params=self._simulation_parameters(experiment),
+                    detector=detector,
+                )
+                return self._experiment_result(
+                    experiment,
+                    results,
+                    time.time() - start_time,
+                    stop_epoch,
+                    detector.reason,
+                )
+
+            # Run simulation with specified number of epochs
+            results = run_simulation(
+                initial_state=initial_state,
+                num_epochs=self.config.num_epochs,
+                sim_params=self._simulation_parameters(experiment),
             )
 
-            # Update initial state with experiment parameters
-            initial_state.update(experiment["parameters"])
+            return self._experiment_result(experiment, results, time.time() - start_time)
 
-            # Run simulation with specified number of epochs
-            results = run_simulation(initial_state=initial_state, num_epochs=self.config.num_epochs)
-
-            # Calculate metrics
-            df = results_to_dataframe(results)
-            metrics = self.metrics_calculator.calculate_all_metrics(results, df)
-
-            # Prepare result
-            result = {
-                "experiment_id": experiment["experiment_id"],
-                "run_id": experiment["run_id"],
-                "parameters": experiment["parameters"],
-                "distribution_config": experiment["distribution_config"],
-                "metrics": metrics,
-                "execution_time": time.time() - start_time,
-                "success": True,
-                "error": None,
-            }
+        except Exception as e:
+            return self._failed_result(experiment, time.time() - start_time, e)
 
-            if self.config.save_raw_data:
-                result["raw_results"] = results
-                result["dataframe"] = df.to_dict("records")
+    def run_batched_experiment(self, experiments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Run the Monte Carlo replicas of one configuration as a single batch.
 
-            return result
+        Each replica keeps its own initial state and its own random stream;
+        the batch advances all of them together along a leading run axis.
+        """
+        start_time = time.time()
 
+        try:
+            initial_states = [self._generate_initial_state(exp) for exp in experiments]
+            batch = run_batched_simulation(
+                initial_states,
+                num_epochs=self.config.num_epochs,
+                sim_params=self._simulation_parameters(experiments[0]),
+                seed=experiments[0]["random_seed"],
+            )
         except Exception as e:
-            return {
-                "experiment_id": experiment["experiment_id"],
-                "run_id": experiment["run_id"],
-                "parameters": experiment["parameters"],
-                "distribution_config": experiment["distribution_config"],
-                "metrics": {},
-                "execution_time": time.time() - start_time,
-                "success": False,
-                "error": str(e),
-            }
+            return [self._failed_result(exp, time.time() - start_time, e) for exp in experiments]
+
+        execution_time = (time.time() - start_time) / len(experiments)
+        return [
+            self._experiment_result(exp, results, execution_time)
+            for exp, results in zip(experiments, batch)
+        ]
+
+    def _shares_burn_in(self) -> bool:
+        """Whether configurations share a simulated burn-in."""
+        return (
+            self.config.burn_in_epochs > 0
+            and bool(self.config.late_parameters)
+            and not self.config.batched_monte_carlo
+            and not self.config.early_stopping
+        )
+
+    def _burn_in_experiment(self, experiment: Dict[str, Any]) -> Dict[str, Any]:
+        """Return the experiment with its late parameters removed."""
+        early = {
+            name: value
+            for name, value in experiment["parameters"].items()
+            if name not in self.config.late_parameters
+        }
+        return {**experiment, "parameters": early}
+
+    def run_forked_experiments(self, experiments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Run configurations that differ only in late parameters from one burn-in.
+
+        The burn-in is simulated once, with the first experiment's seed and
+        without late parameters, and checkpointed; each experiment then
+        resumes the checkpoint with its own parameters. The forks continue
+        the same random stream, and each result holds the shared burn-in
+        records followed by its own.
+        """
+        start_time = time.time()
+        burn_in = self._burn_in_experiment(experiments[0])
+        np.random.seed(burn_in["random_seed"])
+        random.seed(burn_in["random_seed"])
+
+        try:
+            initial_state = self._generate_initial_state(burn_in)
+            simulation = Simulation(
+                initial_state, self._simulation_parameters(burn_in), self.config.num_epochs
+            )
+            prefix = [simulation.state]
+            for view in itertools.islice(simulation, self.config.burn_in_epochs):
+                prefix.extend(view.records)
+            checkpoint = simulation.checkpoint()
+        except Exception as e:
+            return [self._failed_result(exp, time.time() - start_time, e) for exp in experiments]
+        burn_in_time = (time.time() - start_time) / len(experiments)
+
+        results = []
+        for experiment in experiments:
+            fork_start = time.time()
+            try:
+                # Late parameters join the state as in run_single_experiment
+                state = {**checkpoint.state, **experiment["parameters"]}
+                fork = Simulation.resume(replace(checkpoint, state=state), experiment["parameters"])
+                records = list(prefix)
+                for view in fork:
+                    records.extend(view.records)
+                records = HistoryRetention.from_params(fork.params).apply(records)
+                execution_time = burn_in_time + time.time() - fork_start
+                results.append(self._experiment_result(experiment, records, execution_time))
+            except Exception as e:
+                execution_time = burn_in_time + time.time() - fork_start
+                results.append(self._failed_result(experiment, execution_time, e))
+        return results
+
+    def _group_by_burn_in(self, experiments: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """Group experiments that share a burn-in: same early parameters, distribution and run."""
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        for experiment in experiments:
+            key = json.dumps(
+                [
+                    self._burn_in_experiment(experiment)["parameters"],
+                    experiment["distribution_config"],
+                    experiment["run_id"],
+                ],
+                sort_keys=True,
+                default=str,
+            )
+            groups.setdefault(key, []).append(experiment)
+        return list(groups.values())
+
+    def _group_monte_carlo_runs(
+        self, experiments: List[Dict[str, Any]]
+    ) -> List[List[Dict[str, Any]]]:
+        """Group the experiment matrix into one list of replicas per configuration."""
+        groups: List[List[Dict[str, Any]]] = []
+        for experiment in experiments:
+            if experiment["run_id"] == 0 or not groups:
+                groups.append([])
+            groups[-1].append(experiment)
+        return groups
+
+    def _run_task(self, task: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Run one unit of work: a batch of replicas, a burn-in group or a single experiment."""
+        if self.config.batched_monte_carlo:
+            return self.run_batched_experiment(task)
+        if self._shares_burn_in():
+            return self.run_forked_experiments(task)
+        return [self.run_single_experiment(experiment) for experiment in task]
 
     def run_experiments(self) -> pd.DataFrame:
         """Run all experiments and return results as DataFrame."""
@@ -162,8 +364,29 @@ class ExperimentRunner:
         print(f"   - Token distributions: {len(self.config.token_distributions)}")
         print(f"   - Monte Carlo runs per config: {self.config.num_monte_carlo_runs}")
 
+        if self.config.batched_monte_carlo:
+            tasks = self._group_monte_carlo_runs(experiments)
+            print(f"📦 Batching Monte Carlo runs into {len(tasks)} array simulations")
+        elif self._shares_burn_in():
+            tasks = self._group_by_burn_in(experiments)
+            print(
+                f"🌱 Sharing {self.config.burn_in_epochs}-epoch burn-ins across {len(tasks)} groups"
+            )
+        else:
+            tasks = [[experiment] for experiment in experiments]
+
         start_time = time.time()
 
+        def report_progress(completed: int) -> None:
+            elapsed = time.time() - start_time
+            rate = completed / elapsed
+            eta = (total_experiments - completed) / rate if rate > 0 else 0
+            print(
+                f"   Progress: {completed}/{total_experiments} ({completed / total_experiments:.1%}) "
+                f"- Rate: {rate:.1f}/s - ETA: {eta:.0f}s"
+            )
+
+        completed = 0
         if self.config.parallel_execution:
             # Run experiments in parallel
             max_workers = self.config.max_workers or min(32, os.cpu_count() + 4)
@@ -171,40 +394,26 @@ class ExperimentRunner:
 
             with ProcessPoolExecutor(max_workers=max_workers) as executor:
                 # Submit all experiments
-                future_to_experiment = {
-                    executor.submit(self.run_single_experiment, exp): exp for exp in experiments
-                }
+                future_to_task = {executor.submit(self._run_task, task): task for task in tasks}
 
                 # Collect results as they complete
-                completed = 0
-                for future in as_completed(future_to_experiment):
-                    result = future.result()
-                    self.results.append(result)
-                    completed += 1
-
-                    if completed % 10 == 0 or completed == total_experiments:
-                        elapsed = time.time() - start_time
-                        rate = completed / elapsed
-                        eta = (total_experiments - completed) / rate if rate > 0 else 0
-                        print(
-                            f"   Progress: {completed}/{total_experiments} ({completed / total_experiments:.1%}) "
-                            f"- Rate: {rate:.1f}/s - ETA: {eta:.0f}s"
-                        )
+                for future in as_completed(future_to_task):
+                    task_results = future.result()
+                    self.results.extend(task_results)
+                    previous, completed = completed, completed + len(task_results)
+
+                    if completed // 10 > previous // 10 or completed == total_experiments:
+                        report_progress(completed)
         else:
             # Run experiments sequentially
             print("🐌 Running experiments sequentially")
-            for i, experiment in enumerate(experiments):
-                result = self.run_single_experiment(experiment)
-                self.results.append(result)
-
-                if (i + 1) % 10 == 0 or (i + 1) == total_experiments:
-                    elapsed = time.time() - start_time
-                    rate = (i + 1) / elapsed
-                    eta = (total_experiments - i - 1) / rate if rate > 0 else 0
-                    print(
-                        f"   Progress: {i + 1}/{total_experiments} ({(i + 1) / total_experiments:.1%}) "
-                        f"- Rate: {rate:.1f}/s - ETA: {eta:.0f}s"
-                    )
+            for task in tasks:
+                task_results = self._run_task(task)
+                self.results.extend(task_results)
+                previous, completed = completed, completed + len(task_results)
+
+                if completed // 10 > previous // 10 or completed == total_experiments:
+                    report_progress(completed)
 
         total_time = time.time() - start_time
         success_rate = sum(1 for r in self.results if r["success"]) / len(self.results)
@@ -231,6 +440,8 @@ class ExperimentRunner:
                 "run_id": result["run_id"],
                 "success": result["success"],
                 "execution_time": result["execution_time"],
+                "stop_epoch": result.get("stop_epoch"),
+                "stop_reason": result.get("stop_reason"),
                 "error": result["error"],
             }
 
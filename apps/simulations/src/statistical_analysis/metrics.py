@@ -9,6 +9,8 @@ performance, specifically focusing on the four key attributes:
 4. Empowering smaller voting blocks increases inclusivity
 """
 
+from collections.abc import Mapping
+
 import numpy as np
 import pandas as pd
 from typing import Dict, List, Any, Tuple, Optional
@@ -17,6 +19,15 @@ from scipy.stats import entropy
 import warnings
 
 
+def _lock_user(support_key: Any, support_data: Any) -> Optional[str]:
+    """User holding a lock keyed by (user, initiative) or, in a lock ledger, by lock ID."""
+    if isinstance(support_key, tuple):
+        return support_key[0]
+    if isinstance(support_data, Mapping):
+        return support_data.get("user_id")
+    return None
+
+
 class GovernanceMetrics:
     """Calculate comprehensive governance quality metrics."""
 
@@ -92,7 +103,7 @@ class GovernanceMetrics:
         for state in results:
             locks = state.get("locks", {})
             for support_key, support_data in locks.items():
-                if isinstance(support_data, dict):
+                if isinstance(support_data, Mapping):
                     amount = support_data.get("amount", 0)
                     duration = support_data.get("lock_duration_epochs", 0)
 
@@ -101,9 +112,7 @@ class GovernanceMetrics:
                             "amount": amount,
                             "duration": duration,
                             "weight": amount * duration,
-                            "user_id": support_key[0]
-                            if isinstance(support_key, tuple)
-                            else support_key,
+                            "user_id": _lock_user(support_key, support_data),
                         }
                     )
                     support_amounts.append(amount)
@@ -186,8 +195,8 @@ class GovernanceMetrics:
 
             user_locked = {}
             for support_key, support_data in locks.items():
-                if isinstance(support_key, tuple) and isinstance(support_data, dict):
-                    user_id = support_key[0]
+                user_id = _lock_user(support_key, support_data)
+                if user_id is not None and isinstance(support_data, Mapping):
                     amount = support_data.get("amount", 0)
                     user_locked[user_id] = user_locked.get(user_id, 0) + amount
 
@@ -245,8 +254,8 @@ class GovernanceMetrics:
         user_participation = {}
 
         for support_key, support_data in supporters.items():
-            if isinstance(support_key, tuple) and isinstance(support_data, dict):
-                user_id = support_key[0]
+            user_id = _lock_user(support_key, support_data)
+            if user_id is not None and isinstance(support_data, Mapping):
                 weight = support_data.get("current_weight", 0)
                 amount = support_data.get("amount", 0)
 
@@ -331,9 +340,8 @@ class GovernanceMetrics:
             locked_amount = sum(
                 support_data.get("amount", 0)
                 for support_key, support_data in supporters.items()
-                if isinstance(support_key, tuple)
-                and support_key[0] == user_id
-                and isinstance(support_data, dict)
+                if _lock_user(support_key, support_data) == user_id
+                and isinstance(support_data, Mapping)
             )
             total_holdings[user_id] = balance + locked_amount
 
@@ -347,9 +355,10 @@ class GovernanceMetrics:
 
         # Calculate small holder participation rate
         small_holder_participants = set()
-        for support_key in supporters.keys():
-            if isinstance(support_key, tuple) and support_key[0] in small_holders:
-                small_holder_participants.add(support_key[0])
+        for support_key, support_data in supporters.items():
+            user_id = _lock_user(support_key, support_data)
+            if user_id in small_holders:
+                small_holder_participants.add(user_id)
 
         metrics["small_holder_participation"] = (
             len(small_holder_participants) / len(small_holders) if small_holders else 0
@@ -360,8 +369,8 @@ class GovernanceMetrics:
         total_influence = 0
 
         for support_key, support_data in supporters.items():
-            if isinstance(support_key, tuple) and isinstance(support_data, dict):
-                user_id = support_key[0]
+            user_id = _lock_user(support_key, support_data)
+            if user_id is not None and isinstance(support_data, Mapping):
                 weight = support_data.get("current_weight", 0)
                 total_influence += weight
 
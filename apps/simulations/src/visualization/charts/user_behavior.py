@@ -5,6 +5,7 @@ User behavior chart for showing user activity and balance distributions.
 import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
+from collections.abc import Mapping
 from typing import Dict, Any, Tuple
 
 from ..base import ChartBase, ColorPalette, DataProcessor
@@ -33,7 +34,7 @@ class UserBehaviorChart(ChartBase):
         # Extract balance data from the last epoch
         if "balances" in df.columns and len(df) > 0:
             last_balances = df["balances"].iloc[-1]
-            if isinstance(last_balances, dict):
+            if isinstance(last_balances, Mapping):
                 balance_values = list(last_balances.values())
 
                 # Balance distribution histogram
@@ -88,7 +89,7 @@ class UserBehaviorChart(ChartBase):
             len(last_balances)
             if "balances" in df.columns
             and len(df) > 0
-            and isinstance(df["balances"].iloc[-1], dict)
+            and isinstance(df["balances"].iloc[-1], Mapping)
             else 50
         )
         max_supporters = epoch_data["num_supporters"].max() if len(epoch_data) > 0 else 0
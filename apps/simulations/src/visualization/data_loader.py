@@ -7,6 +7,7 @@ and preprocessing them for visualization.
 
 import json
 import pandas as pd
+from collections.abc import Mapping, Set as AbstractSet
 from pathlib import Path
 from typing import Dict, Any, Optional, Tuple, List
 from datetime import datetime
@@ -87,24 +88,24 @@ class SimulationDataLoader:
         # Add initiative counts
         if "initiatives" in df_derived.columns:
             df_derived["num_initiatives"] = df_derived["initiatives"].apply(
-                lambda x: len(x) if isinstance(x, dict) else 0
+                lambda x: len(x) if isinstance(x, Mapping) else 0
             )
 
         # Add supporter counts
         if "locks" in df_derived.columns:
             df_derived["num_locks"] = df_derived["locks"].apply(
-                lambda x: len(x) if isinstance(x, dict) else 0
+                lambda x: len(x) if isinstance(x, Mapping) else 0
             )
 
         # Add accepted/expired counts
         if "accepted_initiatives" in df_derived.columns:
             df_derived["num_accepted"] = df_derived["accepted_initiatives"].apply(
-                lambda x: len(x) if isinstance(x, (list, set)) else 0
+                lambda x: len(x) if isinstance(x, (list, AbstractSet)) else 0
             )
 
         if "expired_initiatives" in df_derived.columns:
             df_derived["num_expired"] = df_derived["expired_initiatives"].apply(
-                lambda x: len(x) if isinstance(x, (list, set)) else 0
+                lambda x: len(x) if isinstance(x, (list, AbstractSet)) else 0
             )
 
         # Add token metrics if total_supply is available
@@ -169,9 +170,9 @@ class SimulationDataLoader:
             epoch = row["current_epoch"]
             initiatives = row.get("initiatives", {})
 
-            if isinstance(initiatives, dict):
+            if isinstance(initiatives, Mapping):
                 for init_id, init_data in initiatives.items():
-                    if isinstance(init_data, dict):
+                    if isinstance(init_data, Mapping):
                         timeline.append(
                             {
                                 "epoch": epoch,
@@ -191,7 +192,7 @@ class SimulationDataLoader:
         for _, row in df.iterrows():
             balances = row.get("balances", {})
 
-            if isinstance(balances, dict):
+            if isinstance(balances, Mapping):
                 for user_id, balance in balances.items():
                     if user_id not in balance_data:
                         balance_data[user_id] = []
@@ -3,6 +3,7 @@ Pytest configuration and shared fixtures for the simulation test suite.
 """
 
 import pytest
+import random
 import tempfile
 import os
 import sys
@@ -42,6 +43,43 @@ def basic_params():
     }
 
 
+@pytest.fixture
+def seeded_initial_state():
+    """Randomized initial state drawn from a fixed seed."""
+    random.seed(7)
+    return generate_initial_state(num_users=15, total_supply=100000, randomize=True)
+
+
+@pytest.fixture
+def make_sim_params():
+    """
+    Fixture providing a factory for short, active simulation parameters.
+
+    The factory takes the number of epochs and overrides of the model
+    parameters, and returns cadCAD simulation parameters.
+    """
+
+    def make(epochs=20, **overrides):
+        return {
+            "T": range(epochs),
+            "N": 1,
+            "M": {
+                "acceptance_threshold": 20000.0,
+                "decay_multiplier": 0.9,
+                "initiative_creation_stake": 10.0,
+                "prob_create_initiative": 0.05,
+                "prob_support_initiative": 0.3,
+                "max_support_tokens_fraction": 0.6,
+                "min_lock_duration_epochs": 3,
+                "max_lock_duration_epochs": 15,
+                "inactivity_period": 8,
+                **overrides,
+            },
+        }
+
+    return make
+
+
 @pytest.fixture
 def temp_output_dir():
     """Fixture providing a temporary directory for test outputs."""
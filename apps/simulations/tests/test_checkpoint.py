@@ -0,0 +1,158 @@
+"""
+Tests for checkpointing, resuming and forking simulation runs.
+"""
+
+import pickle
+import random
+import statistics
+import zlib
+
+import pytest
+from src.cadcad.checkpoint import Checkpoint
+from src.cadcad.persistent import PersistentMap, as_persistent_map
+from src.cadcad.retention import HistoryRetention
+from src.cadcad.simulation import Simulation
+from src.cadcad.state import generate_initial_state
+
+
+@pytest.fixture
+def sim_params(make_sim_params):
+    """Short, active simulation parameters."""
+    return make_sim_params()
+
+
+def _trajectory(views):
+    return [(view["balances"], view["locked_supply"], len(view["locks"])) for view in views]
+
+
+class TestCheckpoint:
+    """Test checkpoint serialization."""
+
+    def test_round_trips_through_bytes_and_files(self, seeded_initial_state, sim_params, tmp_path):
+        """Test that a checkpoint survives serialization, persistent containers included."""
+        random.seed(0)
+        simulation = Simulation(seeded_initial_state, sim_params)
+        simulation.run(5)
+        checkpoint = simulation.checkpoint()
+        path = tmp_path / "run.ckpt"
+        checkpoint.save(str(path))
+        restored = Checkpoint.load(str(path))
+
+        assert restored.timestep == 5
+        assert restored.horizon == 20
+        assert restored.params == sim_params["M"]
+        assert restored.rng_state == checkpoint.rng_state
+        assert restored.state["balances"] == checkpoint.state["balances"]
+        assert isinstance(restored.state["balances"], PersistentMap)
+
+    def test_rejects_unknown_format(self):
+        """Test that a blob from another format version is refused."""
+        data = zlib.compress(pickle.dumps((0, {})))
+        with pytest.raises(ValueError):
+            Checkpoint.from_bytes(data)
+
+    def test_compresses_state(self):
+        """Test that a checkpoint of a large state is smaller than its balances as text."""
+        state = generate_initial_state(num_users=2000, randomize=False)
+        state["balances"] = as_persistent_map(state["balances"])
+        checkpoint = Checkpoint(state, 0, 1, 10, {}, random.getstate())
+
+        assert len(checkpoint.to_bytes()) < len(repr(state["balances"]))
+
+
+class TestResume:
+    """Test resuming and forking from checkpoints."""
+
+    def test_resume_reproduces_uninterrupted_run(self, seeded_initial_state, sim_params):
+        """Test that a resumed run continues exactly as the original did."""
+        random.seed(3)
+        simulation = Simulation(seeded_initial_state, sim_params)
+        simulation.run(8)
+        data = simulation.checkpoint().to_bytes()
+        expected = _trajectory(simulation)
+
+        random.seed(99)
+        resumed = Simulation.resume(Checkpoint.from_bytes(data))
+        assert resumed.timestep == 8
+        views = list(resumed)
+
+        assert [view.timestep for view in views] == list(range(9, 21))
+        assert _trajectory(views) == expected
+
+    def test_resume_leaves_global_random_state_alone(self, seeded_initial_state, sim_params):
+        """Test that a resumed run draws from its own copy of the random state."""
+        random.seed(3)
+        simulation = Simulation(seeded_initial_state, sim_params)
+        simulation.run(4)
+        resumed = Simulation.resume(simulation.checkpoint())
+
+        random.seed(5)
+        before = random.getstate()
+        resumed.run(4)
+        assert random.getstate() == before
+
+    def test_forks_share_random_stream(self, seeded_initial_state, sim_params):
+        """Test that interleaved forks with identical parameters stay identical."""
+        random.seed(11)
+        simulation = Simulation(seeded_initial_state, sim_params)
+        simulation.run(6)
+        checkpoint = simulation.checkpoint()
+
+        first, second, varied = Simulation.fork(
+            checkpoint, [{}, {}, {"prob_support_initiative": 0.0}], num_epochs=14
+        )
+        first_views, second_views = [], []
+        while not first.done:
+            first_views.append(first.step())
+            second_views.append(second.step())
+        varied_views = list(varied)
+
+        assert len(first_views) == 8
+        assert _trajectory(first_views) == _trajectory(second_views)
+        assert varied.params["prob_support_initiative"] == 0.0
+        assert first.params["prob_support_initiative"] == 0.3
+        assert _trajectory(varied_views) != _trajectory(first_views)
+
+    def test_fork_applies_lowered_threshold(self, seeded_initial_state, sim_params):
+        """Test that a fork's lower threshold accepts initiatives already above it."""
+        sim_params["M"]["acceptance_threshold"] = 1e9
+        random.seed(4)
+        simulation = Simulation(seeded_initial_state, sim_params)
+        simulation.run(10)
+        checkpoint = simulation.checkpoint()
+        state = checkpoint.state
+        weights = [
+            initiative.weight
+            for initiative_id, initiative in state["initiatives"].items()
+            if initiative_id not in state["expired_initiatives"]
+        ]
+        threshold = statistics.median(weights)
+
+        lowered, exhaustive = Simulation.fork(
+            checkpoint,
+            [
+                {"acceptance_threshold": threshold},
+                {"acceptance_threshold": threshold, "exhaustive_acceptance": True},
+            ],
+        )
+        accepted = lowered.step().state["accepted_initiatives"]
+
+        assert accepted
+        assert set(accepted) == set(exhaustive.step().state["accepted_initiatives"])
+        assert "start_timestep" not in lowered.checkpoint().params
+
+
+class TestApplyRetention:
+    """Test retention applied after a run."""
+
+    def test_apply_matches_retain_per_timestep(self):
+        """Test that apply keeps what retain keeps of each timestep."""
+        records = [{"timestep": 0, "substep": 0}] + [
+            {"timestep": t, "substep": s} for t in range(1, 6) for s in range(1, 4)
+        ]
+
+        assert HistoryRetention("full").apply(records) is records
+        kept = HistoryRetention("every_k", 2).apply(records)
+        assert sorted({r["timestep"] for r in kept}) == [0, 2, 4, 5]
+        assert HistoryRetention("final").apply(records) == records[-1:]
+        assert len(HistoryRetention("last_substep").apply(records)) == 6
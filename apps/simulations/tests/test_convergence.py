@@ -0,0 +1,110 @@
+"""
+Tests for steady-state detection and early termination.
+"""
+
+import random
+
+import pytest
+from src.cadcad.convergence import (
+    LockedSupplyPlateau,
+    Quiescent,
+    SteadyState,
+    run_until_steady,
+)
+from src.cadcad.simulation import TimestepView
+
+
+def _view(timestep, **state):
+    record = {
+        "current_epoch": timestep,
+        "initiatives": {},
+        "accepted_initiatives": set(),
+        "expired_initiatives": set(),
+        "locks": {},
+        "locked_supply": 0.0,
+        "total_supply": 1000.0,
+        **state,
+    }
+    return TimestepView(1, timestep, (record,))
+
+
+@pytest.fixture
+def sim_params(make_sim_params):
+    """Parameters under which every token ends up locked on unreachable initiatives."""
+    return make_sim_params(
+        300,
+        acceptance_threshold=1e12,
+        prob_create_initiative=0.02,
+        min_lock_duration_epochs=900,
+        max_lock_duration_epochs=1000,
+    )
+
+
+class TestDetectors:
+    """Test the individual steady-state detectors."""
+
+    def test_quiescent_waits_for_decided_initiatives(self):
+        """Test that Quiescent needs initiatives, all decided and unlocked, for a while."""
+        detector = Quiescent(patience=3)
+        assert not any(detector(_view(t)) for t in range(5))
+
+        live = {"initiatives": {"a": {}, "b": {}}, "accepted_initiatives": {"a"}}
+        assert not detector(_view(5, **live))
+        decided = {**live, "expired_initiatives": {"b"}}
+        assert [detector(_view(t, **decided)) for t in range(6, 9)] == [False, False, True]
+        detector.reset()
+        assert not detector(_view(9, **decided))
+
+    def test_plateau_uses_relative_spread(self):
+        """Test that the plateau fires on a flat window of meaningful locked supply."""
+        detector = LockedSupplyPlateau(window=4, tolerance=0.01)
+        assert not any(detector(_view(t, locked_supply=100.0 * t)) for t in range(1, 5))
+        assert [detector(_view(t, locked_supply=500.0)) for t in range(5, 9)] == [
+            False,
+            False,
+            False,
+            True,
+        ]
+        detector.reset()
+        assert not any(detector(_view(t, locked_supply=1e-12)) for t in range(10))
+
+    def test_steady_state_records_reason(self):
+        """Test that SteadyState reports the detector that fired and when."""
+
+        def enough_locked(view):
+            return view["locked_supply"] > 50
+
+        detector = SteadyState(Quiescent(), enough_locked)
+        assert not detector(_view(1, locked_supply=10.0))
+        assert detector(_view(2, locked_supply=60.0))
+        assert (detector.reason, detector.stop_epoch) == ("enough_locked", 2)
+        with pytest.raises(ValueError):
+            SteadyState()
+
+
+class TestRunUntilSteady:
+    """Test early termination of simulation runs."""
+
+    def test_stops_at_plateau(self, seeded_initial_state, sim_params):
+        """Test that a run whose locked supply plateaus stops early at the stop epoch."""
+        detector = SteadyState(LockedSupplyPlateau(window=24, tolerance=0.01))
+        random.seed(1)
+        results, stop_epoch = run_until_steady(
+            seeded_initial_state, sim_params=sim_params, detector=detector
+        )
+
+        assert stop_epoch is not None and stop_epoch < 300
+        assert detector.reason == "locked_supply_plateau"
+        assert results[-1]["current_epoch"] == stop_epoch
+        assert len(results) == 1 + 6 * stop_epoch
+        assert results[-1]["locked_supply"] > 0.9 * seeded_initial_state["circulating_supply"]
+
+    def test_runs_to_horizon_without_stop(self, seeded_initial_state, sim_params):
+        """Test that a detector that never fires leaves the run to the horizon."""
+        sim_params["M"]["history_retention"] = "final"
+        results, stop_epoch = run_until_steady(
+            seeded_initial_state, 40, sim_params, detector=lambda view: False
+        )
+
+        assert stop_epoch is None
+        assert [record["timestep"] for record in results] == [40]
@@ -0,0 +1,59 @@
+"""
+Tests for the mean-field model of aggregate dynamics.
+"""
+
+import numpy as np
+import pytest
+from src.cadcad.meanfield import OUTPUTS, VALIDATED_OUTPUTS, run_mean_field, validate_mean_field
+
+
+@pytest.fixture
+def params(make_sim_params):
+    """Model parameters with fast acceptance and short locks."""
+    return make_sim_params(prob_create_initiative=0.03)["M"]
+
+
+class TestMeanField:
+    """Test the mean-field model and its validation against Monte Carlo."""
+
+    def test_sweep_shapes_and_conservation(self, seeded_initial_state, params):
+        """Test that every output covers every point and supply is conserved."""
+        thresholds = np.linspace(1000, 200000, 50)
+        outputs = run_mean_field(
+            seeded_initial_state, params, 100, sweep={"acceptance_threshold": thresholds}
+        )
+
+        assert set(outputs) == set(OUTPUTS)
+        for series in outputs.values():
+            assert series.shape == (50, 101)
+        created = (
+            outputs["live_initiatives"]
+            + outputs["accepted_initiatives"]
+            + outputs["expired_initiatives"]
+        )
+        assert np.allclose(created[:, 1:], created[0, 1:])
+        total = outputs["locked_supply"] + outputs["circulating_supply"]
+        assert np.allclose(total, total[0, 0])
+        # Higher thresholds accept fewer initiatives
+        assert (np.diff(outputs["accepted_initiatives"][:, -1]) <= 1e-9).all()
+
+    def test_rejects_bad_sweeps(self, seeded_initial_state, params):
+        """Test that sweeps of unequal length or unknown parameters are refused."""
+        with pytest.raises(ValueError):
+            run_mean_field(
+                seeded_initial_state,
+                params,
+                10,
+                sweep={"acceptance_threshold": [1.0, 2.0], "decay_multiplier": [0.9]},
+            )
+        with pytest.raises(ValueError):
+            run_mean_field(seeded_initial_state, params, 10, sweep={"num_users": [10]})
+
+    def test_matches_monte_carlo_acceptance(self, seeded_initial_state, params):
+        """Test that expected acceptances track the native engine's Monte Carlo mean."""
+        report = validate_mean_field(seeded_initial_state, params, 100, runs=10, seed=1)
+
+        assert set(report) == set(VALIDATED_OUTPUTS)
+        accepted = report["accepted_initiatives"]
+        assert accepted["monte_carlo"][-1] > 20
+        assert abs(accepted["relative_error"]) < 0.1
@@ -0,0 +1,644 @@
+"""
+Tests for the native NumPy simulation engine.
+"""
+
+import random
+
+import numpy as np
+import pytest
+from src.cadcad.helpers import results_to_dataframe
+from src.cadcad.model import run_simulation
+from src.cadcad.native import NativeEngine, run_native_simulation
+from src.cadcad.native.actions import (
+    CREATE,
+    SUPPORT,
+    Action,
+    sample_active_epoch_actions,
+    sample_quiet_epochs,
+    sample_sparse_user_actions,
+)
+from src.cadcad.native.batched import run_batched_simulation
+from src.cadcad.native.boards import MultiBoardSimulation, run_multi_board_simulation
+from src.cadcad.native.engine import record_run
+from src.cadcad.native.fixed_point import (
+    PRECISION,
+    DecayCurve,
+    FixedPointLockLedger,
+    FixedPointLockTable,
+    to_units,
+)
+from src.cadcad.native.incentives import (
+    INCENTIVE_RESOLUTION,
+    WAD,
+    IncentivesPool,
+    bucket_multipliers,
+    geometric_linear_interpolation,
+)
+from src.cadcad.native.leaping import (
+    BIAS_METRICS,
+    LeapingEngine,
+    leap_bias_report,
+    run_leaping_simulation,
+)
+from src.cadcad.native.parity import check_parity
+from src.cadcad.native.population import expand_deltas
+from src.cadcad.native.scheduler import DeadlineQueue
+from src.cadcad.native.tables import ACCEPTED, EXPIRED, LIVE, LockLedger, LockTable
+
+
+@pytest.fixture
+def active_params(make_sim_params):
+    """Simulation parameters with enough activity to exercise every PSUB."""
+    return make_sim_params(60, prob_create_initiative=0.03)
+
+
+class TestNativeEngine:
+    """Test the native engine's output and its parity with cadCAD."""
+
+    def test_result_shape_matches_cadcad(self, seeded_initial_state, active_params):
+        """Test that records carry the same keys and count as cadCAD results."""
+        results = run_native_simulation(seeded_initial_state, sim_params=active_params)
+
+        assert len(results) == 1 + 60 * 6
+        assert results[0]["timestep"] == 0
+        assert results[-1]["timestep"] == 60
+        assert results[-1]["substep"] == 6
+        for key in seeded_initial_state:
+            assert key in results[-1]
+
+    def test_engine_selection(self, seeded_initial_state, active_params):
+        """Test that run_simulation dispatches to the native engine."""
+        results = run_simulation(seeded_initial_state, sim_params=active_params, engine="native")
+        assert len(results) == 1 + 60 * 6
+
+        with pytest.raises(ValueError):
+            run_simulation(seeded_initial_state, sim_params=active_params, engine="unknown")
+
+    def test_monte_carlo_runs_are_tagged(self, seeded_initial_state, active_params):
+        """Test that each Monte Carlo run is returned with its run number."""
+        active_params["N"] = 3
+        results = run_native_simulation(seeded_initial_state, 5, active_params)
+
+        assert len(results) == 3 * (1 + 5 * 6)
+        assert {record["run"] for record in results} == {1, 2, 3}
+
+    @pytest.mark.parametrize("seed", [0, 1, 2])
+    def test_parity_with_cadcad(self, seeded_initial_state, active_params, seed):
+        """Test that the native engine reproduces cadCAD under a fixed seed."""
+        mismatches = check_parity(seeded_initial_state, active_params, seed=seed)
+        assert mismatches == []
+
+    def test_parity_run_has_activity(self, seeded_initial_state, active_params):
+        """Test that the parity configuration exercises acceptance and expiry."""
+        random.seed(0)
+        final = run_native_simulation(seeded_initial_state, sim_params=active_params)[-1]
+
+        assert len(final["initiatives"]) > 0
+        assert len(final["accepted_initiatives"]) + len(final["expired_initiatives"]) > 0
+
+
+class TestBatchedEngine:
+    """Test Monte Carlo runs batched along a leading array axis."""
+
+    def test_batched_result_shape(self, seeded_initial_state, active_params):
+        """Test that every run gets its own timestep records."""
+        results = run_batched_simulation(seeded_initial_state, 20, active_params, runs=4, seed=1)
+
+        assert len(results) == 4
+        for run, run_results in enumerate(results, start=1):
+            assert len(run_results) == 21
+            assert {record["run"] for record in run_results} == {run}
+            assert run_results[-1]["current_epoch"] == 20
+
+    def test_batched_runs_are_independent_and_reproducible(
+        self, seeded_initial_state, active_params
+    ):
+        """Test that runs differ from each other but repeat under the same seed."""
+        first = run_batched_simulation(seeded_initial_state, 30, active_params, runs=3, seed=11)
+        second = run_batched_simulation(seeded_initial_state, 30, active_params, runs=3, seed=11)
+
+        balances = [run_results[-1]["balances"] for run_results in first]
+        assert balances[0] != balances[1]
+        assert balances == [run_results[-1]["balances"] for run_results in second]
+
+    def test_batched_runs_keep_balances_non_negative(self, seeded_initial_state, active_params):
+        """Test that no run spends more than a user's balance."""
+        results = run_batched_simulation(seeded_initial_state, 60, active_params, runs=8, seed=3)
+
+        for run_results in results:
+            for record in run_results:
+                assert min(record["balances"].values()) >= 0
+
+    @pytest.mark.parametrize(
+        "mode",
+        [
+            {"fixed_point": True},
+            {"lock_ledger": True},
+            {"sparse_population": True},
+            {"incentives_budget": 1000.0},
+        ],
+    )
+    def test_batched_runs_refuse_unsupported_modes(self, seeded_initial_state, active_params, mode):
+        """Test that modes the batch does not implement are refused, not ignored."""
+        active_params["M"].update(mode)
+        with pytest.raises(ValueError, match=next(iter(mode))):
+            run_batched_simulation(seeded_initial_state, 5, active_params, runs=2)
+
+
+class TestMultiBoard:
+    """Test boards sharing one holder population."""
+
+    BOARDS = [{}, {"acceptance_threshold": 5000.0}, {"prob_support_initiative": 0.05}]
+
+    def test_workers_do_not_change_results(self, seeded_initial_state, active_params):
+        """Test that boards sharded across processes match boards run in process."""
+        local = run_multi_board_simulation(
+            seeded_initial_state, self.BOARDS, 40, active_params, seed=5
+        )
+        sharded = run_multi_board_simulation(
+            seeded_initial_state, self.BOARDS, 40, active_params, workers=2, seed=5
+        )
+
+        assert len(local) == 41
+        assert [record["timestep"] for record in local] == list(range(41))
+        assert sharded == local
+        boards = local[-1]["boards"]
+        assert [board["board"] for board in boards] == [0, 1, 2]
+        assert boards[0]["initiatives_count"] != boards[2]["initiatives_count"]
+
+    def test_shared_supply_is_conserved(self, seeded_initial_state, active_params):
+        """Test that reservations and releases move tokens without creating any."""
+        params = {**active_params["M"], "lock_ledger": True}
+        stake = params["initiative_creation_stake"]
+        total = sum(seeded_initial_state["balances"].values())
+
+        with MultiBoardSimulation(seeded_initial_state, params, self.BOARDS, seed=3) as simulation:
+            for _ in range(60):
+                record = simulation.step()
+                created = sum(board["initiatives_count"] for board in record["boards"])
+                spent = record["circulating_supply"] + record["locked_supply"] + created * stake
+                assert spent == pytest.approx(total)
+                assert simulation.balances.min() >= 0
+            snapshot = simulation.snapshot(1)
+
+        assert snapshot["balances"] == dict(zip(simulation.user_ids, simulation.balances.tolist()))
+        assert len(snapshot["initiatives"]) == record["boards"][1]["initiatives_count"]
+
+
+class TestAggregateWeights:
+    """Test the running per-initiative aggregate weights."""
+
+    @pytest.mark.parametrize("multiplier", [0.5, 0.999])
+    def test_matches_summed_lock_weights(self, seeded_initial_state, active_params, multiplier):
+        """Test that aggregates track summed lock weights, across rebases."""
+        params = {
+            **active_params["M"],
+            "decay_multiplier": multiplier,
+            "max_lock_duration_epochs": 200,
+            "acceptance_threshold": 1e12,
+        }
+        random.seed(5)
+        engine = NativeEngine(seeded_initial_state, params)
+
+        for _ in range(400):
+            substeps = engine.substeps()
+            next(substeps)
+            next(substeps)
+            expected = np.bincount(
+                engine.locks.view("initiative"),
+                weights=engine.lock_weights(),
+                minlength=len(engine.initiatives),
+            )
+            next(substeps)
+            weights = engine.initiatives.view("weight")
+            assert np.allclose(weights, expected, rtol=1e-9, atol=0)
+            assert (weights[expected == 0] == 0).all()
+            for _ in substeps:
+                pass
+
+        if multiplier == 0.5:
+            assert engine.aggregate.base > 0
+
+
+def _contract_weight(kind, parameter, duration, amount, elapsed):
+    """Lock weight as Signals._calculateLockWeightAt and DecayCurves compute it."""
+    if elapsed >= duration:
+        return amount
+    if kind == "linear":
+        weight = amount * duration - (amount * elapsed * parameter) // PRECISION
+    else:
+        weight = amount * duration
+        for _ in range(elapsed):
+            weight = (weight * parameter) // PRECISION
+    return amount if weight < amount else weight
+
+
+class TestFixedPoint:
+    """Test the fixed-point lock weights against the contracts' arithmetic."""
+
+    @pytest.mark.parametrize(
+        "kind,parameter",
+        [("exponential", 9 * 10**17), ("exponential", 123456789012345678), ("linear", 37 * 10**16)],
+    )
+    @pytest.mark.parametrize("decimals", [6, 18])
+    def test_weights_match_decay_curves(self, kind, parameter, decimals):
+        """Test that vectorized weights truncate exactly as DecayCurves does."""
+        rng = random.Random(0)
+        table = FixedPointLockTable(DecayCurve(kind, parameter), decimals)
+        for user in range(200):
+            table.put(user, 0, rng.uniform(0.1, 1e5), rng.randint(1, 40), rng.randint(0, 20))
+
+        for epoch in range(20, 70, 7):
+            expected = [
+                _contract_weight(kind, parameter, duration, amount, epoch - start)
+                for duration, amount, start in zip(
+                    table.view("duration").tolist(),
+                    [int(units) for units in table.view("units")],
+                    table.view("start").tolist(),
+                )
+            ]
+            assert [int(weight) for weight in table.weights(epoch)] == expected
+        # 18 decimals overflow int64 and switch to Python ints
+        assert table.exact == (decimals == 18 or parameter == 123456789012345678)
+
+    def test_curve_from_params(self):
+        """Test that the multiplier is read as a decimal and its ratio reduced."""
+        curve = DecayCurve.from_params({"decay_multiplier": 0.999})
+        assert curve.parameter == 999 * 10**15
+        assert (curve.numerator, curve.denominator) == (999, 1000)
+        assert DecayCurve.from_params({"decay_curve": "linear"}).parameter == PRECISION
+        with pytest.raises(ValueError):
+            DecayCurve("cubic", PRECISION)
+
+    def test_engine_aggregates_and_accepts_in_base_units(self, seeded_initial_state, active_params):
+        """Test that initiative weights are the summed contract weights of their locks."""
+        params = {**active_params["M"], "fixed_point": True}
+        random.seed(3)
+        engine = NativeEngine(seeded_initial_state, params)
+        threshold = to_units(params["acceptance_threshold"], 18)
+
+        for _ in range(40):
+            substeps = engine.substeps()
+            for _ in range(3):
+                next(substeps)
+            epoch = engine.current_epoch
+            totals = np.zeros(len(engine.initiatives), dtype=object)
+            for initiative, duration, units, start in zip(
+                engine.locks.view("initiative").tolist(),
+                engine.locks.view("duration").tolist(),
+                engine.locks.view("units"),
+                engine.locks.view("start").tolist(),
+            ):
+                totals[initiative] += _contract_weight(
+                    "exponential", 9 * 10**17, duration, int(units), epoch - start
+                )
+            assert [int(weight) for weight in engine.weight_units] == totals.tolist()
+            for _ in substeps:
+                pass
+            assert all(
+                engine.initiatives.status[row] != LIVE
+                for row in range(len(totals))
+                if totals[row] >= threshold
+            )
+        assert (engine.initiatives.view("status") == ACCEPTED).any()
+
+
+class TestLockTable:
+    """Test the (user, initiative) index of the lock table."""
+
+    def test_index_follows_puts_and_removals(self):
+        """Test that find matches a scan of the columns after removals shift rows."""
+        table = LockTable(capacity=2)
+        keys = [(user, initiative) for user in range(5) for initiative in range(3)]
+        for user, initiative in keys:
+            table.put(user, initiative, 10.0, 5, 0)
+        assert table.put(2, 1, 4.0, 3, 1) == table.find(2, 1) == 7
+
+        table.remove(np.array([key[0] == 1 or key == (3, 2) for key in keys]))
+        table.put(1, 1, 4.0, 3, 2, row=table.find(1, 1))
+
+        rows = list(zip(table.view("user").tolist(), table.view("initiative").tolist()))
+        assert table.rows == {key: row for row, key in enumerate(rows)}
+        assert table.find(1, 1) == len(table) - 1
+        assert table.find(1, 0) == table.find(3, 2) == -1
+
+
+class TestLockLedger:
+    """Test the append-only lock ledger against the contracts' lock tokens."""
+
+    def test_ids_and_redeemed_locks(self):
+        """Test that every put mints an ID and redeemed locks stay queryable."""
+        ledger = LockLedger(capacity=2)
+        for user, initiative in [(0, 0), (0, 0), (1, 1), (2, 0)]:
+            ledger.put(user, initiative, 10.0, 5, 0)
+
+        assert ledger.view("lock_id").tolist() == [1, 2, 3, 4]
+        ledger.remove(np.array([False, True, False, False]))
+        ledger.put(1, 0, 4.0, 3, 2)
+
+        assert ledger.view("lock_id").tolist() == [1, 3, 4, 5]
+        assert ledger.row_of(4) == 2
+        assert ledger.row_of(2) == -1
+        assert ledger.lock(2)["withdrawn"]
+        assert ledger.lock(5) == {
+            "lock_id": 5,
+            "user": 1,
+            "initiative": 0,
+            "amount": 4.0,
+            "duration": 3,
+            "start": 2,
+            "expiry": 5,
+            "withdrawn": False,
+        }
+        assert ledger.locks_for_initiative(0) == [1, 2, 4, 5]
+        with pytest.raises(KeyError):
+            ledger.lock(6)
+
+    @pytest.mark.parametrize("fixed_point", [False, True])
+    def test_engine_mints_a_lock_per_support(
+        self, seeded_initial_state, active_params, fixed_point
+    ):
+        """Test that repeated supports add locks, each released at its own expiry."""
+        params = {**active_params["M"], "lock_ledger": True, "fixed_point": fixed_point}
+        engine = NativeEngine(seeded_initial_state, params)
+        assert isinstance(engine.locks, FixedPointLockLedger if fixed_point else LockLedger)
+        balance = engine.balances[1]
+        engine.advance_time()
+        engine.apply_user_actions([Action(CREATE, 0)])
+        engine.apply_user_actions([Action(SUPPORT, 1, 0, 5.0, 2), Action(SUPPORT, 1, 0, 7.0, 4)])
+        engine.decay_and_aggregate()
+
+        records = engine.snapshot()["locks"]
+        assert list(records) == [1, 2]
+        assert records[2]["lock_id"] == 2
+        assert records[2]["amount"] == 7.0
+        assert engine.initiatives.weight[0] == pytest.approx(5.0 * 2 + 7.0 * 4)
+
+        while engine.current_epoch < 3:
+            engine.advance_time()
+            engine.process_lifecycle()
+        assert engine.locks.view("lock_id").tolist() == [2]
+        assert engine.balances[1] == balance - 7.0
+        while engine.current_epoch < 5:
+            engine.advance_time()
+            engine.process_lifecycle()
+        assert len(engine.locks) == 0
+        assert engine.balances[1] == balance
+        assert engine.locks.locks_for_initiative(0) == [1, 2]
+        assert engine.next_deadline(99) == 1 + params["inactivity_period"]
+
+
+class TestIncentives:
+    """Test IncentivesPool credits, buckets and payouts."""
+
+    def test_multipliers_match_incentives_math(self):
+        """Test the WAD interpolation and normalization of bucket multipliers."""
+        assert bucket_multipliers([2 * WAD, WAD], 1) == [WAD]
+        assert bucket_multipliers([2 * WAD, WAD], 2) == [WAD * 2 // 3, WAD // 3]
+        assert bucket_multipliers([2 * WAD, WAD], 5) == [
+            value * WAD // (15 * WAD // 2)
+            for value in (2 * WAD, 7 * WAD // 4, 3 * WAD // 2, 5 * WAD // 4, WAD)
+        ]
+        # int256 division truncates toward zero
+        assert geometric_linear_interpolation(1, 0, 10, 3, 0) == 7
+
+    def test_buckets_halve_once_exhausted(self):
+        """Test that a credit past the last bucket merges buckets pairwise."""
+        pool = IncentivesPool([WAD, WAD], 100.0, 1e9, 1.0)
+        for epoch in range(10, 10 + INCENTIVE_RESOLUTION):
+            pool.credit(0, 0, 1.0, epoch, 1.0, 5)
+        assert pool.last_used[0] == INCENTIVE_RESOLUTION - 1
+        pool.credit(0, 1, 5.0, 10 + INCENTIVE_RESOLUTION, 1.0, 5)
+
+        assert pool.last_used[0] == INCENTIVE_RESOLUTION // 2
+        assert pool.bucket_credits[0, :12].tolist() == [2.0] * 12
+        assert pool.bucket_credits[0, 12] == 5.0
+        assert pool.bucket_ends[0].tolist() == list(range(12, 12 + 2 * INCENTIVE_RESOLUTION, 2))
+
+    def test_settlement_shares_reward_by_bucket(self):
+        """Test that earlier buckets earn more and the budget caps payouts."""
+        pool = IncentivesPool([2 * WAD, WAD], 90.0, 100.0, 1.0)
+        pool.credit(3, 0, 10.0, 0, 1.0, 5)
+        pool.credit(3, 1, 10.0, 1, 1.0, 5)
+        users, paid = pool.settle(3, 2, 20.0)
+
+        assert users.tolist() == [0, 1]
+        assert paid.tolist() == pytest.approx([60.0, 30.0])
+        pool.credit(4, 2, 1.0, 5, 1.0, 5)
+        assert pool.settle(4, 6, 1.0)[1].tolist() == pytest.approx([10.0])
+        assert pool.budget == pytest.approx(0.0)
+        assert len(pool.ledger) == 3
+
+    def test_engine_pays_on_acceptance(self, seeded_initial_state, active_params):
+        """Test that accepted initiatives pay their supporters from the budget."""
+        params = {**active_params["M"], "incentives_budget": 5000.0}
+        random.seed(1)
+        active_params["M"] = params
+        results = run_native_simulation(seeded_initial_state, sim_params=active_params)
+        final = results[-1]
+
+        history = final["reward_history"]
+        assert final["rewards_distributed"] == pytest.approx(5000.0)
+        assert sum(final["reward_earnings"].values()) == pytest.approx(5000.0)
+        assert sum(entry["reward_amount"] for entry in history) == pytest.approx(5000.0)
+        assert {entry["initiative_id"] for entry in history} <= final["accepted_initiatives"]
+        lengths = [len(record["reward_history"]) for record in results]
+        assert lengths == sorted(lengths) and 0 < lengths[len(lengths) // 2] < lengths[-1]
+
+        active_params["M"] = {**params, "incentives_budget": 0.0}
+        random.seed(1)
+        default = run_native_simulation(seeded_initial_state, sim_params=active_params)[-1]
+        assert default["rewards_distributed"] == 0
+        assert default["reward_history"] == []
+
+
+class TestDeadlines:
+    """Test deadline scheduling of lock expiry and initiative inactivity."""
+
+    def test_queue_pops_due_items_in_order(self):
+        """Test that only deadlines at or before the epoch are popped, earliest first."""
+        queue = DeadlineQueue([(5, "b"), (3, "a")])
+        queue.push(9, "c")
+        queue.push(5, "b")
+
+        assert queue.pop_due(2) == []
+        assert queue.pop_due(5) == ["a", "b", "b"]
+        assert queue.next_epoch() == 9
+        assert len(queue) == 1
+
+    def test_support_reschedules_inactivity(self, seeded_initial_state, active_params):
+        """Test that a lock and a later support defer an initiative's expiry."""
+        params = active_params["M"]
+        engine = NativeEngine(seeded_initial_state, params)
+        engine.advance_time()
+        engine.apply_user_actions([Action(CREATE, 0)])
+
+        def run_until(epoch):
+            while engine.current_epoch < epoch:
+                engine.advance_time()
+                engine.process_expired()
+                engine.process_lifecycle()
+
+        run_until(3)
+        engine.apply_user_actions([Action(SUPPORT, 1, 0, 5.0, 2)])
+        # The lock is released at epoch 5; the deadline from the support is 3 + 8
+        run_until(3 + params["inactivity_period"] - 1)
+        assert len(engine.locks) == 0
+        assert engine.initiatives.status[0] == LIVE
+        run_until(3 + params["inactivity_period"])
+        assert engine.initiatives.status[0] == EXPIRED
+
+
+class TestQuietEpochSkipping:
+    """Test jumping between event epochs instead of stepping every epoch."""
+
+    def test_sparse_samplers_match_per_epoch_rates(self, active_params):
+        """Test that quiet gaps and attempts per active epoch have the expected means."""
+        params = {
+            **active_params["M"],
+            "prob_create_initiative": 0.01,
+            "prob_support_initiative": 0.02,
+        }
+        rng = random.Random(3)
+        balances = np.full(20, 100.0)
+        prob_idle = (0.99 * 0.98) ** 20
+
+        gaps = [sample_quiet_epochs(params, 20, rng) for _ in range(20000)]
+        assert np.mean(gaps) == pytest.approx(prob_idle / (1 - prob_idle), rel=0.05)
+
+        live = np.array([0])
+        kinds = [
+            [action.kind for action in sample_active_epoch_actions(params, balances, live, rng)]
+            for _ in range(20000)
+        ]
+        creates = [epoch_kinds.count(CREATE) for epoch_kinds in kinds]
+        supports = [epoch_kinds.count(SUPPORT) for epoch_kinds in kinds]
+        assert np.mean(creates) == pytest.approx(20 * 0.01 / (1 - prob_idle), rel=0.05)
+        assert np.mean(supports) == pytest.approx(20 * 0.02 / (1 - prob_idle), rel=0.05)
+
+    def test_skipping_records_event_timesteps(self, seeded_initial_state, active_params):
+        """Test that skipped runs end on the horizon and only record visited timesteps."""
+        active_params["M"].update(prob_create_initiative=0.002, prob_support_initiative=0.01)
+        random.seed(4)
+        results = run_native_simulation(seeded_initial_state, 200, active_params, True)
+
+        timesteps = [record["timestep"] for record in results if record["substep"] == 1]
+        assert timesteps == sorted(set(timesteps))
+        assert 0 < len(timesteps) < 200
+        assert results[-1]["timestep"] == 200
+        assert results[-1]["current_epoch"] == 200
+        for record in results:
+            assert min(record["balances"].values()) >= 0
+
+
+class TestSparsePopulation:
+    """Test sampling only acting users and recording deltas."""
+
+    def test_sampler_matches_per_epoch_rates(self, active_params):
+        """Test that creates and supports per epoch have the expected means."""
+        params = {
+            **active_params["M"],
+            "prob_create_initiative": 0.01,
+            "prob_support_initiative": 0.02,
+        }
+        rng = np.random.default_rng(3)
+        balances = np.full(1000, 100.0)
+        balances[:10] = 0.0
+        live = np.array([2, 5])
+
+        kinds, users = [], []
+        for _ in range(2000):
+            actions = sample_sparse_user_actions(params, balances, live, rng)
+            kinds.append([action.kind for action in actions])
+            users.extend(action.user for action in actions)
+            assert all(action.initiative in (2, 5) for action in actions if action.kind == SUPPORT)
+            assert all(1.0 <= action.amount <= 60.0 for action in actions if action.kind == SUPPORT)
+        assert np.mean([k.count(CREATE) for k in kinds]) == pytest.approx(990 * 0.01, rel=0.05)
+        assert np.mean([k.count(SUPPORT) for k in kinds]) == pytest.approx(990 * 0.02, rel=0.05)
+        assert min(users) >= 10
+        no_live = sample_sparse_user_actions(params, balances, np.array([], dtype=int), rng)
+        assert no_live and all(action.kind == CREATE for action in no_live)
+
+    @pytest.mark.parametrize("retention", ["full", "last_substep", "every_k"])
+    def test_deltas_replay_to_engine_state(self, seeded_initial_state, active_params, retention):
+        """Test that kept delta records replay to the full balances and locks."""
+        params = {
+            **active_params["M"],
+            "sparse_population": True,
+            "history_retention": retention,
+            "history_retention_interval": 7,
+        }
+        random.seed(2)
+        engine = NativeEngine(seeded_initial_state, params)
+        records = record_run(engine, 1, 60)
+        expanded = list(expand_deltas(records))
+
+        assert len(records[0]["balances"]) == len(engine.balances)
+        assert max(len(record["balances"]) for record in records[1:]) < len(engine.balances)
+        final = expanded[-1]
+        assert final["balances"] == dict(zip(engine.user_ids, engine.balances.tolist()))
+        assert sorted(final["locks"]) == engine.locks.view("lock_id").tolist()
+        assert engine.locks.next_id > len(engine.locks) + 1
+        for record in expanded:
+            locked = sum(lock["amount"] for lock in record["locks"].values())
+            assert locked == pytest.approx(record["locked_supply"])
+
+    @pytest.mark.parametrize("retention", ["full", "summary"])
+    def test_counts_are_not_delta_sizes(self, seeded_initial_state, active_params, retention):
+        """Test that summaries and dataframes count live locks, not the lock deltas."""
+        params = {
+            **active_params["M"],
+            "acceptance_threshold": 1e12,
+            "min_lock_duration_epochs": 30,
+            "max_lock_duration_epochs": 40,
+            "sparse_population": True,
+            "history_retention": retention,
+        }
+        random.seed(2)
+        engine = NativeEngine(seeded_initial_state, params)
+        records = record_run(engine, 1, 20)
+        supporters = results_to_dataframe(records)["supporters_count"]
+
+        assert len(engine.locks) > len(records[-1].get("locks", {}))
+        assert records[-1]["supporters_count"] == supporters.iloc[-1] == len(engine.locks)
+        if retention == "full":
+            expanded = expand_deltas(records)
+            assert supporters.tolist() == [len(record["locks"]) for record in expanded]
+
+
+class TestLeapingEngine:
+    """Test approximate tau-leaping over several epochs."""
+
+    def test_leaps_stop_at_deadlines(self, seeded_initial_state, active_params):
+        """Test that no lock outlives its expiry and the horizon is reached exactly."""
+        params = {**active_params["M"], "leap_tolerance": 10.0}
+        engine = LeapingEngine(seeded_initial_state, params, random.Random(2))
+        leaps = 0
+        while engine.current_epoch < 120:
+            for _ in engine.substeps(120):
+                pass
+            leaps += 1
+            assert (engine.locks.view("expiry") > engine.current_epoch).all()
+            assert engine.balances.min() >= 0
+
+        assert engine.current_epoch == 120
+        assert leaps < 120
+
+    def test_bias_report(self, seeded_initial_state, active_params):
+        """Test that the bias report covers every metric for both engines."""
+        report = leap_bias_report(seeded_initial_state, active_params["M"], 40, runs=3)
+
+        assert set(report["metrics"]) == set(BIAS_METRICS)
+        for metric in report["metrics"].values():
+            assert metric["bias"] == pytest.approx(metric["leaping"] - metric["reference"])
+            assert metric["stderr"] >= 0
+        assert report["speedup"] > 0
+
+    def test_leaping_records(self, seeded_initial_state, active_params):
+        """Test that leaping runs return cadCAD-shaped records up to the horizon."""
+        random.seed(1)
+        results = run_leaping_simulation(seeded_initial_state, 50, active_params)
+
+        assert results[0]["timestep"] == 0
+        assert results[-1]["timestep"] == 50
+        assert results[-1]["substep"] == 6
@@ -0,0 +1,112 @@
+"""
+Tests for the persistent state containers.
+"""
+
+import copy
+import json
+import pickle
+import random
+
+from src.cadcad.persistent import (
+    CHUNK_SIZE,
+    PersistentMap,
+    PersistentSet,
+    as_persistent_map,
+    as_persistent_set,
+)
+from src.cadcad.state import generate_initial_state
+from src.cadcad.sufs import s_apply_user_actions_balances, s_process_accepted_initiatives
+
+
+class TestPersistentMap:
+    """Test the structurally shared mapping."""
+
+    def test_matches_dict_under_random_updates(self):
+        """Test that items and their order follow a dict through sets and deletes."""
+        rng = random.Random(0)
+        expected = {}
+        mapping = PersistentMap()
+        for value in range(5000):
+            key = rng.randrange(300)
+            if rng.random() < 0.6:
+                expected[key] = value
+                mapping = mapping.set(key, value)
+            elif key in expected:
+                del expected[key]
+                mapping = mapping.delete(key)
+
+            assert list(mapping.items()) == list(expected.items())
+        assert mapping == expected
+        assert len(mapping._chunks) <= 2 * (len(mapping) // CHUNK_SIZE + 1)
+
+    def test_updates_share_untouched_entries(self):
+        """Test that an update copies one chunk and leaves the original unchanged."""
+        original = as_persistent_map({f"0x{i:04x}": float(i) for i in range(10000)})
+        evolver = original.evolver()
+        for user_id in ("0x0001", "0x0002", "0x0003"):
+            evolver[user_id] += 1
+        updated = evolver.persistent()
+
+        assert original["0x0001"] == 1.0
+        assert updated["0x0001"] == 2.0
+        shared = sum(a is b for a, b in zip(original._chunks, updated._chunks))
+        assert shared == len(original._chunks) - 1
+        assert original.evolver().persistent() is original
+
+    def test_copies_are_free_and_pickling_round_trips(self):
+        """Test that copy and deepcopy return the map and pickling preserves it."""
+        mapping = PersistentMap({("0x01", "init1"): {"amount": 5.0}, ("0x02", "init1"): {}})
+
+        assert copy.copy(mapping) is mapping
+        assert copy.deepcopy({"locks": mapping})["locks"] is mapping
+        restored = pickle.loads(pickle.dumps(mapping))
+        assert restored == mapping
+        assert list(restored) == list(mapping)
+
+
+class TestPersistentSet:
+    """Test the structurally shared set."""
+
+    def test_evolver_leaves_base_unchanged(self):
+        """Test that adding through an evolver returns a new set."""
+        base = as_persistent_set({"a", "b"})
+        evolver = base.evolver()
+        evolver.add("c")
+        updated = evolver.persistent()
+
+        assert base == {"a", "b"}
+        assert updated == {"a", "b", "c"}
+        assert {"a", "b", "c"} == updated
+        assert copy.deepcopy(updated) is updated
+        assert json.dumps(sorted(updated | {"d"})) == '["a", "b", "c", "d"]'
+        assert isinstance(updated | {"d"}, PersistentSet)
+
+
+class TestPersistentState:
+    """Test that SUFs return persistent containers without mutating their input."""
+
+    def test_sufs_leave_previous_state_unchanged(self):
+        """Test that balances and accepted initiatives are updated by new containers."""
+        state = generate_initial_state(num_users=5, randomize=False)
+        state["initiatives"] = {
+            "init1": {
+                "id": "init1",
+                "title": "Test",
+                "description": "",
+                "created_at": state["current_time"],
+                "weight": 1e9,
+            }
+        }
+        balances = as_persistent_map(state["balances"])
+        state["balances"] = balances
+        actions = {"user_actions": [{"type": "create_initiative", "user_id": "0x00"}]}
+        params = {"initiative_creation_stake": 10.0, "acceptance_threshold": 1.0}
+
+        _, new_balances = s_apply_user_actions_balances(params, 0, [], state, actions)
+        _, accepted = s_process_accepted_initiatives(params, 0, [], state, {})
+
+        assert new_balances["0x00"] == balances["0x00"] - 10.0
+        assert state["balances"] is balances
+        assert isinstance(accepted, PersistentSet)
+        assert accepted == {"init1"}
+        assert state["accepted_initiatives"] == set()
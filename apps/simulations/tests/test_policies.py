@@ -2,10 +2,20 @@
 Tests for Policy functions.
 """
 
+import random
+
+import numpy as np
 import pytest
 from datetime import datetime
 from src.cadcad.state import generate_initial_state
-from src.cadcad.policies import p_user_actions, p_advance_time
+from src.cadcad.policies import (
+    CREATE_INITIATIVE,
+    SUPPORT_INITIATIVE,
+    UserActionBatch,
+    p_user_actions,
+    p_user_actions_vectorized,
+    p_advance_time,
+)
 
 
 class TestUserActionsPolicy:
@@ -192,6 +202,76 @@ class TestUserActionsPolicy:
         assert "user_actions" in result2
 
 
+class TestVectorizedUserActionsPolicy:
+    """Test the vectorized user actions policy and its columnar batch."""
+
+    def setup_method(self):
+        """Set up a state with many users and a mix of initiative statuses."""
+        random.seed(11)
+        self.state = generate_initial_state(num_users=2000, total_supply=1000000, randomize=True)
+        self.state["balances"]["0x0000"] = 0.0
+        self.state["initiatives"] = {"live1": {}, "live2": {}, "accepted": {}, "expired": {}}
+        self.state["accepted_initiatives"] = {"accepted"}
+        self.state["expired_initiatives"] = {"expired"}
+        self.params = {
+            "prob_create_initiative": 0.1,
+            "prob_support_initiative": 0.3,
+            "max_support_tokens_fraction": 0.5,
+            "min_lock_duration_epochs": 5,
+            "max_lock_duration_epochs": 20,
+            "initiative_creation_stake": 10.0,
+            "vectorized_user_actions": True,
+        }
+
+    def test_batch_columns_and_ranges(self):
+        """Test that each column covers every action and supports are within bounds."""
+        batch = p_user_actions(self.params, 1, [], self.state)["user_actions"]
+
+        assert isinstance(batch, UserActionBatch)
+        for column in (batch.user_id, batch.initiative_id, batch.amount):
+            assert len(column) == len(batch)
+        supports = batch.kind == SUPPORT_INITIATIVE
+        assert set(batch.initiative_id[supports]) <= {"live1", "live2"}
+        assert (batch.initiative_id[~supports] == None).all()  # noqa: E711
+        balances = np.array([self.state["balances"][user] for user in batch.user_id[supports]])
+        assert (batch.amount[supports] >= 1.0).all()
+        assert (batch.amount[supports] <= np.maximum(balances * 0.5, 1.0)).all()
+        durations = batch.lock_duration_epochs[supports]
+        assert durations.min() >= 5 and durations.max() <= 20
+        assert "0x0000" not in set(batch.user_id[supports])
+
+    def test_action_order_and_rates(self):
+        """Test that each user acts at most once per kind, create first, at the set rates."""
+        batch = p_user_actions_vectorized(self.params, 1, [], self.state)["user_actions"]
+
+        positions = {}
+        for row, (user_id, kind) in enumerate(zip(batch.user_id, batch.kind)):
+            positions.setdefault(user_id, []).append((row, kind))
+        for actions in positions.values():
+            assert [kind for _, kind in actions] in (
+                [CREATE_INITIATIVE],
+                [SUPPORT_INITIATIVE],
+                [CREATE_INITIATIVE, SUPPORT_INITIATIVE],
+            )
+            assert [row for row, _ in actions] == list(
+                range(actions[0][0], actions[0][0] + len(actions))
+            )
+        assert (batch.kind == CREATE_INITIATIVE).sum() == pytest.approx(200, abs=60)
+        assert (batch.kind == SUPPORT_INITIATIVE).sum() == pytest.approx(600, abs=100)
+
+    def test_reproducible_under_seed_and_convertible(self):
+        """Test that random.seed fixes the batch and to_dicts gives the list layout."""
+        random.seed(5)
+        first = p_user_actions_vectorized(self.params, 1, [], self.state)["user_actions"]
+        random.seed(5)
+        second = p_user_actions_vectorized(self.params, 1, [], self.state)["user_actions"]
+
+        assert first.to_dicts() == second.to_dicts()
+        for action in first.to_dicts():
+            if action["type"] == "create_initiative":
+                assert action["title"] == f"Initiative by {action['user_id']} at epoch 0"
+
+
 class TestAdvanceTimePolicy:
     """Test the advance time policy function."""
 
@@ -0,0 +1,97 @@
+"""
+Tests for history retention of simulation results.
+"""
+
+import random
+
+import pytest
+from src.cadcad.helpers import results_to_dataframe
+from src.cadcad.model import run_simulation
+from src.cadcad.retention import HistoryRetention, summarize_record
+
+
+@pytest.fixture
+def sim_params(make_sim_params):
+    """Short, active simulation parameters."""
+    return make_sim_params(12)
+
+
+def _run(seeded_initial_state, sim_params, engine, **retention):
+    sim_params["M"].update(retention)
+    random.seed(0)
+    return run_simulation(seeded_initial_state, sim_params=sim_params, engine=engine)
+
+
+class TestHistoryRetention:
+    """Test the retention modes on cadCAD and native runs."""
+
+    def test_rejects_unknown_mode(self):
+        """Test that unknown modes and intervals are refused."""
+        with pytest.raises(ValueError):
+            HistoryRetention("sometimes")
+        with pytest.raises(ValueError):
+            HistoryRetention("every_k", 0)
+
+    def test_finish_prunes_last_timestep_of_each_run(self):
+        """Test that finish only prunes the trailing timestep of every run."""
+        records = [
+            {"run": run, "timestep": timestep, "substep": substep}
+            for run in (1, 2)
+            for timestep, substep in [(0, 0), (1, 1), (1, 2), (2, 1), (2, 2)]
+        ]
+        finished = HistoryRetention("last_substep").finish(records)
+
+        assert [(r["run"], r["timestep"], r["substep"]) for r in finished] == [
+            (1, 0, 0),
+            (1, 1, 1),
+            (1, 1, 2),
+            (1, 2, 2),
+            (2, 0, 0),
+            (2, 1, 1),
+            (2, 1, 2),
+            (2, 2, 2),
+        ]
+
+    @pytest.mark.parametrize("engine", ["cadcad", "native"])
+    def test_modes_keep_selected_records(self, seeded_initial_state, sim_params, engine):
+        """Test that each mode keeps the records it selects from a full run."""
+        full = _run(seeded_initial_state, sim_params, engine)
+        assert len(full) == 1 + 12 * 6
+
+        def keys(records):
+            return [(r["run"], r["timestep"], r["substep"]) for r in records]
+
+        last = _run(seeded_initial_state, sim_params, engine, history_retention="last_substep")
+        expected = [
+            r for i, r in enumerate(full) if i + 1 == len(full) or full[i + 1]["substep"] <= 1
+        ]
+        assert keys(last) == keys(expected)
+        assert last[-1]["balances"] == full[-1]["balances"]
+
+        every = _run(
+            seeded_initial_state,
+            sim_params,
+            engine,
+            history_retention="every_k",
+            history_retention_interval=5,
+        )
+        assert sorted({r["timestep"] for r in every}) == [0, 5, 10, 12]
+        assert keys(every) == keys(r for r in full if r["timestep"] in (0, 5, 10, 12))
+
+        final = _run(seeded_initial_state, sim_params, engine, history_retention="final")
+        assert keys(final) == keys(full[-1:])
+        assert final[-1]["locked_supply"] == full[-1]["locked_supply"]
+        assert len(final[-1]["locks"]) == len(full[-1]["locks"])
+
+    def test_summary_records(self, seeded_initial_state, sim_params):
+        """Test that summary records keep scalars and collection sizes only."""
+        full = _run(seeded_initial_state, sim_params, "cadcad")
+        summary = _run(seeded_initial_state, sim_params, "cadcad", history_retention="summary")
+
+        assert len(summary) == len(full)
+        assert summary[-1] == summarize_record(full[-1])
+        assert "balances" not in summary[-1]
+        assert summary[-1]["supporters_count"] == len(full[-1]["locks"])
+        assert summary[-1]["circulating_supply"] == full[-1]["circulating_supply"]
+        df = results_to_dataframe(summary)
+        assert df["supporters_count"].iloc[-1] == len(full[-1]["locks"])
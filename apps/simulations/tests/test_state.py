@@ -2,9 +2,12 @@
 Tests for the State class and core data structures.
 """
 
+import copy
+import pickle
+
 import pytest
 from datetime import datetime, timedelta
-from src.cadcad.state import State, Initiative, Support, generate_initial_state
+from src.cadcad.state import State, Initiative, Support, Locks, generate_initial_state
 
 
 class TestInitiative:
@@ -59,6 +62,37 @@ class TestSupport:
         assert support.current_weight == support.initial_weight
         assert support.expiry_epoch == 1 + 10  # start_epoch + lock_duration
 
+    def test_support_is_a_slotted_mapping(self):
+        """Test that a support reads like its field dict and keeps no __dict__."""
+        support = Support(
+            user_id="user1",
+            initiative_id="init1",
+            amount=1000.0,
+            lock_duration_epochs=10,
+            start_epoch=1,
+        )
+
+        assert not hasattr(support, "__dict__")
+        assert support["amount"] == 1000.0
+        assert support.get("missing") is None
+        assert list(support)[-3:] == ["initial_weight", "current_weight", "expiry_epoch"]
+        assert dict(support) == {
+            "user_id": "user1",
+            "initiative_id": "init1",
+            "amount": 1000.0,
+            "lock_duration_epochs": 10,
+            "start_epoch": 1,
+            "initial_weight": 10000.0,
+            "current_weight": 10000.0,
+            "expiry_epoch": 11,
+        }
+        assert support == dict(support)
+        assert pickle.loads(pickle.dumps(support)) == support
+
+        updated = copy.copy(support)
+        updated.current_weight = 5.0
+        assert support["current_weight"] == 10000.0
+
     def test_support_decay(self):
         """Test support decay mechanism."""
         support = Support(
@@ -94,6 +128,68 @@ class TestSupport:
         assert 15 >= support.expiry_epoch  # epoch 15 is after expiry
 
 
+class TestLocks:
+    """Test the lock mapping and its secondary indexes."""
+
+    def make_support(self, user_id, initiative_id, duration=10, start_epoch=0):
+        return Support(
+            user_id=user_id,
+            initiative_id=initiative_id,
+            amount=100.0,
+            lock_duration_epochs=duration,
+            start_epoch=start_epoch,
+        )
+
+    def test_indexes_follow_adds_and_removals(self):
+        """Test that indexes track added, replaced and removed locks."""
+        locks = Locks()
+        locks[("u1", "a")] = self.make_support("u1", "a", duration=5)
+        locks[("u2", "a")] = self.make_support("u2", "a", duration=10)
+        locks[("u1", "b")] = self.make_support("u1", "b", duration=5)
+
+        assert locks.count("a") == 2
+        assert [s.user_id for s in locks.for_initiative("a")] == ["u1", "u2"]
+        assert [s.initiative_id for s in locks.for_user("u1")] == ["a", "b"]
+        assert locks.expiring(5) == [("u1", "a"), ("u1", "b")]
+
+        assert locks.started(0) == [("u1", "a"), ("u2", "a"), ("u1", "b")]
+
+        # Replacing a lock moves it to its new start and expiry buckets
+        locks[("u1", "a")] = self.make_support("u1", "a", duration=17, start_epoch=3)
+        assert locks.expiring(10) == [("u2", "a"), ("u1", "b")]
+        assert locks.started(0) == [("u2", "a"), ("u1", "b")]
+        assert locks.started(3) == [("u1", "a")]
+
+        locks.pop(("u2", "a"))
+        del locks[("u1", "b")]
+        assert locks.count("a") == 1
+        assert locks.count("b") == 0
+        assert locks.for_user("u2") == []
+        assert locks.expiring(10) == []
+
+    def test_copy_has_independent_indexes(self):
+        """Test that copies can be changed without touching the original."""
+        locks = Locks({("u1", "a"): self.make_support("u1", "a")})
+        other = locks.copy()
+        del other[("u1", "a")]
+
+        assert locks.count("a") == 1
+        assert other.count("a") == 0
+
+    def test_copies_share_index_buckets_until_written(self):
+        """Test that copies share index buckets and copy one before writing it."""
+        locks = Locks({("u1", "a"): self.make_support("u1", "a")})
+        other = locks.copy()
+        assert other.by_initiative["a"] is locks.by_initiative["a"]
+
+        other[("u2", "a")] = self.make_support("u2", "a")
+        locks[("u3", "a")] = self.make_support("u3", "a")
+
+        assert other.by_initiative["a"] is not locks.by_initiative["a"]
+        assert [s.user_id for s in locks.for_initiative("a")] == ["u1", "u3"]
+        assert [s.user_id for s in other.for_initiative("a")] == ["u1", "u2"]
+
+
 class TestState:
     """Test the State class."""
 
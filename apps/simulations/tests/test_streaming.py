@@ -0,0 +1,65 @@
+"""
+Tests for the step-by-step Simulation.
+"""
+
+import random
+
+import pytest
+from src.cadcad.model import run_simulation
+from src.cadcad.simulation import Simulation, TimestepView
+
+
+@pytest.fixture
+def sim_params(make_sim_params):
+    """Short, active simulation parameters."""
+    return make_sim_params()
+
+
+class TestSimulation:
+    """Test stepping, running and iterating a Simulation."""
+
+    def test_iteration_matches_run_simulation(self, seeded_initial_state, sim_params):
+        """Test that streamed records reproduce run_simulation under the same seed."""
+        random.seed(0)
+        reference = run_simulation(seeded_initial_state, sim_params=sim_params)
+        random.seed(0)
+        simulation = Simulation(seeded_initial_state, sim_params)
+        records = [simulation.state] + [record for view in simulation for record in view.records]
+
+        assert simulation.done
+        assert len(records) == len(reference)
+        for expected, record in zip(reference, records):
+            assert (record["timestep"], record["substep"]) == (
+                expected["timestep"],
+                expected["substep"],
+            )
+            assert record["balances"] == expected["balances"]
+            assert record["locked_supply"] == expected["locked_supply"]
+            assert len(record["locks"]) == len(expected["locks"])
+
+    def test_step_and_run(self, seeded_initial_state, sim_params):
+        """Test that step returns one timestep's view and run stops at the horizon."""
+        simulation = Simulation(seeded_initial_state, sim_params, num_epochs=5)
+
+        view = simulation.step()
+        assert isinstance(view, TimestepView)
+        assert view.timestep == 1
+        assert [record["substep"] for record in view.records] == [1, 2, 3, 4, 5, 6]
+        assert view["current_epoch"] == 1
+        assert simulation.run(2).timestep == 3
+        assert simulation.run().timestep == 5
+        assert list(simulation) == []
+        assert simulation.step().timestep == 6
+
+    def test_run_until(self, seeded_initial_state, sim_params):
+        """Test that run_until stops at the first view satisfying the predicate."""
+        random.seed(1)
+        simulation = Simulation(seeded_initial_state, sim_params)
+
+        view = simulation.run_until(lambda view: len(view["locks"]) >= 3)
+        assert len(view["locks"]) >= 3
+        assert simulation.timestep == view.timestep < 20
+
+        view = simulation.run_until(lambda view: False, max_timesteps=4)
+        assert view.timestep == simulation.timestep
+        assert simulation.timestep <= 20
@@ -2,21 +2,36 @@
 Tests for State Update Functions (SUFs).
 """
 
-import pytest
+import copy
+import random
+from collections.abc import Mapping
 from datetime import datetime
+
+import pytest
+
+from src.cadcad.policies import p_user_actions_vectorized
 from src.cadcad.state import State, generate_initial_state
 from src.cadcad.sufs import (
-    s_apply_user_actions_initiatives,
-    s_apply_user_actions_supporters,
+    BlockTransactionSUF,
+    StateUpdateFunction,
+    TransactionCache,
+    create_transaction_sufs,
+    get_state_obj,
     s_apply_user_actions_balances,
     s_apply_user_actions_circulating_supply,
+    s_apply_user_actions_initiatives,
+    s_apply_user_actions_locked_supply,
+    s_apply_user_actions_supporters,
     s_calculate_current_support,
-    s_update_initiative_aggregate_weights,
     s_process_accepted_initiatives,
     s_process_expired_initiatives,
+    s_process_support_lifecycle_balances,
+    s_process_support_lifecycle_circulating_supply,
+    s_process_support_lifecycle_locked_supply,
+    s_process_support_lifecycle_supporters,
     s_update_current_epoch,
     s_update_current_time,
-    get_state_obj,
+    s_update_initiative_aggregate_weights,
 )
 
 
@@ -32,6 +47,45 @@ class TestGetStateObj:
         assert state_obj.total_supply == 1000000
         assert len(state_obj.balances) == 5
 
+    def test_get_state_obj_reuses_emitted_objects(self):
+        """Test that a deep copy of emitted locks reuses the typed objects."""
+        state_dict = generate_initial_state(num_users=5, total_supply=1000000, randomize=False)
+        state_dict["locks"] = {
+            ("0x00", "init1"): {
+                "user_id": "0x00",
+                "initiative_id": "init1",
+                "amount": 100.0,
+                "lock_duration_epochs": 10,
+                "start_epoch": 0,
+            }
+        }
+        first = get_state_obj(state_dict)
+        emitted = StateUpdateFunction.emit("locks", first.locks)
+
+        second = get_state_obj({**state_dict, "locks": copy.deepcopy(emitted)})
+        assert second.locks[("0x00", "init1")] is first.locks[("0x00", "init1")]
+        assert second.locks is not first.locks
+
+    def test_decay_does_not_mutate_cached_locks(self):
+        """Test that decaying locks leaves previously emitted records intact."""
+        state_dict = generate_initial_state(num_users=5, total_supply=1000000, randomize=False)
+        state_dict["current_epoch"] = 2
+        state_dict["locks"] = {
+            ("0x00", "init1"): {
+                "user_id": "0x00",
+                "initiative_id": "init1",
+                "amount": 100.0,
+                "lock_duration_epochs": 10,
+                "start_epoch": 0,
+            }
+        }
+        lock = get_state_obj(state_dict).locks[("0x00", "init1")]
+
+        _, locks = s_calculate_current_support({"decay_multiplier": 0.5}, 1, [], state_dict, {})
+
+        assert locks[("0x00", "init1")]["current_weight"] == 500.0
+        assert lock.current_weight == 1000.0
+
 
 class TestUserActionSUFs:
     """Test SUFs that handle user actions."""
@@ -70,7 +124,7 @@ class TestUserActionSUFs:
         )
 
         assert result_key == "initiatives"
-        assert isinstance(result_value, dict)
+        assert isinstance(result_value, Mapping)
         assert len(result_value) == 1
 
         # Check initiative properties
@@ -144,7 +198,7 @@ class TestUserActionSUFs:
         )
 
         assert result_key == "locks"
-        assert isinstance(result_value, dict)
+        assert isinstance(result_value, Mapping)
         assert len(result_value) == 1
 
         # Check support properties
@@ -210,6 +264,126 @@ class TestUserActionSUFs:
         # Initiative creation doesn't affect circulating supply, only support actions do
         assert result_value == original_supply
 
+    def test_user_action_variables_agree(self):
+        """Test that all five variables see the same accepted actions."""
+        balance = self.initial_state["balances"]["0x00"]
+        policy_input = {
+            "user_actions": [
+                {"type": "create_initiative", "user_id": "0x00", "title": "Test"},
+                {
+                    "type": "support_initiative",
+                    "user_id": "0x00",
+                    "initiative_id": "missing",
+                    "amount": 1.0,
+                    "lock_duration_epochs": 5,
+                },
+            ]
+        }
+        sufs = [
+            s_apply_user_actions_initiatives,
+            s_apply_user_actions_supporters,
+            s_apply_user_actions_balances,
+            s_apply_user_actions_circulating_supply,
+            s_apply_user_actions_locked_supply,
+        ]
+        results = dict(suf(self.params, 1, [], self.initial_state, policy_input) for suf in sufs)
+        initiative_id = next(iter(results["initiatives"]))
+
+        # Support the new initiative with more than is left after the stake
+        policy_input = {
+            "user_actions": [
+                {
+                    "type": "support_initiative",
+                    "user_id": "0x00",
+                    "initiative_id": initiative_id,
+                    "amount": balance - 10.0,
+                    "lock_duration_epochs": 5,
+                },
+                {
+                    "type": "support_initiative",
+                    "user_id": "0x00",
+                    "initiative_id": initiative_id,
+                    "amount": balance,
+                    "lock_duration_epochs": 5,
+                },
+            ]
+        }
+        previous_state = {**self.initial_state, **results, "current_epoch": 3}
+        results = dict(suf(self.params, 1, [], previous_state, policy_input) for suf in sufs)
+
+        assert results["balances"]["0x00"] == 0
+        assert len(results["locks"]) == 1
+        assert results["locks"][("0x00", initiative_id)]["amount"] == balance - 10.0
+        assert results["locked_supply"] == self.initial_state["locked_supply"] + balance - 10.0
+        assert results["circulating_supply"] == self.initial_state["circulating_supply"] - (
+            balance - 10.0
+        )
+        assert results["initiatives"][initiative_id]["last_support_epoch"] == 3
+        # The previous state is left untouched
+        assert previous_state["balances"]["0x00"] == balance - 10.0
+
+    def test_block_cache_is_per_block_and_released(self):
+        """Test that a block's SUFs share one pass and release it once all have read."""
+
+        class CountingSUF(BlockTransactionSUF):
+            VARIABLES = ("a", "b")
+            passes = 0
+
+            @classmethod
+            def compute(cls, params, previous_state, policy_input):
+                cls.passes += 1
+                return {"a": previous_state["x"], "b": previous_state["x"] + 1}
+
+        first, second = create_transaction_sufs(CountingSUF), create_transaction_sufs(CountingSUF)
+        state, policy_input = {"x": 1}, {}
+        assert first["a"](self.params, 1, [], state, policy_input) == ("a", 1)
+        assert second["b"](self.params, 1, [], state, policy_input) == ("b", 2)
+        assert CountingSUF.passes == 2
+        assert first["b"](self.params, 1, [], state, policy_input) == ("b", 2)
+        assert CountingSUF.passes == 2
+
+        cache = TransactionCache(CountingSUF.VARIABLES)
+        cache.read("a", (self.params, state, policy_input), CountingSUF.compute)
+        assert cache.result == {"a": 1, "b": 2}
+        cache.read("b", (self.params, state, policy_input), CountingSUF.compute)
+        assert cache.result == {} and cache.inputs == ()
+
+    def test_action_batch_matches_action_dicts(self):
+        """Test that a columnar action batch applies like its list of dicts."""
+        random.seed(2)
+        initiative = {
+            "id": "init1",
+            "title": "Test",
+            "description": "",
+            "created_at": datetime.now(),
+        }
+        previous_state = {**self.initial_state, "initiatives": {"init1": initiative}}
+        params = {
+            **self.params,
+            "prob_create_initiative": 0.5,
+            "prob_support_initiative": 1.0,
+            "max_support_tokens_fraction": 2.0,
+            "min_lock_duration_epochs": 5,
+            "max_lock_duration_epochs": 20,
+        }
+        batch = p_user_actions_vectorized(params, 1, [], previous_state)["user_actions"]
+        sufs = [
+            s_apply_user_actions_supporters,
+            s_apply_user_actions_balances,
+            s_apply_user_actions_circulating_supply,
+            s_apply_user_actions_locked_supply,
+        ]
+
+        from_batch = dict(
+            suf(params, 1, [], previous_state, {"user_actions": batch}) for suf in sufs
+        )
+        from_dicts = dict(
+            suf(params, 1, [], previous_state, {"user_actions": batch.to_dicts()}) for suf in sufs
+        )
+
+        assert len(from_batch["locks"]) > 0
+        assert from_batch == from_dicts
+
 
 class TestSupportDecayAndWeights:
     """Test support decay and weight calculation SUFs."""
@@ -330,6 +504,34 @@ class TestLifecycleSUFs:
         assert result_key == "accepted_initiatives"
         assert "init1" in result_value
 
+    def test_s_process_accepted_initiatives_checks_supported_only(self):
+        """Test that after the first timestep only supported initiatives are checked."""
+        state = self.initial_state.copy()
+        state["timestep"] = 5
+        state["current_epoch"] = 5
+
+        def accepted(state, params):
+            return s_process_accepted_initiatives(
+                params=params, substep=4, state_history=[], previous_state=state, policy_input={}
+            )[1]
+
+        assert "init1" not in accepted(state, self.params)
+        assert "init1" in accepted(state, {**self.params, "exhaustive_acceptance": True})
+
+        state["locks"] = {
+            ("0x01", "init1"): {
+                "user_id": "0x01",
+                "initiative_id": "init1",
+                "amount": 100.0,
+                "lock_duration_epochs": 10,
+                "start_epoch": 5,
+                "initial_weight": 1000.0,
+                "current_weight": 1000.0,
+                "expiry_epoch": 15,
+            }
+        }
+        assert "init1" in accepted(state, self.params)
+
     def test_s_process_expired_initiatives_inactivity(self):
         """Test initiative expiration due to inactivity."""
         # Create initiative with no support and old last_support_epoch
@@ -355,6 +557,47 @@ class TestLifecycleSUFs:
         assert result_key == "expired_initiatives"
         assert "init1" in result_value
 
+    def test_s_process_support_lifecycle_unlocks(self):
+        """Test that accepted and expired locks are released consistently."""
+        state = self.initial_state.copy()
+        state["current_epoch"] = 10
+        state["accepted_initiatives"] = {"init1"}
+        state["locked_supply"] = 600.0
+
+        def lock(user_id, initiative_id, amount, expiry_epoch):
+            return {
+                "user_id": user_id,
+                "initiative_id": initiative_id,
+                "amount": amount,
+                "lock_duration_epochs": expiry_epoch,
+                "start_epoch": 0,
+                "expiry_epoch": expiry_epoch,
+            }
+
+        state["locks"] = {
+            ("0x00", "init1"): lock("0x00", "init1", 100.0, 20),
+            ("0x01", "init1"): lock("0x01", "init1", 200.0, 20),
+            ("0x00", "init2"): lock("0x00", "init2", 50.0, 10),
+            ("0x02", "init2"): lock("0x02", "init2", 250.0, 20),
+        }
+
+        results = dict(
+            suf(self.params, 1, [], state, {})
+            for suf in [
+                s_process_support_lifecycle_balances,
+                s_process_support_lifecycle_circulating_supply,
+                s_process_support_lifecycle_locked_supply,
+                s_process_support_lifecycle_supporters,
+            ]
+        )
+
+        assert list(results["locks"]) == [("0x02", "init2")]
+        assert results["balances"]["0x00"] == state["balances"]["0x00"] + 150.0
+        assert results["balances"]["0x01"] == state["balances"]["0x01"] + 200.0
+        assert results["balances"]["0x02"] == state["balances"]["0x02"]
+        assert results["circulating_supply"] == state["circulating_supply"] + 350.0
+        assert results["locked_supply"] == 250.0
+
 
 class TestTimeSUFs:
     """Test time-related SUFs."""